@@ -0,0 +1,239 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+
+# 체인이 스트리밍하는 값 중 캐시에 같이 저장할 출처 정보
+SOURCE_KEYS = ("kb_sources", "mcp_sources", "summarized_question")
+STREAM_PIECE = 40 # 캐시된 답변을 이 글자 수씩 나눠서 스트리밍
+
+
+@dataclass
+class CacheEntry:
+    question: str # 임베딩한 질문 (검색용 요약)
+    answer: str
+    sources: Dict[str, Any] = field(default_factory=dict)
+    created: float = field(default_factory=time.time)
+    cost_s: float = 0.0 # 캐시 없이 답변하는 데 걸린 시간(초)
+    hits: int = 0
+
+
+@dataclass
+class CacheLookup:
+    vector: np.ndarray # 조회에 쓴 임베딩 (miss면 put에 그대로 사용)
+    entry: Optional[CacheEntry] = None
+    similarity: float = 0.0
+
+
+class SemanticAnswerCache: # 질문 임베딩 코사인 유사도로 이전 답변을 찾는 메모리 캐시 (TTL + LRU 개수 제한 + KB 재동기화 시 비움)
+    def __init__(self, embed_fn: Callable[[str], List[float]], threshold: float = 0.9, ttl: float = 86400.0,
+                 max_entries: int = 1000, generation_fn: Optional[Callable[[], Optional[str]]] = None,
+                 generation_interval: float = 300.0):
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self.generation_fn = generation_fn # KB 데이터 버전 (예: 마지막으로 완료된 ingestion job id), 바뀌면 캐시 비움
+        self.generation_interval = generation_interval # 백그라운드 확인 간격(초), 0이면 refresh_generation을 직접 호출
+
+        self.lookups = 0
+        self.hits = 0
+        self.saved_s = 0.0 # 캐시 적중으로 줄인 시간 합
+        self.invalidations = 0
+
+        # 슬롯 단위 저장: 임베딩 행렬 한 번의 행렬곱으로 전체와 비교
+        self._vectors: Optional[np.ndarray] = None # (max_entries, dim), 정규화된 임베딩
+        self._created = np.zeros(self.max_entries)
+        self._active = np.zeros(self.max_entries, dtype=bool)
+        self._entries: Dict[int, CacheEntry] = {}
+        self._lru: "OrderedDict[int, None]" = OrderedDict() # 오래 안 쓴 슬롯이 앞
+        self._lock = threading.Lock()
+        self._generation: Optional[str] = None
+        self._refresh_lock = threading.Lock() # 확인은 한 번에 하나만
+        self._stop = threading.Event()
+        if generation_fn is not None and generation_interval > 0:
+            # KB 상태 확인(bedrock-agent API 여러 번)은 질문 처리 경로가 아니라 백그라운드 스레드에서
+            threading.Thread(target=self._generation_loop, name="answer-cache-generation", daemon=True).start()
+
+    def _embed(self, text: str) -> np.ndarray:
+        vector = np.asarray(self.embed_fn(text), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def lookup(self, question: str) -> CacheLookup:
+        vector = self._embed(question)
+        with self._lock:
+            self.lookups += 1
+            if self._vectors is None or not self._entries:
+                return CacheLookup(vector)
+            self._expire(time.time())
+            similarities = self._vectors @ vector
+            similarities[~self._active] = -np.inf
+            slot = int(np.argmax(similarities))
+            similarity = float(similarities[slot])
+            if similarity < self.threshold:
+                return CacheLookup(vector, similarity=max(similarity, 0.0))
+            entry = self._entries[slot]
+            entry.hits += 1
+            self.hits += 1
+            self._lru.move_to_end(slot)
+            return CacheLookup(vector, entry, similarity)
+
+    def put(self, vector: np.ndarray, entry: CacheEntry):
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self.max_entries, len(vector)), dtype=np.float32)
+            if len(self._entries) >= self.max_entries:
+                self._evict(next(iter(self._lru)))
+            slot = int(np.argmin(self._active)) # 빈 슬롯
+            self._vectors[slot] = vector
+            self._created[slot] = entry.created
+            self._active[slot] = True
+            self._entries[slot] = entry
+            self._lru[slot] = None
+
+    def record_saved(self, seconds: float):
+        with self._lock:
+            self.saved_s += max(0.0, seconds)
+
+    def clear(self):
+        with self._lock:
+            self._active[:] = False
+            self._entries.clear()
+            self._lru.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "lookups": self.lookups,
+                "hits": self.hits,
+                "hit_rate": self.hits / self.lookups if self.lookups else 0.0,
+                "saved_s": self.saved_s,
+                "invalidations": self.invalidations,
+                "generation": self._generation,
+            }
+
+    def _expire(self, now: float):
+        # lock 안에서 호출
+        expired = np.flatnonzero(self._active & (now - self._created > self.ttl))
+        for slot in expired.tolist():
+            self._evict(slot)
+
+    def _evict(self, slot: int):
+        # lock 안에서 호출
+        self._active[slot] = False
+        self._entries.pop(slot, None)
+        self._lru.pop(slot, None)
+
+    def refresh_generation(self):
+        # KB가 다시 동기화되면(generation 변경) 이전 답변은 근거가 바뀌었을 수 있으므로 전부 비움
+        # 이미 다른 스레드가 확인 중이면 기다리지 않고 돌아간다
+        if self.generation_fn is None or not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            try:
+                generation = self.generation_fn()
+            except Exception as e:
+                print(f"KB 동기화 상태 확인 실패 (캐시는 TTL로만 만료): {e}")
+                return
+            if generation is None:
+                return
+            if self._generation is not None and generation != self._generation:
+                print(f"KB 재동기화 감지 ({self._generation} -> {generation}), 답변 캐시 비움")
+                self.clear()
+                with self._lock:
+                    self.invalidations += 1
+            self._generation = generation
+        finally:
+            self._refresh_lock.release()
+
+    def close(self):
+        self._stop.set()
+
+    def _generation_loop(self):
+        self.refresh_generation()
+        while not self._stop.wait(self.generation_interval):
+            self.refresh_generation()
+
+
+class CachedAnswerChain: # get_chain() 앞에 붙이는 의미 기반 답변 캐시 (stream / astream 출력 형식은 체인과 같음)
+    def __init__(self, chain, cache: SemanticAnswerCache, key_fn: Callable[[str], Tuple[str, Any]]):
+        self.chain = chain
+        self.cache = cache
+        self.key_fn = key_fn # 질문 -> (캐시 키로 임베딩할 검색용 질문, 캐시 miss 때 체인에 넘길 입력)
+
+    def _hit_chunks(self, lookup: CacheLookup, started: float) -> Iterator[dict]:
+        entry = lookup.entry
+        for key in SOURCE_KEYS:
+            if key in entry.sources:
+                yield {key: entry.sources[key]}
+        served = time.perf_counter() - started
+        saved = entry.cost_s - served
+        self.cache.record_saved(saved)
+        print(f"답변 캐시 적중 (유사도 {lookup.similarity:.3f}, {served * 1000:.0f}ms, 절약 {saved:.1f}s): {entry.question}")
+        yield {"cache": {"similarity": lookup.similarity, "question": entry.question, "saved_s": saved}}
+        for i in range(0, len(entry.answer), STREAM_PIECE):
+            yield {"answer": entry.answer[i:i + STREAM_PIECE]}
+
+    def _lookup(self, question: str) -> Tuple[Any, Optional[str], Optional[CacheLookup]]:
+        # (체인 입력, 캐시 키, 조회 결과). 임베딩 호출 등이 실패하면 캐시 없이 질문 그대로 체인 실행
+        try:
+            key, chain_input = self.key_fn(question)
+        except Exception as e:
+            print(f"답변 캐시 키 생성 실패, 캐시 없이 답변: {e!r}")
+            return question, None, None
+        try:
+            return chain_input, key, self.cache.lookup(key)
+        except Exception as e:
+            print(f"답변 캐시 조회 실패, 캐시 없이 답변: {e!r}")
+            return chain_input, None, None
+
+    def _store(self, lookup: Optional[CacheLookup], key: str, answer: List[str], sources: Dict[str, Any], started: float):
+        # 근거가 하나도 없는 답변(검색 실패/시간 초과로 degrade된 답변)은 캐시하지 않음
+        if lookup is None or not answer or not (sources.get("kb_sources") or sources.get("mcp_sources")):
+            return
+        try:
+            self.cache.put(lookup.vector, CacheEntry(
+                question=key, answer="".join(answer), sources=sources, cost_s=time.perf_counter() - started,
+            ))
+        except Exception as e:
+            print(f"답변 캐시 저장 실패: {e!r}")
+
+    def stream(self, question: str) -> Iterator[dict]:
+        started = time.perf_counter()
+        chain_input, key, lookup = self._lookup(question)
+        if lookup is not None and lookup.entry is not None:
+            yield from self._hit_chunks(lookup, started)
+            return
+
+        answer, sources = [], {}
+        for chunk in self.chain.stream(chain_input):
+            if "answer" in chunk:
+                answer.append(chunk["answer"])
+            for k in SOURCE_KEYS:
+                if k in chunk:
+                    sources[k] = chunk[k]
+            yield chunk
+        self._store(lookup, key, answer, sources, started)
+
+    async def astream(self, question: str) -> AsyncIterator[dict]:
+        started = time.perf_counter()
+        chain_input, key, lookup = await asyncio.to_thread(self._lookup, question)
+        if lookup is not None and lookup.entry is not None:
+            for chunk in self._hit_chunks(lookup, started):
+                yield chunk
+            return
+
+        answer, sources = [], {}
+        async for chunk in self.chain.astream(chain_input):
+            if "answer" in chunk:
+                answer.append(chunk["answer"])
+            for k in SOURCE_KEYS:
+                if k in chunk:
+                    sources[k] = chunk[k]
+            yield chunk
+        self._store(lookup, key, answer, sources, started)
@@ -1,7 +1,6 @@
 from langchain_aws import AmazonKnowledgeBasesRetriever
 from langchain_aws.chat_models import ChatBedrock
-from langchain_mcp_adapters.client import MultiServerMCPClient
-from langchain_mcp_adapters.tools import load_mcp_tools
+from langchain_aws.embeddings import BedrockEmbeddings
 from langchain_core.runnables import RunnableParallel, RunnableLambda
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
@@ -9,8 +8,16 @@ from langchain_core.output_parsers import StrOutputParser
 
 import os
 import asyncio
+import boto3
 import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from dotenv import load_dotenv
+from answer_cache import CachedAnswerChain, SemanticAnswerCache
+from mcp_pool import MCPSessionPool
+from query_rewrite import (REWRITE_MODES, RewriteStats, current_question, keyword_query, merge_ranked, overlap,
+                           query_coverage)
 
 load_dotenv()
 
@@ -21,6 +28,26 @@ SLACK_CHANNEL_ID = os.getenv("SLACK_CHANNEL_ID")
 SLACK_WORKSPACE = os.getenv("SLACK_WORKSPACE")
 
 SLACK_RELEVANCE_THRESHOLD = 0.3
+KB_TIMEOUT = float(os.getenv("KB_TIMEOUT", "10")) # KB 검색 제한 시간(초), 넘으면 KB 없이 답변
+
+QUERY_REWRITE_MODE = os.getenv("QUERY_REWRITE_MODE", "llm") # llm / off / keyword / speculative (query_rewrite.py)
+if QUERY_REWRITE_MODE not in REWRITE_MODES:
+    raise ValueError(f"QUERY_REWRITE_MODE는 {REWRITE_MODES} 중 하나여야 합니다: {QUERY_REWRITE_MODE}")
+SPECULATIVE_ACCEPT = float(os.getenv("SPECULATIVE_ACCEPT", "0.6")) # speculative: 요약 키워드가 이 비율 이상 원래 질문에 있으면 원래 검색 결과 사용 (1.1이면 항상 다시 검색해서 합침)
+QUERY_REWRITE_LOG = os.getenv("QUERY_REWRITE_LOG", "") # 모드별 지연/겹침 기록 JSONL 경로 (비우면 메모리에만)
+
+ANSWER_CACHE_ENABLED = os.getenv("ANSWER_CACHE_ENABLED", "false").lower() == "true" # 비슷한 질문에 이전 답변 재사용
+ANSWER_CACHE_THRESHOLD = float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.9")) # 검색용 질문 임베딩 코사인 유사도 기준
+ANSWER_CACHE_TTL = float(os.getenv("ANSWER_CACHE_TTL", "86400")) # 캐시된 답변 유지 시간(초)
+ANSWER_CACHE_MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "1000")) # 넘으면 가장 오래 안 쓴 답변부터 삭제
+ANSWER_CACHE_EMBED_MODEL_ID = os.getenv("ANSWER_CACHE_EMBED_MODEL_ID", "amazon.titan-embed-text-v2:0")
+ANSWER_CACHE_KB_CHECK_INTERVAL = float(os.getenv("ANSWER_CACHE_KB_CHECK_INTERVAL", "300")) # KB 재동기화 확인 간격(초), 바뀌면 캐시 비움
+
+MCP_POOL_SIZE = int(os.getenv("MCP_POOL_SIZE", "2")) # 미리 띄워둘 MCP 서버 프로세스 수 (동시에 처리할 질문 수)
+MCP_CALL_TIMEOUT = float(os.getenv("MCP_CALL_TIMEOUT", "20")) # 질문 하나의 MCP 검색+읽기 제한 시간(초)
+MCP_HEALTH_INTERVAL = float(os.getenv("MCP_HEALTH_INTERVAL", "30")) # 쉬고 있는 서버 health check 간격(초)
+MCP_READ_TIMEOUT = float(os.getenv("MCP_READ_TIMEOUT", "8")) # 문서 하나 읽기 제한 시간(초), 넘으면 검색 결과 요약으로 대체
+MCP_DOC_MAX_LENGTH = int(os.getenv("MCP_DOC_MAX_LENGTH", "1500")) # 문서에서 읽어올 앞부분 길이(자)
 
 # 프롬프트
 prompt = ChatPromptTemplate.from_messages([
@@ -61,101 +88,108 @@ retriever = AmazonKnowledgeBasesRetriever(
 
 llm = ChatBedrock(model_id=BEDROCK_MODEL_ID, region_name=AWS_REGION, streaming=True)
 
-async def _mcp_fetch(question: str):
+rewrite_stats = RewriteStats(QUERY_REWRITE_LOG or None)
+
+_retrieval_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="retrieval") # 동기 경로에서 KB / MCP 동시 검색
+
+_mcp_pool = None
+_cached_chain = None
+_cached_chain_lock = threading.Lock()
+_mcp_pool_lock = threading.Lock()
+
+def get_mcp_pool() -> MCPSessionPool:
+    # 앱 전체에서 하나 (서버 프로세스는 처음 한 번만 띄우고 재사용)
+    global _mcp_pool
+    with _mcp_pool_lock:
+        if _mcp_pool is None:
+            _mcp_pool = MCPSessionPool(
+                size=MCP_POOL_SIZE,
+                call_timeout=MCP_CALL_TIMEOUT,
+                health_interval=MCP_HEALTH_INTERVAL,
+            )
+            _mcp_pool.start()
+    return _mcp_pool
+
+async def _mcp_read(read_tool, title: str, url: str, context: str) -> dict:
+    # 문서 하나 읽기. 필요한 앞부분(MCP_DOC_MAX_LENGTH)만 요청하고, 시간 초과/실패 시 검색 결과 컨텍스트 사용
     try:
-        # AWS Documentation MCP 서버 (로컬 실행)
-        client = MultiServerMCPClient({
-            "aws-documentation-mcp-server": {
-                "command": "uvx",
-                "args": ["awslabs.aws-documentation-mcp-server@latest"],
-                "transport": "stdio",
-                "env": {
-                    "FASTMCP_LOG_LEVEL": "ERROR",
-                    "AWS_DOCUMENTATION_PARTITION": "aws"
-                }
-            }
-        })
-
-        async with client.session("aws-documentation-mcp-server") as session:
-            tools = await load_mcp_tools(session)
-            
-            print(f"MCP tools: {[t.name for t in tools]}")
-            
-            # 사용할 수 있는 도구 찾기
-            search_tool = next((t for t in tools if t.name == "search_documentation"), None)
-            read_tool = next((t for t in tools if t.name == "read_documentation"), None)
-            
-            if not search_tool:
-                print("search_documentation tools not found")
-                return []
-            
-            # AWS 문서 검색 실행
-            search_result = await search_tool.ainvoke({"search_phrase": question, "limit": 5})
-            
-            
-            # 검색 결과에서 상위 몇 개 문서의 내용을 읽어오기
-            out = []
-            if isinstance(search_result, list):
-                for i, result_str in enumerate(search_result[:3]):  # 상위 3개만 가져오기!
-                    try:
-                        # 각 결과의 형태가 json
-                        result = json.loads(result_str)
-                        
-                        
-                        url = result.get("url", "")
-                        title = result.get("title", "")
-                        context = result.get("context", "")
-                        
-                        if url and read_tool:
-                            # 문서 내용 읽기 시도
-                            try:
-                                doc_content = await read_tool.ainvoke({"url": url})
-                                out.append({
-                                    "title": title,
-                                    "url": url,
-                                    "content": doc_content[:1500]  # 내용을 1500자로 제한
-                                })
-                            except Exception as read_error:
-                                print(f"문서 읽기 실패 ({url}): {read_error}")
-                                # 읽기 실패 시 검색 결과 컨텍스트 사용
-                                out.append({
-                                    "title": title,
-                                    "url": url,
-                                    "content": context
-                                })
-                        else:
-                            # 읽기 도구가 없으면 검색 결과 컨텍스트만 사용
-                            out.append({
-                                "title": title,
-                                "url": url,
-                                "content": context
-                            })
-                            
-                    except Exception as e:
-                        print(f"검색 결과 파싱 오류: {e}")
-                        continue
-            
-            print(f"최종 처리된 문서: {len(out)}개")
-            return out
-            
-    except Exception as e:
-        import traceback
-        print(f"MCP fetch 에러: {e}")
-        print(f"Full traceback: {traceback.format_exc()}") # 에러 추적
+        doc_content = await asyncio.wait_for(
+            read_tool.ainvoke({"url": url, "max_length": MCP_DOC_MAX_LENGTH, "start_index": 0}),
+            MCP_READ_TIMEOUT,
+        )
+        return {
+            "title": title,
+            "url": url,
+            "content": doc_content[:MCP_DOC_MAX_LENGTH]  # 서버가 붙이는 헤더/안내 문구까지 포함해 제한
+        }
+    except asyncio.TimeoutError:
+        print(f"문서 읽기 시간 초과 ({url}, {MCP_READ_TIMEOUT:.0f}s)")
+    except Exception as read_error:
+        print(f"문서 읽기 실패 ({url}): {read_error}")
+    return {
+        "title": title,
+        "url": url,
+        "content": context
+    }
+
+async def _mcp_fetch(tools: dict, question: str):
+    # tools: 풀에 떠 있는 세션의 {도구 이름: 도구} (세션마다 한 번만 조회해둔 목록)
+    search_tool = tools.get("search_documentation")
+    read_tool = tools.get("read_documentation")
+
+    if not search_tool:
+        print("search_documentation tools not found")
         return []
-    
+
+    # AWS 문서 검색 실행
+    search_result = await search_tool.ainvoke({"search_phrase": question, "limit": 5})
+
+    # 검색 결과 파싱 (상위 3개만)
+    results = []
+    if isinstance(search_result, list):
+        for result_str in search_result[:3]:
+            try:
+                # 각 결과의 형태가 json
+                result = json.loads(result_str)
+                results.append((result.get("title", ""), result.get("url", ""), result.get("context", "")))
+            except Exception as e:
+                print(f"검색 결과 파싱 오류: {e}")
+
+    # 문서 내용은 동시에 읽기 (가장 느린 문서 하나만큼만 걸림)
+    # 읽기 도구가 없거나 url이 없으면 검색 결과 컨텍스트만 사용
+    out = await asyncio.gather(*(
+        _mcp_read(read_tool, title, url, context) if url and read_tool
+        else asyncio.sleep(0, {"title": title, "url": url, "content": context})
+        for title, url, context in results
+    ))
+
+    print(f"최종 처리된 문서: {len(out)}개")
+    return list(out)
+
 def mcp_fetch_sync(question: str):
+    # 질문마다 서버를 새로 띄우던 asyncio.run 대신, 풀의 백그라운드 루프에서 떠 있는 세션으로 실행
+    pool = get_mcp_pool()
+    started = time.perf_counter()
     try:
-        return asyncio.run(_mcp_fetch(question))
+        docs = pool.call(lambda tools: _mcp_fetch(tools, question))
+        print(f"MCP 호출 {(time.perf_counter() - started) * 1000:.0f}ms")
+        return docs
     except Exception as e:
         import traceback
-        print(f"MCP sync fetch 에러: {e}")
+        print(f"MCP fetch 에러 ({(time.perf_counter() - started) * 1000:.0f}ms): {e!r}")
         print(f"Full traceback: {traceback.format_exc()}")
         return []
-    
+
+async def amcp_fetch(question: str):
+    # 다른 이벤트 루프(ainvoke/astream)에서 호출. 실제 MCP 호출은 풀의 루프에서 실행
+    return await get_mcp_pool().acall(lambda tools: _mcp_fetch(tools, question))
+
 def knowledge_base_fetch(q: str):
     return retriever.invoke(q)
 
+async def aknowledge_base_fetch(q: str):
+    return await retriever.ainvoke(q)
+
 def knowledge_base_format(threads):
     if not threads:
         return "KB 컨텍스트 없음", []
@@ -215,14 +249,31 @@ def summarize_question(question: str) -> str:
     summary_chain = summary_prompt | llm | StrOutputParser()
     return summary_chain.invoke({"question": question})
 
-def prepare_inputs(question: str) -> dict:
-    # 질문 요약
-    summarized_question = summarize_question(question)
-    
-    # 요약ver 질문으로 검색
-    kb_docs = knowledge_base_fetch(summarized_question)
+async def asummarize_question(question: str) -> str:
+    summary_chain = summary_prompt | llm | StrOutputParser()
+    return await summary_chain.ainvoke({"question": question})
+
+def _result_before(future: Future, name: str, deadline: float) -> list:
+    # deadline(perf_counter 기준)까지 결과가 없거나 실패하면 해당 소스 없이 진행
+    try:
+        return future.result(timeout=max(0.0, deadline - time.perf_counter()))
+    except FutureTimeoutError:
+        print(f"{name} 검색 시간 초과, {name} 없이 답변")
+    except Exception as e:
+        print(f"{name} 검색 실패, {name} 없이 답변: {e!r}")
+    return []
+
+async def _awith_deadline(name: str, coro, timeout: float) -> list:
+    try:
+        return await asyncio.wait_for(coro, timeout)
+    except asyncio.TimeoutError:
+        print(f"{name} 검색 시간 초과, {name} 없이 답변")
+    except Exception as e:
+        print(f"{name} 검색 실패, {name} 없이 답변: {e!r}")
+    return []
+
+def _build_inputs(question: str, summarized_question: str, kb_docs, mcp_docs) -> dict:
     kb_ctx, kb_sources = knowledge_base_format(kb_docs)
-    mcp_docs = mcp_fetch_sync(summarized_question)
     mcp_ctx, mcp_sources = mcp_format(mcp_docs)
 
     return {
@@ -234,11 +285,128 @@ def prepare_inputs(question: str) -> dict:
         "summarized_question": summarized_question
     }
 
+def _kb_key(d):
+    return d.metadata.get("location", {}).get("s3Location", {}).get("uri") or d.page_content
+
+def _mcp_key(d):
+    return d.get("url") or d.get("title")
+
+def _merge_speculative(raw, rewritten_kb) -> tuple:
+    # 질문 그대로 검색한 KB 결과와 요약으로 검색한 KB 결과를 RRF로 합치고 겹침 비율 기록
+    # AWS 문서는 질문 그대로 검색한 결과를 그대로 사용 (MCP 서버는 질문당 하나만 쓰도록, 풀 크기 = 동시 질문 수)
+    raw_kb, raw_mcp = raw
+    kb_overlap = overlap([_kb_key(d) for d in raw_kb], [_kb_key(d) for d in rewritten_kb])
+    merged_kb = merge_ranked([rewritten_kb, raw_kb], _kb_key, limit=max(len(rewritten_kb), len(raw_kb)))
+    return merged_kb, raw_mcp, kb_overlap, None
+
+def _submit_retrieval(query: str, mcp: bool = True) -> tuple:
+    # KB / AWS 문서를 동시에 검색 시작 (결과는 _collect_retrieval로). mcp=False면 KB만
+    return (
+        _retrieval_executor.submit(knowledge_base_fetch, query),
+        _retrieval_executor.submit(mcp_fetch_sync, query) if mcp else None,
+        time.perf_counter(),
+    )
+
+def _collect_retrieval(submitted: tuple) -> tuple:
+    # 소스별 제한 시간(검색 시작 기준), 넘으면 그 소스 없이 답변
+    kb_future, mcp_future, started = submitted
+    return (
+        _result_before(kb_future, "KB", started + KB_TIMEOUT),
+        _result_before(mcp_future, "MCP", started + MCP_CALL_TIMEOUT) if mcp_future is not None else [],
+    )
+
+async def _aretrieve(query: str) -> tuple:
+    return await asyncio.gather(
+        _awith_deadline("KB", aknowledge_base_fetch(query), KB_TIMEOUT),
+        _awith_deadline("MCP", amcp_fetch(query), MCP_CALL_TIMEOUT),
+    )
+
+def _local_rewrite(question: str) -> str:
+    # LLM 호출 없는 재작성 (off / keyword)
+    if QUERY_REWRITE_MODE == "keyword":
+        return keyword_query(question)
+    return current_question(question)
+
+def _split_inputs(inputs) -> tuple:
+    # 질문 문자열, 또는 답변 캐시 조회에서 요약까지 끝낸 {"question", "summarized_question", "rewrite_s"}
+    if isinstance(inputs, dict):
+        return inputs["question"], inputs.get("summarized_question"), inputs.get("rewrite_s", 0.0)
+    return inputs, None, 0.0
+
+def prepare_inputs(inputs) -> dict:
+    question, summarized_question, rewrite_s = _split_inputs(inputs)
+    started = time.perf_counter() - rewrite_s
+    kb_overlap = mcp_overlap = speculation = None
+
+    if QUERY_REWRITE_MODE == "speculative" and summarized_question is None:
+        # 요약 LLM을 기다리는 동안 질문 그대로 검색 시작
+        raw_query = current_question(question)
+        raw_submitted = _submit_retrieval(raw_query)
+        summarized_question = summarize_question(question)
+        rewritten_at = time.perf_counter()
+        if query_coverage(raw_query, summarized_question) >= SPECULATIVE_ACCEPT:
+            # 요약이 원래 질문과 거의 같으면 이미 진행 중인 검색 결과를 그대로 사용
+            speculation = "accepted"
+            kb_docs, mcp_docs = _collect_retrieval(raw_submitted)
+        else:
+            speculation = "merged"
+            rewritten_submitted = _submit_retrieval(summarized_question, mcp=False)
+            raw = _collect_retrieval(raw_submitted)
+            rewritten_kb, _ = _collect_retrieval(rewritten_submitted)
+            kb_docs, mcp_docs, kb_overlap, mcp_overlap = _merge_speculative(raw, rewritten_kb)
+    else:
+        # 답변 캐시 조회에서 이미 요약했으면 그대로 사용 (요약 시간은 started에 반영)
+        if summarized_question is None and QUERY_REWRITE_MODE == "llm":
+            summarized_question = summarize_question(question)
+        elif summarized_question is None:
+            summarized_question = _local_rewrite(question)
+        rewritten_at = time.perf_counter()
+        kb_docs, mcp_docs = _collect_retrieval(_submit_retrieval(summarized_question))
+
+    finished = time.perf_counter()
+    rewrite_stats.record(QUERY_REWRITE_MODE, (rewritten_at - started) * 1000, (finished - rewritten_at) * 1000,
+                         (finished - started) * 1000, kb_overlap, mcp_overlap, speculation)
+    return _build_inputs(question, summarized_question, kb_docs, mcp_docs)
+
+async def aprepare_inputs(inputs) -> dict:
+    # prepare_inputs의 async 버전 (chain.ainvoke / astream)
+    question, summarized_question, rewrite_s = _split_inputs(inputs)
+    started = time.perf_counter() - rewrite_s
+    kb_overlap = mcp_overlap = speculation = None
+
+    if QUERY_REWRITE_MODE == "speculative" and summarized_question is None:
+        raw_query = current_question(question)
+        raw_task = asyncio.ensure_future(_aretrieve(raw_query))
+        summarized_question = await asummarize_question(question)
+        rewritten_at = time.perf_counter()
+        if query_coverage(raw_query, summarized_question) >= SPECULATIVE_ACCEPT:
+            speculation = "accepted"
+            kb_docs, mcp_docs = await raw_task
+        else:
+            speculation = "merged"
+            raw, rewritten_kb = await asyncio.gather(
+                raw_task, _awith_deadline("KB", aknowledge_base_fetch(summarized_question), KB_TIMEOUT)
+            )
+            kb_docs, mcp_docs, kb_overlap, mcp_overlap = _merge_speculative(raw, rewritten_kb)
+    else:
+        # 답변 캐시 조회에서 이미 요약했으면 그대로 사용 (요약 시간은 started에 반영)
+        if summarized_question is None and QUERY_REWRITE_MODE == "llm":
+            summarized_question = await asummarize_question(question)
+        elif summarized_question is None:
+            summarized_question = _local_rewrite(question)
+        rewritten_at = time.perf_counter()
+        kb_docs, mcp_docs = await _aretrieve(summarized_question)
+
+    finished = time.perf_counter()
+    rewrite_stats.record(QUERY_REWRITE_MODE, (rewritten_at - started) * 1000, (finished - rewritten_at) * 1000,
+                         (finished - started) * 1000, kb_overlap, mcp_overlap, speculation)
+    return _build_inputs(question, summarized_question, kb_docs, mcp_docs)
+
 def pick_slack(d): return d["kb_sources"]
 def pick_docs(d): return d["mcp_sources"]
 def pick_summarized_version(d): return d["summarized_question"]
 
-prepare = RunnableLambda(prepare_inputs)
+prepare = RunnableLambda(prepare_inputs, afunc=aprepare_inputs) # invoke/stream은 동기, ainvoke/astream은 async 버전
 
 def get_chain():
     return (prepare | RunnableParallel(
@@ -248,6 +416,58 @@ def get_chain():
         summarized_question = RunnableLambda(pick_summarized_version),
     ))
 
+def answer_cache_key(question: str) -> tuple:
+    # 캐시 키(임베딩할 검색용 질문)와 miss일 때 체인 입력
+    # llm 모드: 요약을 키로 쓰고 체인에도 넘겨 다시 요약하지 않음
+    # 나머지 모드: LLM 호출 없이 원래 질문을 그대로 키로 쓰고 체인은 원래대로 실행 (speculative 유지)
+    # (키워드 질문은 "안", "못" 같은 짧은 말을 버려서 뜻이 반대인 질문이 같은 키가 된다)
+    # 이전 대화가 붙은 후속 질문("그건 얼마야?")은 대화마다 뜻이 다르므로 이전 대화까지 포함해서 임베딩
+    if QUERY_REWRITE_MODE == "llm":
+        started = time.perf_counter()
+        summarized_question = summarize_question(question)
+        return summarized_question, {
+            "question": question,
+            "summarized_question": summarized_question,
+            "rewrite_s": time.perf_counter() - started,
+        }
+    return question.strip(), question
+
+def kb_generation():
+    # KB 데이터 소스별 마지막으로 완료된 ingestion job id (재동기화되면 바뀜)
+    client = boto3.client("bedrock-agent", region_name=AWS_REGION)
+    generation = []
+    for data_source in client.list_data_sources(knowledgeBaseId=BEDROCK_KB_ID)["dataSourceSummaries"]:
+        jobs = client.list_ingestion_jobs(
+            knowledgeBaseId=BEDROCK_KB_ID,
+            dataSourceId=data_source["dataSourceId"],
+            filters=[{"attribute": "STATUS", "operator": "EQ", "values": ["COMPLETE"]}],
+            sortBy={"attribute": "STARTED_AT", "order": "DESCENDING"},
+            maxResults=1,
+        )["ingestionJobSummaries"]
+        if jobs:
+            generation.append(f"{data_source['dataSourceId']}:{jobs[0]['ingestionJobId']}")
+    return ",".join(sorted(generation))
+
+def get_cached_chain():
+    # 답변 캐시를 앞에 붙인 체인 (앱 전체에서 하나, ANSWER_CACHE_ENABLED=false면 get_chain()과 같음)
+    global _cached_chain
+    with _cached_chain_lock:
+        if _cached_chain is None:
+            chain = get_chain()
+            if ANSWER_CACHE_ENABLED:
+                embeddings = BedrockEmbeddings(model_id=ANSWER_CACHE_EMBED_MODEL_ID, region_name=AWS_REGION)
+                cache = SemanticAnswerCache(
+                    embeddings.embed_query,
+                    threshold=ANSWER_CACHE_THRESHOLD,
+                    ttl=ANSWER_CACHE_TTL,
+                    max_entries=ANSWER_CACHE_MAX_ENTRIES,
+                    generation_fn=kb_generation,
+                    generation_interval=ANSWER_CACHE_KB_CHECK_INTERVAL,
+                )
+                chain = CachedAnswerChain(chain, cache, answer_cache_key)
+            _cached_chain = chain
+    return _cached_chain
+
 def slack_link_from_s3_uri(
     s3_uri: str,
     channel_id: str,
@@ -2,11 +2,17 @@ import os
 import streamlit as st
 from dotenv import load_dotenv
 
-from chain import get_chain
+from chain import QUERY_REWRITE_MODE, get_cached_chain, get_mcp_pool, rewrite_stats
 
 load_dotenv()
 
-chain = get_chain()
+@st.cache_resource(show_spinner="AWS 문서 MCP 서버 준비 중..")
+def start_mcp_pool():
+    # 서버 프로세스는 앱 시작 때 한 번만 띄우고 모든 세션(사용자)이 같이 사용
+    return get_mcp_pool()
+
+mcp_pool = start_mcp_pool()
+chain = get_cached_chain() # 비슷한 질문이면 이전 답변을 바로 스트리밍
 
 st.set_page_config(page_title="오지라퍼", layout="wide")
 st.title("오지라퍼")
@@ -56,7 +62,7 @@ if prompt := st.chat_input("질문을 입력해주세요."):
                     if "answer" in chunk:
                         yield chunk["answer"]
                     # 출처 정보 수집 (스트리밍과 병렬로)
-                    for key in ["kb_sources", "mcp_sources", "summarized_question"]:
+                    for key in ["kb_sources", "mcp_sources", "summarized_question", "cache"]:
                         if key in chunk:
                             collected_sources[key] = chunk[key]
             
@@ -92,6 +98,31 @@ if prompt := st.chat_input("질문을 입력해주세요."):
             # 요약된 질문 표시
             if "summarized_question" in result:
                 st.caption(f"검색에 사용된 질문 요약 버전: {result['summarized_question']}")
+
+            # 답변 캐시
+            cache_hit = collected_sources.get("cache")
+            if cache_hit:
+                st.caption(f"비슷한 이전 질문의 답변을 재사용했어요 (유사도 {cache_hit['similarity']:.2f}): {cache_hit['question']}")
+            if hasattr(chain, "cache"):
+                cache_stats = chain.cache.stats()
+                st.caption(f"답변 캐시 적중률 {cache_stats['hit_rate']:.0%} ({cache_stats['hits']}/{cache_stats['lookups']}), "
+                           f"절약한 시간 {cache_stats['saved_s']:.1f}s, 저장된 답변 {cache_stats['size']}개")
+
+            # MCP 호출 지연
+            mcp_stats = mcp_pool.stats()
+            if mcp_stats["last_ms"] is not None:
+                st.caption(f"AWS 문서 검색 {mcp_stats['last_ms']:.0f}ms (p95 {mcp_stats['p95_ms']:.0f}ms, 호출 {mcp_stats['calls']}회, 서버 재시작 {mcp_stats['restarts']}회)")
+
+            # 질문 재작성 모드 지연 / 검색 겹침 (모드 선택용)
+            rewrite_summary = rewrite_stats.summary().get(QUERY_REWRITE_MODE)
+            if rewrite_summary:
+                caption = (f"질문 재작성 {QUERY_REWRITE_MODE}: 재작성 평균 {rewrite_summary['rewrite_ms']:.0f}ms, "
+                           f"재작성+검색 p50 {rewrite_summary['p50_ms']:.0f}ms ({rewrite_summary['n']}회)")
+                if rewrite_summary["accept_rate"] is not None:
+                    caption += f", 원래 질문 검색 채택 {rewrite_summary['accept_rate']:.0%}"
+                if rewrite_summary["kb_overlap"] is not None:
+                    caption += f", KB 겹침 {rewrite_summary['kb_overlap']:.2f}"
+                st.caption(caption)
             
             # 답변 데이터 세션에 저장
             assistant_message = {
@@ -0,0 +1,226 @@
+import asyncio
+import shutil
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from langchain_mcp_adapters.client import MultiServerMCPClient
+from langchain_mcp_adapters.tools import load_mcp_tools
+
+T = TypeVar("T")
+
+SERVER_NAME = "aws-documentation-mcp-server"
+
+def default_connection() -> dict:
+    # 설치된 서버 실행 파일이 있으면 그걸 쓰고, 없으면 uvx (uvx는 실행할 때마다 패키지를 확인해서 느림)
+    command = shutil.which("awslabs.aws-documentation-mcp-server")
+    return {
+        "command": command or "uvx",
+        "args": [] if command else ["awslabs.aws-documentation-mcp-server@latest"],
+        "transport": "stdio",
+        "env": {
+            "FASTMCP_LOG_LEVEL": "ERROR",
+            "AWS_DOCUMENTATION_PARTITION": "aws"
+        }
+    }
+
+
+class _Worker: # MCP 서버 프로세스 하나 + 세션 + 도구 목록
+    def __init__(self, index: int):
+        self.index = index
+        self.session = None
+        self.tools: Dict[str, Any] = {}
+        self.ready = asyncio.Event()
+        self.restart = asyncio.Event()
+        self.busy = False
+        self.queued = False # idle 큐에 들어 있는지 (같은 서버를 두 번 넣지 않게)
+        self.task: Optional[asyncio.Task] = None
+
+
+class MCPSessionPool: # 백그라운드 이벤트 루프에서 MCP 서버 프로세스를 미리 띄워두고 질문마다 재사용하는 세션 풀
+    def __init__(self, connection: Optional[dict] = None, size: int = 2, call_timeout: float = 20.0,
+                 health_interval: float = 30.0, server_name: str = SERVER_NAME):
+        self.connection = connection or default_connection()
+        self.size = max(1, size)
+        self.call_timeout = call_timeout # 세션 대기 + 도구 호출 전체 제한 시간(초)
+        self.health_interval = health_interval # 쉬고 있는 세션에 ping 보내는 간격(초)
+        self.server_name = server_name
+
+        self.calls = 0
+        self.failures = 0
+        self.restarts = 0
+        self.startup_seconds: Optional[float] = None
+        self.latencies = deque(maxlen=500) # 최근 호출 지연(초)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self._workers = []
+        self._idle: Optional[asyncio.Queue] = None
+
+    def start(self, timeout: float = 120.0):
+        # 앱 시작 때 한 번. 서버가 다 뜰 때까지 최대 timeout초 기다리고, 못 뜬 서버는 백그라운드에서 계속 재시도
+        with self._lock:
+            if self._loop is not None:
+                return
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._loop.run_forever, name="mcp-pool", daemon=True)
+            self._thread.start()
+
+        started = time.perf_counter()
+        ready = asyncio.run_coroutine_threadsafe(self._start(timeout), self._loop).result()
+        self.startup_seconds = time.perf_counter() - started
+        tools = sorted(self._workers[0].tools) if self._workers else []
+        print(f"MCP 세션 풀 시작: {ready}/{self.size}개 준비, {self.startup_seconds:.1f}s, tools {tools}")
+
+    def call(self, fn: Callable[[Dict[str, Any]], Awaitable[T]]) -> T:
+        # 동기 코드에서 호출. fn은 {도구 이름: 도구}를 받아 도구를 호출하는 코루틴 함수
+        self.start()
+        return asyncio.run_coroutine_threadsafe(self._call(fn), self._loop).result()
+
+    async def acall(self, fn: Callable[[Dict[str, Any]], Awaitable[T]]) -> T:
+        # 다른 이벤트 루프에서 await (실제 호출은 풀의 루프에서 실행)
+        self.start()
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._call(fn), self._loop))
+
+    def stats(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+        def percentile(p):
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+        return {
+            "size": self.size,
+            "ready": sum(1 for w in self._workers if w.ready.is_set()),
+            "calls": self.calls,
+            "failures": self.failures,
+            "restarts": self.restarts,
+            "startup_s": self.startup_seconds,
+            "last_ms": self.latencies[-1] * 1000 if self.latencies else None,
+            "p50_ms": percentile(0.5),
+            "p95_ms": percentile(0.95),
+        }
+
+    def close(self):
+        if self._loop is None:
+            return
+        self._closed = True
+        asyncio.run_coroutine_threadsafe(self._stop(), self._loop).result(timeout=30)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+    async def _start(self, timeout: float) -> int:
+        self._client = MultiServerMCPClient({self.server_name: self.connection})
+        self._idle = asyncio.Queue()
+        self._workers = [_Worker(i) for i in range(self.size)]
+        for worker in self._workers:
+            worker.task = asyncio.create_task(self._serve(worker)) # 준비되면 _serve가 idle 큐에 넣는다
+        try:
+            await asyncio.wait_for(asyncio.gather(*(w.ready.wait() for w in self._workers)), timeout)
+        except asyncio.TimeoutError:
+            print(f"MCP 서버 일부가 {timeout:.0f}s 안에 준비되지 않음 (백그라운드에서 재시도)")
+        self._health_task = asyncio.create_task(self._health_loop())
+        return sum(1 for w in self._workers if w.ready.is_set())
+
+    async def _stop(self):
+        for worker in self._workers:
+            worker.restart.set()
+        tasks = [w.task for w in self._workers if w.task] + [self._health_task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _serve(self, worker: _Worker):
+        # 세션은 연 task 안에서 닫아야 하므로(anyio) 서버마다 task 하나가 세션을 들고 있다가
+        # restart 이벤트가 오면 닫고 새로 띄운다
+        while not self._closed:
+            worker.restart.clear()
+            try:
+                async with self._client.session(self.server_name) as session:
+                    tools = await load_mcp_tools(session) # 도구 목록은 세션마다 한 번만
+                    worker.session = session
+                    worker.tools = {t.name: t for t in tools}
+                    worker.ready.set()
+                    self._release(worker)
+                    await worker.restart.wait()
+            except Exception as e:
+                print(f"MCP 서버 {worker.index} 종료: {e}")
+            worker.ready.clear()
+            worker.session = None
+            if self._closed:
+                break
+            self.restarts += 1
+            await asyncio.sleep(1.0)
+
+    async def _health_loop(self):
+        while not self._closed:
+            await asyncio.sleep(self.health_interval)
+            for worker in self._workers:
+                if worker.busy or not worker.ready.is_set():
+                    continue
+                # ping 하는 동안은 사용 중으로 표시 (idle 큐에 남아 있어도 _acquire가 건너뛴다)
+                worker.busy = True
+                try:
+                    alive = await self._ping(worker)
+                finally:
+                    worker.busy = False
+                if alive:
+                    self._release(worker)
+                else:
+                    print(f"MCP 서버 {worker.index} 응답 없음, 재시작")
+                    worker.restart.set()
+
+    async def _ping(self, worker: _Worker) -> bool:
+        try:
+            await asyncio.wait_for(worker.session.send_ping(), 5.0)
+            return True
+        except Exception:
+            return False
+
+    def _release(self, worker: _Worker):
+        # 준비된 서버만 idle 큐에 넣는다 (재시작 중인 서버는 다시 준비되면 _serve가 넣음)
+        if worker.ready.is_set() and not worker.busy and not worker.queued:
+            worker.queued = True
+            self._idle.put_nowait(worker)
+
+    @asynccontextmanager
+    async def _acquire(self):
+        # 쉬고 있는 서버 하나를 빌려준다 (질문 하나당 서버 하나, 다 쓰고 있으면 대기)
+        # 큐에서 기다리는 동안 죽은 서버는 건너뛴다 (재시작이 끝날 때까지 그 서버를 기다리지 않게)
+        # ping 중인 서버도 건너뛴다 (ping이 끝나면 _health_loop가 다시 큐에 넣음)
+        while True:
+            worker = await self._idle.get()
+            worker.queued = False
+            if worker.ready.is_set() and not worker.busy:
+                break
+        worker.busy = True
+        try:
+            yield worker
+        finally:
+            worker.busy = False
+            self._release(worker)
+
+    async def _call(self, fn: Callable[[Dict[str, Any]], Awaitable[T]]) -> T:
+        started = time.perf_counter()
+        self.calls += 1
+        try:
+            return await asyncio.wait_for(self._call_worker(fn), self.call_timeout)
+        except Exception:
+            self.failures += 1
+            raise
+        finally:
+            self.latencies.append(time.perf_counter() - started)
+
+    async def _call_worker(self, fn):
+        async with self._acquire() as worker:
+            try:
+                return await fn(worker.tools)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # 서버 프로세스가 죽은 경우면 다음 질문 전에 다시 띄운다
+                if not await self._ping(worker):
+                    worker.restart.set()
+                raise
@@ -0,0 +1,138 @@
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
+
+# 검색 전 질문 재작성 방식
+# llm: 요약 LLM 호출 후 검색 (기존)
+# off: 질문 그대로 검색
+# keyword: 로컬 키워드 추출 (LLM 호출 없음)
+# speculative: 질문 그대로 먼저 검색을 시작하고, 요약이 원래 질문과 다르면 요약으로 KB를 다시 검색해서 두 결과를 합침
+REWRITE_MODES = ("llm", "off", "keyword", "speculative")
+
+WORD_RE = re.compile(r'[가-힣a-zA-Z0-9][가-힣a-zA-Z0-9._-]*[가-힣a-zA-Z0-9]') # 두 글자 이상 (S3, EC2, us-east-1 등 유지)
+PARTICLE_RE = re.compile(r'(은|는|이|가|을|를|에|에서|에게|의|와|과|로|으로|도|만|이랑|랑|하고|처럼|보다|까지|부터)$')
+STOPWORDS = frozenset({
+    '어떻게', '어떤', '무엇', '뭐야', '뭔가요', '왜', '언제', '어디', '있나요', '있어', '있을까요', '없나요', '하나요', '해야',
+    '하면', '되나요', '되요', '돼요', '알려줘', '알려주세요', '궁금합니다', '궁금해요', '질문', '방법', '혹시', '그리고', '그런데',
+    'the', 'and', 'or', 'a', 'an', 'in', 'on', 'at', 'to', 'for', 'of', 'is', 'are', 'how', 'what', 'why', 'can', 'do', 'i',
+})
+CURRENT_QUESTION_MARK = "현재 질문:" # main.py에서 이전 대화를 붙일 때 쓰는 구분자
+HISTORY_LABEL_RE = re.compile(r'^(이전 대화|사용자|오지라퍼):', re.MULTILINE)
+
+def current_question(text: str) -> str:
+    # 이전 대화가 붙은 입력이면 현재 질문 부분만
+    if CURRENT_QUESTION_MARK in text:
+        return text.rsplit(CURRENT_QUESTION_MARK, 1)[1].strip()
+    return text.strip()
+
+def _terms(text: str) -> List[str]:
+    terms = []
+    for word in WORD_RE.findall(text):
+        if '가' <= word[-1] <= '힣':
+            stem = PARTICLE_RE.sub('', word) # 조사 제거 (한 글자 이하만 남으면 원래 단어: 결과, 속도 등)
+            word = stem if len(stem) >= 2 else word
+        if len(word) < 2 or word.lower() in STOPWORDS:
+            continue
+        terms.append(word)
+    return terms
+
+def keyword_query(text: str, max_keywords: int = 12) -> str:
+    # 현재 질문의 키워드를 등장 순서대로 먼저, 남는 자리는 이전 대화에서 자주 나온 키워드로 채움
+    question = current_question(text)
+    keywords = list(dict.fromkeys(_terms(question)))
+    if len(keywords) < max_keywords and question != text.strip():
+        history = HISTORY_LABEL_RE.sub('', text.rsplit(CURRENT_QUESTION_MARK, 1)[0])
+        seen = {k.lower() for k in keywords}
+        for word, _ in Counter(_terms(history)).most_common():
+            if len(keywords) >= max_keywords:
+                break
+            if word.lower() not in seen:
+                seen.add(word.lower())
+                keywords.append(word)
+    return " ".join(keywords[:max_keywords]) or question
+
+def query_coverage(raw: str, rewritten: str) -> float:
+    # 재작성된 질문의 키워드 중 원래 질문에 이미 있는 비율 (높으면 원래 질문으로 검색한 결과를 그대로 써도 됨)
+    terms = set(t.lower() for t in _terms(rewritten))
+    if not terms:
+        return 1.0
+    raw = raw.lower()
+    return sum(1 for t in terms if t in raw) / len(terms)
+
+def merge_ranked(lists: Sequence[Sequence[Any]], key: Callable[[Any], Hashable], limit: int, k: int = 60) -> List[Any]:
+    # Reciprocal Rank Fusion: 여러 검색 결과에서 순위가 높고 자주 나온 항목 순으로 limit개
+    scores: Dict[Hashable, float] = defaultdict(float)
+    first: Dict[Hashable, Any] = {}
+    for results in lists:
+        for rank, item in enumerate(results):
+            item_key = key(item)
+            scores[item_key] += 1.0 / (k + rank + 1)
+            first.setdefault(item_key, item)
+    ordered = sorted(scores, key=lambda item_key: -scores[item_key]) # stable: 동점은 먼저 나온 순서
+    return [first[item_key] for item_key in ordered[:limit]]
+
+def overlap(a: Sequence[Hashable], b: Sequence[Hashable]) -> Optional[float]:
+    # 두 검색 결과의 Jaccard 유사도 (둘 다 비어 있으면 None)
+    sa, sb = set(a), set(b)
+    if not sa and not sb:
+        return None
+    return len(sa & sb) / len(sa | sb)
+
+
+class RewriteStats: # 모드별 질문 재작성 / 검색 지연과 검색 결과 겹침 기록 (메모리 + 선택적으로 JSONL 파일)
+    def __init__(self, log_path: Optional[str] = None, window: int = 500):
+        self.log_path = log_path
+        self._records: Dict[str, deque] = defaultdict(lambda: deque(maxlen=window))
+        self._lock = threading.Lock()
+
+    def record(self, mode: str, rewrite_ms: float, retrieve_ms: float, total_ms: float,
+               kb_overlap: Optional[float] = None, mcp_overlap: Optional[float] = None,
+               speculation: Optional[str] = None):
+        # speculation: speculative 모드에서 원래 질문 검색 결과를 그대로 썼으면 "accepted", 요약으로 KB를 다시 검색해 합쳤으면 "merged"
+        entry = {
+            "ts": time.time(),
+            "mode": mode,
+            "rewrite_ms": round(rewrite_ms, 1),
+            "retrieve_ms": round(retrieve_ms, 1),
+            "total_ms": round(total_ms, 1),
+            "kb_overlap": kb_overlap,
+            "mcp_overlap": mcp_overlap,
+            "speculation": speculation,
+        }
+        with self._lock:
+            self._records[mode].append(entry)
+            if self.log_path:
+                os.makedirs(os.path.dirname(os.path.abspath(self.log_path)), exist_ok=True)
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        print(f"질문 재작성({mode}{'/' + speculation if speculation else ''}) {rewrite_ms:.0f}ms, 검색 {retrieve_ms:.0f}ms, 전체 {total_ms:.0f}ms"
+              + (f", KB 겹침 {kb_overlap:.2f}" if kb_overlap is not None else "")
+              + (f", 문서 겹침 {mcp_overlap:.2f}" if mcp_overlap is not None else ""))
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        # 모드별 호출 수, 평균/p50/p95 전체 지연, 평균 재작성 지연, 평균 겹침, speculative 채택 비율
+        with self._lock:
+            records = {mode: list(entries) for mode, entries in self._records.items()}
+        out = {}
+        for mode, entries in records.items():
+            totals = sorted(e["total_ms"] for e in entries)
+            def mean(name):
+                values = [e[name] for e in entries if e[name] is not None]
+                return sum(values) / len(values) if values else None
+            out[mode] = {
+                "n": len(entries),
+                "total_ms": mean("total_ms"),
+                "p50_ms": totals[len(totals) // 2],
+                "p95_ms": totals[min(len(totals) - 1, int(len(totals) * 0.95))],
+                "rewrite_ms": mean("rewrite_ms"),
+                "retrieve_ms": mean("retrieve_ms"),
+                "kb_overlap": mean("kb_overlap"),
+                "mcp_overlap": mean("mcp_overlap"),
+                "accept_rate": (sum(1 for e in entries if e["speculation"] == "accepted") / len(entries)
+                                if mode == "speculative" else None),
+            }
+        return out
@@ -0,0 +1,15 @@
+# chain.py는 import할 때 Bedrock client를 만들므로 region / 자격 증명 기본값을 넣어둔다 (실제 호출은 하지 않음)
+import os
+import fake_mcp
+
+for key, value in {
+    "AWS_REGION": "us-east-1",
+    "AWS_DEFAULT_REGION": "us-east-1",
+    "AWS_ACCESS_KEY_ID": "test",
+    "AWS_SECRET_ACCESS_KEY": "test",
+    "BEDROCK_KB_ID": "test-kb",
+    "BEDROCK_MODEL_ID": "test-model",
+}.items():
+    os.environ.setdefault(key, value)
+
+fake_mcp.install()
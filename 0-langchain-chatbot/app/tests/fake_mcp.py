@@ -0,0 +1,89 @@
+# langchain_mcp_adapters 대역 (MCP 서버 프로세스 없이 세션 풀 테스트용)
+# install()을 mcp_pool import 전에 호출하면 sys.modules에 가짜 client / tools 모듈을 넣는다
+import asyncio
+import sys
+import types
+from contextlib import asynccontextmanager, contextmanager
+
+
+class FakeTool:
+    def __init__(self, name: str, session: "FakeSession"):
+        self.name = name
+        self.session = session
+
+    async def ainvoke(self, args):
+        if not self.session.alive:
+            raise ConnectionError("MCP 서버 종료")
+        with self.session.using():
+            await asyncio.sleep(SERVER.latency)
+        return f"{self.name}:{self.session.index}:{args}"
+
+
+class FakeSession:
+    def __init__(self, index: int):
+        self.index = index # 몇 번째로 연 세션인지
+        self.alive = True
+        self.active = 0
+        self.max_active = 0 # 동시에 진행된 도구 호출 + ping 수의 최댓값
+        self.pings = 0
+
+    @contextmanager
+    def using(self):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            yield
+        finally:
+            self.active -= 1
+
+    async def send_ping(self):
+        if not self.alive:
+            raise ConnectionError("ping 실패")
+        self.pings += 1
+        with self.using():
+            await asyncio.sleep(SERVER.ping_latency)
+
+
+class FakeServer: # 테스트에서 조작하는 서버 상태
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.opened = 0
+        self.sessions = []
+        self.block_new = False # True면 새 세션이 준비되지 않는다 (재시작 중인 서버)
+        self.latency = 0.0
+        self.ping_latency = 0.0
+
+
+SERVER = FakeServer()
+
+
+class MultiServerMCPClient:
+    def __init__(self, connections):
+        self.connections = connections
+
+    @asynccontextmanager
+    async def session(self, server_name):
+        if SERVER.block_new:
+            await asyncio.Event().wait() # 취소될 때까지 대기
+        session = FakeSession(SERVER.opened)
+        SERVER.opened += 1
+        SERVER.sessions.append(session)
+        yield session
+
+
+async def load_mcp_tools(session):
+    return [FakeTool("search_documentation", session), FakeTool("read_documentation", session)]
+
+
+def install():
+    package = types.ModuleType("langchain_mcp_adapters")
+    client = types.ModuleType("langchain_mcp_adapters.client")
+    client.MultiServerMCPClient = MultiServerMCPClient
+    tools = types.ModuleType("langchain_mcp_adapters.tools")
+    tools.load_mcp_tools = load_mcp_tools
+    package.client, package.tools = client, tools
+    sys.modules["langchain_mcp_adapters"] = package
+    sys.modules["langchain_mcp_adapters.client"] = client
+    sys.modules["langchain_mcp_adapters.tools"] = tools
@@ -0,0 +1,133 @@
+import asyncio
+import threading
+import time
+import chain as app_chain
+from answer_cache import CacheEntry, CachedAnswerChain, SemanticAnswerCache
+
+VECTORS = {
+    "S3 버킷 정책": [1.0, 0.0, 0.0],
+    "S3 버킷의 정책": [0.98, 0.05, 0.0], # 거의 같은 질문
+    "Lambda 타임아웃": [0.0, 1.0, 0.0],
+    "IAM 역할": [0.0, 0.0, 1.0],
+}
+
+def embed(text):
+    return VECTORS[text]
+
+def store(cache, question, answer, created=None):
+    lookup = cache.lookup(question)
+    entry = CacheEntry(question=question, answer=answer, sources={"kb_sources": ["kb"]})
+    if created is not None:
+        entry.created = created
+    cache.put(lookup.vector, entry)
+
+def test_similar_question_hits():
+    cache = SemanticAnswerCache(embed, threshold=0.9)
+    store(cache, "S3 버킷 정책", "답변 A")
+    hit = cache.lookup("S3 버킷의 정책")
+    assert hit.entry is not None and hit.entry.answer == "답변 A" and hit.similarity > 0.9
+    assert cache.lookup("Lambda 타임아웃").entry is None
+    assert cache.stats()["hits"] == 1
+
+def test_expired_answers_are_not_served():
+    cache = SemanticAnswerCache(embed, ttl=60)
+    store(cache, "S3 버킷 정책", "오래된 답변", created=time.time() - 120)
+    store(cache, "Lambda 타임아웃", "새 답변")
+    assert cache.lookup("S3 버킷 정책").entry is None
+    assert cache.lookup("Lambda 타임아웃").entry.answer == "새 답변"
+    assert cache.stats()["size"] == 1
+
+def test_least_recently_used_answer_is_evicted():
+    cache = SemanticAnswerCache(embed, max_entries=2)
+    store(cache, "S3 버킷 정책", "A")
+    store(cache, "Lambda 타임아웃", "B")
+    assert cache.lookup("S3 버킷 정책").entry.answer == "A" # A를 최근에 사용
+    store(cache, "IAM 역할", "C")
+    assert cache.lookup("Lambda 타임아웃").entry is None
+    assert cache.lookup("S3 버킷 정책").entry.answer == "A"
+    assert cache.lookup("IAM 역할").entry.answer == "C"
+    assert cache.stats()["size"] == 2
+
+def test_kb_resync_clears_cache():
+    generation = ["job-1"]
+    cache = SemanticAnswerCache(embed, generation_fn=lambda: generation[0], generation_interval=0)
+    cache.refresh_generation()
+    store(cache, "S3 버킷 정책", "A")
+    assert cache.lookup("S3 버킷 정책").entry is not None
+    generation[0] = "job-2"
+    cache.refresh_generation()
+    assert cache.lookup("S3 버킷 정책").entry is None
+    stats = cache.stats()
+    assert stats["invalidations"] == 1 and stats["generation"] == "job-2" and stats["size"] == 0
+
+def test_kb_check_runs_in_background_once_at_a_time():
+    # 느린 KB 상태 확인이 질문 조회를 막지 않고, 동시에 여러 번 돌지 않는다
+    release = threading.Event()
+    calls = []
+
+    def slow_generation():
+        calls.append(1)
+        release.wait(5)
+        return "job-1"
+
+    cache = SemanticAnswerCache(embed, generation_fn=slow_generation, generation_interval=60)
+    try:
+        while not calls: # 백그라운드 첫 확인이 시작될 때까지
+            time.sleep(0.01)
+        started = time.perf_counter()
+        store(cache, "S3 버킷 정책", "A")
+        assert cache.lookup("S3 버킷 정책").entry is not None
+        cache.refresh_generation() # 백그라운드 확인이 진행 중이므로 바로 돌아온다
+        assert time.perf_counter() - started < 1.0
+        assert len(calls) == 1
+    finally:
+        release.set()
+        cache.close()
+
+
+class FakeChain:
+    def __init__(self):
+        self.inputs = []
+
+    def stream(self, chain_input):
+        self.inputs.append(chain_input)
+        yield {"kb_sources": ["kb"]}
+        yield {"answer": "새 "}
+        yield {"answer": "답변"}
+
+    async def astream(self, chain_input):
+        for chunk in self.stream(chain_input):
+            yield chunk
+
+def test_cached_chain_serves_hits_and_stores_misses():
+    chain = FakeChain()
+    cached = CachedAnswerChain(chain, SemanticAnswerCache(embed), lambda q: (q, q))
+    first = list(cached.stream("S3 버킷 정책"))
+    second = list(cached.stream("S3 버킷의 정책"))
+    assert chain.inputs == ["S3 버킷 정책"] # 두 번째는 체인을 실행하지 않음
+    assert "".join(c.get("answer", "") for c in first) == "".join(c.get("answer", "") for c in second) == "새 답변"
+    assert any("cache" in c for c in second)
+
+def test_embedding_failure_falls_through_to_chain():
+    def broken_embed(text):
+        raise ConnectionError("Bedrock 임베딩 실패")
+    chain = FakeChain()
+    cached = CachedAnswerChain(chain, SemanticAnswerCache(broken_embed), lambda q: (q, {"question": q}))
+    assert "".join(c.get("answer", "") for c in cached.stream("S3 버킷 정책")) == "새 답변"
+
+    async def collect():
+        return [c async for c in cached.astream("S3 버킷 정책")]
+    assert "".join(c.get("answer", "") for c in asyncio.run(collect())) == "새 답변"
+    assert chain.inputs == [{"question": "S3 버킷 정책"}] * 2
+
+def test_non_llm_cache_key_keeps_negation(monkeypatch):
+    # 키워드 질문은 "안"을 버려서 뜻이 반대인 두 질문이 거의 같아지므로, 캐시 키는 원래 질문 그대로
+    monkeypatch.setattr(app_chain, "QUERY_REWRITE_MODE", "keyword")
+    negated, plain = "Lambda에서 지원 안 되는 런타임", "Lambda에서 지원되는 런타임"
+    assert "안" not in app_chain.keyword_query(negated).split()
+    key, chain_input = app_chain.answer_cache_key(negated)
+    assert key == negated and chain_input == negated
+    assert app_chain.answer_cache_key(plain)[0] == plain
+    # 이전 대화가 붙은 후속 질문은 이전 대화까지 키에 포함
+    follow_up = "이전 대화:\n사용자: Lambda 요금\n\n현재 질문: 그건 얼마야?"
+    assert app_chain.answer_cache_key(follow_up)[0] == follow_up
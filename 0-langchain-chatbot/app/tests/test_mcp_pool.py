@@ -0,0 +1,73 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import fake_mcp
+
+fake_mcp.install()
+from mcp_pool import MCPSessionPool
+
+@pytest.fixture
+def pool():
+    fake_mcp.SERVER.reset()
+    pool = MCPSessionPool(connection={"transport": "stdio"}, size=2, call_timeout=2.0, health_interval=60.0)
+    pool.start(timeout=5.0)
+    yield pool
+    pool.close()
+
+def search(question):
+    async def fn(tools):
+        return await tools["search_documentation"].ainvoke({"search_phrase": question})
+    return fn
+
+def test_sessions_are_reused_across_calls(pool):
+    fake_mcp.SERVER.latency = 0.05
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        results = list(executor.map(lambda i: pool.call(search(f"q{i}")), range(12)))
+    assert len(results) == 12 and all(r.startswith("search_documentation:") for r in results)
+    assert fake_mcp.SERVER.opened == 2 # 질문마다 서버를 띄우지 않음
+    stats = pool.stats()
+    assert stats["ready"] == 2 and stats["calls"] == 12 and stats["failures"] == 0
+
+def test_restarting_worker_is_skipped(pool):
+    # 한 서버가 재시작 중(새 세션이 안 뜸)이어도 다른 서버로 바로 처리
+    fake_mcp.SERVER.block_new = True
+    dead = pool._workers[0]
+    dead.session.alive = False
+    pool._loop.call_soon_threadsafe(dead.restart.set)
+    time.sleep(0.1)
+
+    started = time.perf_counter()
+    for i in range(4):
+        assert pool.call(search(f"q{i}")).startswith("search_documentation:1:")
+    assert time.perf_counter() - started < 1.0
+    assert pool.stats()["ready"] == 1
+
+def test_health_ping_does_not_share_worker_with_calls():
+    # ping 중인 서버를 질문에 빌려주지 않는다 (같은 세션에서 ping과 도구 호출이 겹치지 않음)
+    fake_mcp.SERVER.reset()
+    fake_mcp.SERVER.latency = fake_mcp.SERVER.ping_latency = 0.05
+    pool = MCPSessionPool(connection={"transport": "stdio"}, size=1, call_timeout=5.0, health_interval=0.01)
+    pool.start(timeout=5.0)
+    try:
+        for i in range(20):
+            assert pool.call(search(f"q{i}")).startswith("search_documentation:0:")
+        session = fake_mcp.SERVER.sessions[0]
+        assert session.pings > 0 and session.max_active == 1
+        assert pool.stats()["restarts"] == 0
+    finally:
+        pool.close()
+
+def test_failed_call_restarts_dead_server():
+    fake_mcp.SERVER.reset()
+    pool = MCPSessionPool(connection={"transport": "stdio"}, size=1, call_timeout=5.0, health_interval=60.0)
+    pool.start(timeout=5.0)
+    try:
+        fake_mcp.SERVER.sessions[0].alive = False
+        with pytest.raises(ConnectionError):
+            pool.call(search("q"))
+        # ping도 실패한 서버는 다시 띄우고, 다음 질문은 준비된 새 세션으로
+        assert pool.call(search("q")).startswith("search_documentation:1:")
+        stats = pool.stats()
+        assert stats["failures"] == 1 and stats["restarts"] == 1
+    finally:
+        pool.close()
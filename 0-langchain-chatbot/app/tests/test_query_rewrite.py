@@ -0,0 +1,84 @@
+import threading
+import chain as app_chain
+from langchain_core.documents import Document
+from query_rewrite import RewriteStats, keyword_query, merge_ranked, overlap, query_coverage
+
+def test_keyword_query_drops_particles_and_stopwords():
+    assert keyword_query("S3 버킷에서 객체를 어떻게 삭제하나요?") == "S3 버킷 객체 삭제하나요"
+    assert keyword_query("us-east-1 리전의 EC2 요금 알려줘") == "us-east-1 리전 EC2 요금"
+    assert keyword_query("왜?") == "왜?" # 키워드가 없으면 질문 그대로
+
+def test_keyword_query_fills_from_history():
+    text = "이전 대화:\n사용자: Lambda 동시성 제한\n오지라퍼: Lambda 동시성은 계정 단위입니다\n\n현재 질문: 늘리려면?"
+    words = keyword_query(text).split()
+    assert words[0] == "늘리려면" # 현재 질문 키워드가 먼저
+    assert words[1:3] == ["Lambda", "동시성"] # 이전 대화에서 자주 나온 순
+    assert len(keyword_query(text, max_keywords=2).split()) == 2
+
+def test_merge_ranked_rrf():
+    a = ["x", "y", "z"]
+    b = ["y", "w"]
+    assert merge_ranked([a, b], key=lambda d: d, limit=3) == ["y", "x", "w"] # 두 목록에 다 있는 y가 먼저
+    assert merge_ranked([a, []], key=lambda d: d, limit=10) == a
+    assert merge_ranked([], key=lambda d: d, limit=3) == []
+
+def test_overlap_and_coverage():
+    assert overlap(["a", "b"], ["b", "c"]) == 1 / 3
+    assert overlap([], []) is None
+    assert query_coverage("S3 버킷 정책 설정", "S3 버킷 정책") == 1.0
+    assert query_coverage("S3 버킷 정책 설정", "IAM 역할 위임") == 0.0
+
+def test_rewrite_stats_summary():
+    stats = RewriteStats()
+    stats.record("speculative", 100, 200, 300, kb_overlap=0.5, speculation="accepted")
+    stats.record("speculative", 100, 400, 500, kb_overlap=1.0, speculation="merged")
+    summary = stats.summary()["speculative"]
+    assert summary["n"] == 2 and summary["accept_rate"] == 0.5
+    assert summary["kb_overlap"] == 0.75 and summary["mcp_overlap"] is None
+
+
+def kb_doc(uri, score=0.9):
+    return Document(page_content=f"{uri} 내용", metadata={"score": score, "location": {"s3Location": {"uri": uri}}})
+
+class FakeSources: # KB / AWS 문서 검색 호출 기록
+    def __init__(self, summary):
+        self.summary = summary
+        self.kb_calls, self.mcp_calls = [], []
+        self.lock = threading.Lock()
+
+    def install(self, monkeypatch):
+        monkeypatch.setattr(app_chain, "QUERY_REWRITE_MODE", "speculative")
+        monkeypatch.setattr(app_chain, "rewrite_stats", RewriteStats())
+        monkeypatch.setattr(app_chain, "summarize_question", lambda q: self.summary)
+        monkeypatch.setattr(app_chain, "knowledge_base_fetch", self.kb)
+        monkeypatch.setattr(app_chain, "mcp_fetch_sync", self.mcp)
+
+    def kb(self, query):
+        with self.lock:
+            self.kb_calls.append(query)
+        return [kb_doc(f"s3://kb/{query}/{i}.json") for i in range(2)]
+
+    def mcp(self, query):
+        with self.lock:
+            self.mcp_calls.append(query)
+        return [{"title": "문서", "url": f"https://docs.aws/{query}", "content": "본문"}]
+
+def test_speculative_accepts_raw_results_when_summary_is_close(monkeypatch):
+    sources = FakeSources("S3 버킷 정책")
+    sources.install(monkeypatch)
+    inputs = app_chain.prepare_inputs("S3 버킷 정책 설정 방법")
+
+    assert sources.kb_calls == ["S3 버킷 정책 설정 방법"] and sources.mcp_calls == ["S3 버킷 정책 설정 방법"]
+    assert len(inputs["kb_sources"]) == 2
+    assert app_chain.rewrite_stats.summary()["speculative"]["accept_rate"] == 1.0
+
+def test_speculative_merges_kb_and_queries_mcp_once(monkeypatch):
+    sources = FakeSources("IAM 역할 위임")
+    sources.install(monkeypatch)
+    inputs = app_chain.prepare_inputs("다른 계정 버킷 접근")
+
+    assert sorted(sources.kb_calls) == sorted(["다른 계정 버킷 접근", "IAM 역할 위임"])
+    assert sources.mcp_calls == ["다른 계정 버킷 접근"] # AWS 문서는 질문당 한 번
+    assert {s["s3"].split("/")[3] for s in inputs["kb_sources"]} == {"다른 계정 버킷 접근", "IAM 역할 위임"}
+    summary = app_chain.rewrite_stats.summary()["speculative"]
+    assert summary["accept_rate"] == 0.0 and summary["kb_overlap"] == 0.0
@@ -3,11 +3,21 @@ import tempfile
 import os
 from dotenv import load_dotenv
 from src.pipeline.pipeline import get_pipeline
+from src.pipeline.jobs import IngestJobQueue
 
 load_dotenv()
 
 pipeline = get_pipeline()
 
+@st.cache_resource
+def get_job_queue():
+    # 스크립트가 다시 실행돼도 같은 큐(프로세스/스레드 풀)를 계속 사용
+    return IngestJobQueue(
+        pipeline,
+        load_workers=int(os.getenv("BATCH_LOAD_WORKERS", str(os.cpu_count() or 1))),
+        index_workers=int(os.getenv("BATCH_INDEX_WORKERS", "4")),
+    )
+
 st.set_page_config(layout="wide")
 st.title("Data Engineering Demo")
 
@@ -16,6 +26,7 @@ with st.sidebar:
         if st.button("인덱스 초기화", type="primary"):
             if pipeline.reset_index():
                 st.success("인덱스 초기화 성공\n비동기로 처리되므로, 실제 반영에는 살짝 시간이 걸릴 수 있숩니다.")
+                st.caption(pipeline.last_reset_report.summary())
             else:
                 st.error("인덱스 초기화 실패")
 
@@ -29,10 +40,20 @@ with tab1:
     
     col1, col2 = st.columns(2)
     with col1:
-        source_type = st.radio("데이터 소스 선택:", ('PDF', 'Web URL'), horizontal=True, key="source_type")
+        source_type = st.radio("데이터 소스 선택:", ('PDF', 'Web URL', 'Crawl'), horizontal=True, key="source_type")
+        # 여러 소스를 백그라운드 작업으로 넘기고 바로 반환 (진행 상태는 아래에서 조회)
+        batch = source_type != 'Crawl' and st.checkbox("배치 ingest (백그라운드)", value=False)
         if source_type == 'PDF':
-            uploaded_file = st.file_uploader("pdf 파일 업로드", type="pdf")
-            source_input = uploaded_file
+            uploaded_file = st.file_uploader("pdf 파일 업로드", type="pdf", accept_multiple_files=batch)
+            source_input = uploaded_file or None
+        elif source_type == 'Crawl':
+            # 한 줄에 하나씩 seed url 또는 sitemap.xml url
+            # 기본값은 비워둔다 (버튼 한 번으로 남의 사이트 전체를 크롤링하지 않게)
+            seeds_text = st.text_area("seed url / sitemap 목록", "", placeholder="https://example.com/sitemap.xml")
+            source_input = [line.strip() for line in seeds_text.splitlines() if line.strip()] or None
+        elif batch: # WebURL 여러 개
+            urls_text = st.text_area("web url 목록 (한 줄에 하나)", "https://python.org/")
+            source_input = [line.strip() for line in urls_text.splitlines() if line.strip()] or None
         else: # WebURL
             source_input = st.text_input("web url 입력", "https://python.org/") # 이게 그나마 가져오는 데이터가 안정적
     
@@ -41,16 +62,52 @@ with tab1:
             "chunk 방법 선택:",
             ("recursive", "semantic", "fixed")
         )
+        # recursive/semantic은 chunk size를 임베딩 토큰 예산으로도 쓸 수 있다
+        chunk_unit = "chars"
+        if chunker_type in ("recursive", "semantic"):
+            chunk_unit = st.radio("chunk size 단위", ("chars", "tokens"), horizontal=True)
         chunk_size = st.number_input("chunk size", min_value=100, max_value=8000, value=1000, step=100)
         
         # overlap은 fixed에만 노출
         chunk_overlap = 0
         if chunker_type == "fixed":
-            chunk_overlap = st.number_input("chunk overlap", min_value=0, max_value=4000, value=100, step=50)
+            # overlap이 chunk size 이상이면 청크가 앞으로 나가지 않는다
+            chunk_overlap = st.number_input("chunk overlap", min_value=0, max_value=chunk_size - 1, value=min(100, chunk_size - 1), step=50)
+
+        # 페이지 단위로 청크/인덱싱 (대용량 PDF용)
+        streaming = st.checkbox("스트리밍 모드", value=False)
+        # 이전에 넣은 같은 소스와 비교해서 바뀐 청크만 반영
+        incremental = st.checkbox("증분 ingest", value=False, disabled=streaming)
+
+    if batch and st.button("배치 ingest 제출", disabled=(source_input is None)):
+        sources = source_input
+        if source_type == 'PDF':
+            # 업로드 파일을 임시 저장 (작업이 끝나면 큐가 삭제)
+            sources = []
+            for f in source_input:
+                with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
+                    tmp_file.write(f.getvalue())
+                    sources.append(tmp_file.name)
+        try:
+            job_id = get_job_queue().submit(
+                sources,
+                chunker=chunker_type,
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap,
+                remove_after=(source_type == 'PDF'),
+                chunk_unit=chunk_unit
+            )
+        except ValueError as e:
+            st.error(f"배치 작업 제출 실패: {e}")
+        else:
+            st.session_state.setdefault("batch_jobs", []).append(job_id)
+            st.success(f"배치 작업 제출: {job_id} ({len(sources)}개 소스)")
 
-    if st.button("ingest 시작", disabled=(source_input is None)):
+    if not batch and st.button("ingest 시작", disabled=(source_input is None)):
         source_path_or_url = ""
-        if isinstance(source_input, str):
+        if isinstance(source_input, list):
+            source_path_or_url = f"{len(source_input)}개 seed"
+        elif isinstance(source_input, str):
             source_path_or_url = source_input
         else:
             # PDF 파일 임시 저장
@@ -61,12 +118,48 @@ with tab1:
         with st.status(f"ingest 중 '{source_path_or_url}'...", expanded=True) as status:
             try:
                 # 파이프라인 실행
-                docs = pipeline.run(
-                    source=source_path_or_url,
-                    chunker=chunker_type,
-                    chunk_size=chunk_size,
-                    chunk_overlap=chunk_overlap
-                )
+                if source_type == 'Crawl':
+                    docs = []
+                    for batch_docs in pipeline.run_crawl(
+                        seeds=source_input,
+                        chunker=chunker_type,
+                        chunk_size=chunk_size,
+                        chunk_overlap=chunk_overlap,
+                        chunk_unit=chunk_unit
+                    ):
+                        docs.extend(batch_docs)
+                        st.write(f"{len(docs)} chunks 인덱싱됨")
+                    st.write(f"크롤링: {pipeline.crawler.last_stats.summary()}")
+                    st.write(f"증분 ingest: {pipeline.last_crawl_report.summary()}")
+                elif incremental and not streaming:
+                    report = pipeline.run_incremental(
+                        source=source_path_or_url,
+                        chunker=chunker_type,
+                        chunk_size=chunk_size,
+                        chunk_overlap=chunk_overlap,
+                        chunk_unit=chunk_unit
+                    )
+                    st.write(f"증분 ingest: {report.summary()}")
+                    docs = report.docs
+                elif streaming:
+                    docs = []
+                    for batch_docs in pipeline.run_stream(
+                        source=source_path_or_url,
+                        chunker=chunker_type,
+                        chunk_size=chunk_size,
+                        chunk_overlap=chunk_overlap,
+                        chunk_unit=chunk_unit
+                    ):
+                        docs.extend(batch_docs)
+                        st.write(f"{len(docs)} chunks 인덱싱됨")
+                else:
+                    docs = pipeline.run(
+                        source=source_path_or_url,
+                        chunker=chunker_type,
+                        chunk_size=chunk_size,
+                        chunk_overlap=chunk_overlap,
+                        chunk_unit=chunk_unit
+                    )
                 status.update(label=f"ingest 완료. {len(docs)} chunks", state="complete")
                 st.subheader("청크 결과")
                 st.json(docs, expanded=False)
@@ -78,12 +171,33 @@ with tab1:
                 if 'tmp_file' in locals() and os.path.exists(source_path_or_url):
                     os.remove(source_path_or_url)
 
+    # 배치 작업 상태 (다시 그릴 때마다 조회만 하고 기다리지 않음)
+    if st.session_state.get("batch_jobs"):
+        st.subheader("배치 작업")
+        st.button("상태 새로고침")
+        job_queue = get_job_queue()
+        for job_id in reversed(st.session_state["batch_jobs"]):
+            job = job_queue.get(job_id)
+            if job is None:
+                continue
+            st.progress(job.progress, text=f"{job_id} - {job.summary()}")
+            rows = []
+            for status in job.sources.values():
+                row = {"source": os.path.basename(status.source) or status.source, "state": status.state, "chunks": status.chunks}
+                for stage, sec in status.timings.items():
+                    row[f"{stage}(s)"] = round(sec, 2)
+                if status.error:
+                    row["error"] = status.error
+                rows.append(row)
+            st.dataframe(rows, use_container_width=True)
+
 # 결과 확인 쪽
 with tab2:
     st.header("결과 확인(검색)")
     st.info("ingested한 데이터에 대해 검색.")
 
     query = st.text_input("입력:", key="query")
+    fusion = st.radio("결합 방식:", ("weighted", "rrf", "server"), horizontal=True, key="fusion")
     
     if st.button("검색"):
         if not query:
@@ -91,8 +205,13 @@ with tab2:
         else:
             with st.spinner("검색중"):
                 try:
-                    search_results = pipeline.search(query=query, k=10)
+                    search_results = pipeline.search(query=query, k=10, fusion=fusion)
                     st.success(f"{len(search_results)}개의 검색결과")
+                    timings = ", ".join(f"{name} {sec * 1000:.0f}ms" for name, sec in pipeline.last_search_timings.items())
+                    st.caption(f"검색 시간: {timings}")
+                    cache_stats = pipeline.search_cache.stats()
+                    st.caption(f"캐시 적중률: 결과 {cache_stats['results']['hit_rate']:.0%}, "
+                               f"질의 벡터 {cache_stats['query_vectors']['hit_rate']:.0%}")
                     
                     for result in search_results:
                         with st.expander(f"**점수: {result['score']:.4f}** - Source: {result['metadata'].get('source', 'N/A')}"):
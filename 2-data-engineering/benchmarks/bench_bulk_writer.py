@@ -0,0 +1,24 @@
+# BulkIndexWriter 동시성별 docs/sec 측정 (가짜 OpenSearch 사용)
+# 실행: python -m benchmarks.bench_bulk_writer
+from langchain_core.documents import Document
+from src.pipeline.bulk_writer import BulkIndexWriter
+from src.tests.fake_opensearch import FakeOpenSearch
+
+N_DOCS = 2000
+DIM = 1024
+
+def fake_embed(texts):
+    return [[0.01] * DIM for _ in texts]
+
+def main():
+    docs = [Document(page_content=f"chunk {i} " * 50, metadata={"id": f"doc-{i}"}) for i in range(N_DOCS)]
+    for concurrency in (1, 2, 4, 8):
+        # 요청당 100ms + 문서당 0.5ms, 항목 2%는 429
+        client = FakeOpenSearch(latency=0.1, per_doc_latency=0.0005, failure_rate=0.02, seed=7)
+        writer = BulkIndexWriter(client, "bench", max_docs=100, max_bytes=2 * 1024 * 1024,
+                                 concurrency=concurrency, base_delay=0.01)
+        stats = writer.write(docs, fake_embed, raise_on_error=False)
+        print(f"concurrency={concurrency} | {stats.summary()} | 최대 동시 요청 {client.max_in_flight}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+# recursive / fixed 청커가 입력 크기에 선형으로 늘어나는지 확인 (최대 50MB)
+# 실행: python -m benchmarks.bench_chunkers
+import time
+from src.chunker.fixed_chunker import iter_fixed_chunks
+from src.chunker.recursive_chunker import iter_recursive_chunks
+
+SIZES_MB = [6.25, 12.5, 25, 50]
+
+def make_text(mb: float) -> str:
+    # 짧은 문단이 많은 문서 (청크 하나에 문단이 수백 개 들어가는 최악의 경우)
+    paragraph = "S3 버킷 정책과 IAM 역할 설명. 다음 문장!"
+    unit = paragraph + "\n\n"
+    n = int(mb * 1e6 / len(unit.encode("utf-8")))
+    return unit * n
+
+def measure(fn, text):
+    started = time.perf_counter()
+    count = 0
+    for _ in fn(text):
+        count += 1
+    return time.perf_counter() - started, count
+
+def main():
+    cases = [
+        ("recursive(8000)", lambda t: iter_recursive_chunks(t, chunk_size=8000)),
+        ("fixed(1000, 100)", lambda t: iter_fixed_chunks(t, max_chars=1000, overlap=100)),
+    ]
+    for name, fn in cases:
+        base = None
+        for mb in SIZES_MB:
+            text = make_text(mb)
+            elapsed, count = measure(fn, text)
+            per_mb = elapsed / mb
+            base = base or per_mb
+            print(f"{name:<17} | {mb:>5} MB | {elapsed:6.2f}s | {count:>7} chunks | {mb / elapsed:6.1f} MB/s | MB당 시간 x{per_mb / base:.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# 근사 중복 제거: 크롤링한 페이지처럼 메뉴/면책 문구가 반복되는 청크 묶음에서
+# 적재(=임베딩 호출) 청크 수, 잘못 제외된 고유 청크 수, 청크당 처리 시간, signature 파일 크기 비교
+# 실행: python -m benchmarks.bench_dedup
+import os
+import random
+import tempfile
+import time
+from src.pipeline.dedup import NearDuplicateIndex
+
+N_PAGES = 500
+
+def make_pages(seed: int = 0):
+    rng = random.Random(seed)
+    vocab = [f"단어{i}" for i in range(5000)] + [f"term{i}" for i in range(5000)]
+    sentence = lambda: " ".join(rng.choice(vocab) for _ in range(rng.randint(8, 16))) + "."
+    nav = " ".join(sentence() for _ in range(5))
+    disclaimer = " ".join(sentence() for _ in range(6))
+    pages = []
+    for p in range(N_PAGES):
+        chunks = [
+            (f"{nav} 현재 위치: 문서 {p}", "boilerplate"), # 페이지마다 조금씩 다른 메뉴
+            (f"{disclaimer} 최종 수정 2024-{p % 12 + 1:02d}-{p % 28 + 1:02d}", "boilerplate"),
+        ]
+        chunks += [(" ".join(sentence() for _ in range(6)), "unique") for _ in range(rng.randint(3, 6))]
+        pages.append((f"https://docs.example.com/page/{p}", chunks))
+    return pages
+
+def main():
+    pages = make_pages()
+    total = sum(len(chunks) for _, chunks in pages)
+    unique = sum(1 for _, chunks in pages for _, kind in chunks if kind == "unique")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "dedup.json")
+        index = NearDuplicateIndex(path)
+        kept_kinds = []
+        started = time.perf_counter()
+        for url, chunks in pages:
+            items = ((f"{url}#{i}", text, kind) for i, (text, kind) in enumerate(chunks))
+            kept_kinds.extend(index.filter(url, items))
+        elapsed = time.perf_counter() - started
+        index.save()
+        size = os.path.getsize(path)
+
+    kept_unique = kept_kinds.count("unique")
+    print(f"청크 {total}개 -> 적재 {len(kept_kinds)}개 (임베딩 호출 {1 - len(kept_kinds) / total:.0%} 감소)")
+    print(f"반복 문구 청크 {total - unique}개 중 적재 {kept_kinds.count('boilerplate')}개, 고유 청크 잘못 제외 {unique - kept_unique}개")
+    print(f"청크당 {elapsed / total * 1e6:.0f} us, signature 파일 {size / 1024:.0f} KB ({size / len(kept_kinds):.0f} B/청크)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+# 가짜 bedrock-runtime으로 임베딩 처리량 비교
+# 실행: python -m benchmarks.bench_embedder
+from src.embedding.embedder import BedrockEmbedder
+from src.tests.fake_runtime import FakeBedrockRuntime
+
+N_TEXTS = 300
+LATENCY = 0.02 # 요청당 20ms
+THROTTLE_RATE = 0.05
+
+def main():
+    texts = [f"chunk {i}: Amazon Bedrock Titan embedding benchmark text {i % 17}" for i in range(N_TEXTS)]
+
+    for workers in (1, 4, 8, 16):
+        fake = FakeBedrockRuntime(latency=LATENCY, throttle_rate=THROTTLE_RATE, seed=42)
+        embedder = BedrockEmbedder(client=fake, max_workers=workers, base_delay=0.01, max_delay=0.1)
+        embedder.embed_texts(texts)
+        print(f"workers={workers:>2} | {embedder.last_stats.summary()}")
+
+if __name__ == "__main__":
+    main()
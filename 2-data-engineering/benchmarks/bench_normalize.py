@@ -0,0 +1,53 @@
+# text_normalize 기존 함수 vs fast_normalize 처리량(MB/s) 비교
+# 실행: python -m benchmarks.bench_normalize
+import random
+import time
+from src.cleaning.fast_normalize import normalize_web_text_fast, normalize_whitespace_fast
+from src.cleaning.text_normalize import normalize_web_text, normalize_whitespace
+
+N_PAGES = 400
+REPEAT = 3
+
+def make_corpus(seed=0):
+    # PDF에서 뽑은 것 같은 페이지: 머리글/바닥글, 탭, nbsp, \r\n, 빈 줄 연속
+    rng = random.Random(seed)
+    words = ["Amazon", "S3", "버킷", "정책", "IAM", "역할", "Lambda", "함수", "리전", "1024", "설정값"]
+    pages = []
+    for p in range(N_PAGES):
+        lines = ["ACME 클라우드 가이드  \t 2024"]
+        for _ in range(60):
+            sep = rng.choice([" ", "  ", "\t", " ", "   "])
+            lines.append(sep.join(rng.choice(words) for _ in range(rng.randint(4, 14))))
+            if rng.random() < 0.1:
+                lines.append("")
+                lines.append("")
+        lines.append(f"Page {p + 1}")
+        pages.append("\r\n".join(lines))
+    return pages
+
+def throughput(fn, arg, size):
+    best = float("inf")
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - started)
+    return size / 1e6 / best
+
+def main():
+    pages = make_corpus()
+    doc = "\n\n".join(pages)
+    size = len(doc.encode("utf-8"))
+    print(f"합성 코퍼스 {N_PAGES}페이지, {size / 1e6:.1f} MB")
+
+    cases = [
+        ("normalize_whitespace", normalize_whitespace, normalize_whitespace_fast, doc),
+        ("normalize_web_text", normalize_web_text, normalize_web_text_fast, doc),
+    ]
+    for name, old, fast, arg in cases:
+        assert old(arg) == fast(arg)
+        a = throughput(old, arg, size)
+        b = throughput(fast, arg, size)
+        print(f"{name:<22} | 기존 {a:7.1f} MB/s | fast {b:7.1f} MB/s | x{b / a:.2f}")
+
+if __name__ == "__main__":
+    main()
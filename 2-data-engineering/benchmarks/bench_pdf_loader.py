@@ -0,0 +1,26 @@
+# load_pdf 직렬 추출 vs 멀티프로세스 추출 비교
+# 실행: python -m benchmarks.bench_pdf_loader
+import os
+import tempfile
+import time
+from src.loader.pdf_loader import load_pdf
+from src.tests.pdf_fixture import make_text_pdf
+
+N_PAGES = 400
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_text_pdf(os.path.join(tmp, "large.pdf"), pages=N_PAGES, lines_per_page=60)
+        print(f"{N_PAGES} 페이지 PDF 생성 ({os.path.getsize(path) / 1e6:.1f} MB)")
+
+        baseline = None
+        for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+            started = time.perf_counter()
+            res = load_pdf(path, workers=workers)
+            elapsed = time.perf_counter() - started
+            if baseline is None:
+                baseline = elapsed
+            print(f"workers={workers:>2} | {elapsed:.2f}s | {len(res.pages) / elapsed:.0f} pages/sec | x{baseline / elapsed:.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# semantic_chunk legacy(청크 재임베딩) vs centroid(문장당 1회) 비교
+# 실행: python -m benchmarks.bench_semantic_chunker
+import random
+import time
+from src.chunker.semantic_chunker import semantic_chunk, split_text_to_sentences
+from src.embedding.embedder import BedrockEmbedder
+from src.tests.fake_runtime import FakeBedrockRuntime
+
+TOPICS = [
+    "amazon s3 bucket object storage durability region replication",
+    "aws lambda function serverless event trigger runtime timeout",
+    "opensearch index vector knn search mapping shard query",
+    "bedrock titan embedding model token input vector dimension",
+]
+
+def make_text(n_sentences: int, seed: int = 0) -> str:
+    rand = random.Random(seed)
+    sentences = []
+    topic = rand.choice(TOPICS).split()
+    for i in range(n_sentences):
+        if i % 8 == 0:
+            topic = rand.choice(TOPICS).split()
+        words = topic[:]
+        words[rand.randrange(len(words))] = rand.choice(rand.choice(TOPICS).split()) # 단어 하나는 섞기
+        rand.shuffle(words)
+        sentences.append(" ".join(words).capitalize() + ".")
+    return " ".join(sentences)
+
+def boundaries(chunks):
+    out, pos = set(), 0
+    for c in chunks[:-1]:
+        pos += len(split_text_to_sentences(c))
+        out.add(pos)
+    return out
+
+def main():
+    text = make_text(400)
+    results = {}
+    for mode in ("legacy", "centroid"):
+        fake = FakeBedrockRuntime(latency=0.002)
+        embedder = BedrockEmbedder(client=fake, max_workers=8)
+        started = time.perf_counter()
+        chunks = semantic_chunk(text, target_chars=1000, embedder=embedder, mode=mode)
+        elapsed = time.perf_counter() - started
+        results[mode] = chunks
+        print(f"{mode:>8} | chunks={len(chunks):>3} | embedding calls={fake.calls:>4} | {elapsed:.2f}s")
+
+    a, b = boundaries(results["legacy"]), boundaries(results["centroid"])
+    overlap = len(a & b) / max(1, len(a | b))
+    print(f"청크 경계 일치율(Jaccard): {overlap:.2f}")
+
+if __name__ == "__main__":
+    main()
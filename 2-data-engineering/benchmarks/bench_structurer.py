@@ -0,0 +1,47 @@
+# 청크 구조화(키워드 추출) 처리량: 예전 청크별 방식 vs structure_documents 배치 (tf / tfidf / 프로세스 풀)
+# 실행: python -m benchmarks.bench_structurer
+import gc
+import os
+import random
+import re
+import time
+from src.structuring.structurer import DocumentStructurer
+
+N_CHUNKS = 100_000
+WORDS = ["S3", "버킷", "정책은", "IAM", "역할을", "Lambda", "함수가", "요청을", "처리합니다", "the", "and",
+         "bucket", "policy", "retry", "2024", "로그", "암호화", "버전", "관리", "규칙"]
+
+def legacy_structure(structurer, texts):
+    # 예전 structure_document: 청크마다 불용어 set 생성, dict 빈도, 전체 정렬
+    def keywords(text, max_keywords=10):
+        words = re.findall(r'[가-힣a-zA-Z0-9]+', text.lower())
+        stopwords = {'의', '가', '이', '을', '를', '에', '와', '과', '으로', '로', 'and', 'or', 'the', 'a', 'an', 'in', 'on', 'at', 'to', 'for'}
+        freq = {}
+        for w in words:
+            if w not in stopwords and len(w) > 1:
+                freq[w] = freq.get(w, 0) + 1
+        return [w for w, _ in sorted(freq.items(), key=lambda x: x[1], reverse=True)[:max_keywords]]
+
+    return [structurer._build(t, "bench.pdf", "pdf", i, None, None, keywords(t)) for i, t in enumerate(texts)]
+
+def main():
+    rng = random.Random(0)
+    texts = [" ".join(rng.choice(WORDS) + str(rng.randint(0, 300)) for _ in range(80)) for _ in range(N_CHUNKS)]
+    workers = os.cpu_count() or 1
+    pooled = DocumentStructurer(workers=workers) # 프로세스 풀은 처음 호출 때 띄워서 재사용
+    cases = [
+        ("legacy", lambda: legacy_structure(DocumentStructurer(), texts)),
+        ("batch tf", lambda: DocumentStructurer().structure_documents(texts, "bench.pdf", "pdf")),
+        ("batch tfidf", lambda: DocumentStructurer(keyword_mode="tfidf").structure_documents(texts, "bench.pdf", "pdf")),
+        (f"batch tf x{workers}", lambda: pooled.structure_documents(texts, "bench.pdf", "pdf")),
+    ]
+    for name, fn in cases:
+        gc.collect() # 앞 케이스의 문서가 GC 대상으로 남아 있지 않게
+        started = time.perf_counter()
+        count = len(fn())
+        elapsed = time.perf_counter() - started
+        print(f"{name:<14} | {count:>7} chunks | {elapsed:6.2f}s | {count / elapsed:8.0f} chunks/s")
+    pooled.close()
+
+if __name__ == "__main__":
+    main()
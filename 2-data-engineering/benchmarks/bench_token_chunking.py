@@ -0,0 +1,51 @@
+# 글자 수 청크 vs 토큰 예산 청크: 같은 토큰 한도(임베딩 입력 한도)를 지키면서 청크가 몇 개 나오는지 비교
+# 글자 수 모드는 한국어/영어 비율에 따라 글자당 토큰 수가 달라서, 한도를 넘지 않으려면 가장 토큰이 많은 문서에 맞춰 작게 잡아야 한다
+# 실행: python -m benchmarks.bench_token_chunking
+import random
+import time
+from src.chunker.recursive_chunker import recursive_chunk
+from src.chunker.tokenizer import cache_info, estimate_tokens
+
+BUDGET = 512
+
+def make_docs(seed: int = 0):
+    rng = random.Random(seed)
+    ko = ["S3 버킷 정책은 접근 권한을 정의합니다.", "IAM 역할을 Lambda 함수에 연결합니다.", "요청이 실패하면 다시 시도합니다."]
+    en = ["The bucket policy grants read access to the role.", "Retries use exponential backoff with jitter.",
+          "Each request is signed with SigV4 credentials."]
+    docs = {}
+    for name, ratio in [("한국어", 1.0), ("혼합", 0.5), ("영어", 0.0)]:
+        paragraphs = []
+        for _ in range(800):
+            sentences = [rng.choice(ko) if rng.random() < ratio else rng.choice(en) for _ in range(rng.randint(1, 6))]
+            paragraphs.append(" ".join(sentences))
+        docs[name] = "\n\n".join(paragraphs)
+    return docs
+
+def max_safe_chars(docs) -> int:
+    # 모든 문서에서 청크가 BUDGET 토큰을 넘지 않는 가장 큰 글자 수 chunk_size
+    best = 100
+    for size in range(100, 4001, 50):
+        if all(estimate_tokens(c) <= BUDGET for text in docs.values() for c in recursive_chunk(text, size)):
+            best = size
+    return best
+
+def main():
+    docs = make_docs()
+    size = max_safe_chars(docs)
+    print(f"토큰 한도 {BUDGET}: 글자 수 모드에서 넘지 않는 최대 chunk_size = {size}")
+    for name, text in docs.items():
+        started = time.perf_counter()
+        by_chars = recursive_chunk(text, size)
+        chars_time = time.perf_counter() - started
+        started = time.perf_counter()
+        by_tokens = recursive_chunk(text, BUDGET, unit="tokens")
+        tokens_time = time.perf_counter() - started
+        fill_chars = sum(estimate_tokens(c) for c in by_chars) / len(by_chars) / BUDGET
+        fill_tokens = sum(estimate_tokens(c) for c in by_tokens) / len(by_tokens) / BUDGET
+        print(f"{name:<4} | chars({size}) {len(by_chars):>4} chunks, 한도 대비 {fill_chars:4.0%}, {chars_time * 1000:6.1f} ms"
+              f" | tokens({BUDGET}) {len(by_tokens):>4} chunks, 한도 대비 {fill_tokens:4.0%}, {tokens_time * 1000:6.1f} ms")
+    print(f"토크나이저 캐시: {cache_info()}")
+
+if __name__ == "__main__":
+    main()
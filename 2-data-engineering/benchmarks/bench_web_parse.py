@@ -0,0 +1,42 @@
+# load_web 예전 방식(파서 3번 + web_to_plain 재파싱) vs parse_html 한 번 파싱 비교
+# 실행: python -m benchmarks.bench_web_parse
+import time
+from src.cleaning.table_to_markdown import html_table_to_markdown
+from src.cleaning.text_normalize import normalize_web_text, web_to_plain
+from src.loader.webbase_loader import default_parser, extract_img_src, extract_text, extract_title, parse_html
+from src.tests.html_fixture import make_html_page
+
+N_PAGES = 30
+SECTIONS = 200
+
+def legacy(html):
+    title = extract_title(html)
+    text = extract_text(html)
+    imgs = extract_img_src(html)
+    plain = web_to_plain(text) # 코드 블록의 <, > 때문에 한 번 더 파싱됨
+    tables = html_table_to_markdown(html)
+    return title, plain, imgs, tables
+
+def single(html, parser):
+    parsed = parse_html(html, parser)
+    return parsed.title, normalize_web_text(parsed.text_plain), parsed.image_urls, parsed.tables
+
+def measure(fn, pages, *args):
+    started = time.perf_counter()
+    for html in pages:
+        fn(html, *args)
+    return (time.perf_counter() - started) / len(pages)
+
+def main():
+    pages = [make_html_page(sections=SECTIONS, seed=i) for i in range(N_PAGES)]
+    size = sum(len(p) for p in pages) / len(pages)
+    print(f"HTML {N_PAGES}페이지 (평균 {size / 1e3:.0f} KB)")
+
+    base = measure(legacy, pages)
+    print(f"legacy (4~5회 파싱)        | {base * 1000:.1f} ms/page")
+    for parser in sorted({"html.parser", default_parser()}):
+        t = measure(single, pages, parser)
+        print(f"single ({parser:<11})      | {t * 1000:.1f} ms/page | 절약 {(base - t) * 1000:.1f} ms/page | x{base / t:.2f}")
+
+if __name__ == "__main__":
+    main()
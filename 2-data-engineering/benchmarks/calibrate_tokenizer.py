@@ -0,0 +1,38 @@
+# 토큰 추정 배율(TOKEN_ESTIMATE_SCALE) 보정: 문서 청크를 Bedrock에 보내 inputTextTokenCount와 규칙 기반 개수를 비교
+# 실제로 적재할 문서(한국어/영어/코드 비율이 비슷한 것)를 넣어서 돌리고, 출력된 배율을 .env에 넣는다
+# 실행: python -m benchmarks.calibrate_tokenizer 문서.pdf https://... 메모.txt ... (--fake: 가짜 bedrock-runtime)
+import sys
+from dotenv import load_dotenv
+from src.chunker.recursive_chunker import recursive_chunk
+from src.chunker.tokenizer import calibrate_scale, raw_tokens
+from src.embedding.embedder import BedrockEmbedder
+from src.tests.fake_runtime import FakeBedrockRuntime
+from src.pipeline.stages import load_text
+
+CHUNK_SIZE = 500
+MAX_SAMPLES = 300
+
+def read(source: str) -> str:
+    if source.endswith((".txt", ".md")):
+        with open(source, encoding="utf-8") as f:
+            return f.read()
+    return load_text(source) # PDF / URL
+
+def main():
+    load_dotenv()
+    args = [a for a in sys.argv[1:] if a != "--fake"]
+    if not args:
+        print("사용법: python -m benchmarks.calibrate_tokenizer 문서 [문서 ...] [--fake]")
+        return
+    embedder = BedrockEmbedder(client=FakeBedrockRuntime(dimension=8) if "--fake" in sys.argv else None)
+
+    texts = [c for path in args for c in recursive_chunk(read(path), CHUNK_SIZE)]
+    step = max(1, len(texts) // MAX_SAMPLES)
+    samples = [(t, embedder.token_count(t)) for t in texts[::step][:MAX_SAMPLES]]
+    samples = [(t, n) for t, n in samples if n]
+    ratios = sorted(n / max(raw_tokens(t), 1) for t, n in samples)
+    print(f"표본 {len(samples)}개 | 실제/규칙 비율 중앙값 {ratios[len(ratios) // 2]:.3f}, 최대 {ratios[-1]:.3f}")
+    print(f'TOKEN_ESTIMATE_SCALE="{calibrate_scale(samples)}"')
+
+if __name__ == "__main__":
+    main()
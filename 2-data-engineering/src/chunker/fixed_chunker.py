@@ -1,17 +1,23 @@
-from typing import List
+from typing import Iterator, List
+from .spans import Chunk
 
-def fixed_chunk(text: str, max_chars: int, overlap: int) -> List[str]:
+def iter_fixed_chunks(text: str, max_chars: int, overlap: int) -> Iterator[Chunk]:
+    # 원문 offset만 옮기면서 하나씩 생성
+    if overlap < 0 or overlap >= max_chars:
+        # overlap >= max_chars면 start가 앞으로 가지 않아서 무한 루프
+        raise ValueError(f"overlap은 0 이상, max_chars({max_chars})보다 작아야 합니다: {overlap}")
     if not text:
-        return []
+        return
 
-    chunks: List[str] = []
     length = len(text)
     start = 0 # 현재 인덱스
     while start < length:
         end = min(start + max_chars, length)
-        chunks.append(text[start:end])
+        yield Chunk(text=text[start:end], start=start, end=end)
 
         if end == length:
             break
         start = end - overlap
-    return chunks
\ No newline at end of file
+
+def fixed_chunk(text: str, max_chars: int, overlap: int) -> List[str]:
+    return [c.text for c in iter_fixed_chunks(text, max_chars, overlap)]
@@ -1,5 +1,7 @@
 import re
-from typing import List
+from typing import Iterator, List, Tuple
+from .spans import Chunk, split_spans
+from .tokenizer import estimate_tokens, token_spans
 
 PARAGRAPH_SPLIT_RE = re.compile(r"\n{2,}") # 문단 분할
 SENTENCE_SPLIT_RE = re.compile(r"(?<=[\.!\?]|[。！？])\s+|(?<=\n)\s*") # 문장 분할
@@ -21,58 +23,79 @@ def split_sentences(text: str) -> List[str]:
 
 
 
-def recursive_chunk(text: str, chunk_size: int) -> List[str]:
+def iter_recursive_chunks(text: str, chunk_size: int, unit: str = "chars") -> Iterator[Chunk]:
+    # 문단/문장의 원문 offset만 들고 있다가 청크를 만들 때만 문자열로 합친다
+    # 버퍼 길이는 누적 값으로 관리 (매번 join해서 len 재지 않음)
+    # unit="tokens"면 chunk_size를 토큰 예산으로 보고, 예산을 넘는 청크를 만들지 않는다 (1.5배 여유 없음)
     if not text:
-        return []
+        return
 
-    target_chars = chunk_size
-    hard_max_chars = int(chunk_size * 1.5)
+    if unit == "tokens":
+        target_chars = hard_max_chars = chunk_size
+        para_sep, sent_sep = 0, 0
+        measure = lambda s, e: estimate_tokens(text[s:e])
+    else:
+        target_chars = chunk_size
+        hard_max_chars = int(chunk_size * 1.5)
+        para_sep, sent_sep = 2, 1 # "\n\n", " "
+        measure = lambda s, e: e - s
 
-    chunks: List[str] = []
-    paragraph_buffer: List[str] = []
-    current_length = 0
+    paragraph_buffer: List[Tuple[int, int, int]] = [] # (start, end, 길이)
+    current_length = 0 # "\n\n".join(paragraph_buffer)의 길이
 
-    def flush(): 
+    def joined_chunk(spans: List[Tuple[int, int, int]], sep: str) -> Chunk:
+        return Chunk(text=sep.join(text[s:e] for s, e, _ in spans), start=spans[0][0], end=spans[-1][1])
+
+    def flush() -> Iterator[Chunk]:
         # paragraph buffer flush!
-        nonlocal paragraph_buffer, current_length
-        if not paragraph_buffer:
+        if current_length <= hard_max_chars:
+            yield joined_chunk(paragraph_buffer, "\n\n")  # hard_max_chars 보다 이하이므로 청크로 바로 추가
             return
-        
-        joined = "\n\n".join(paragraph_buffer)
-        if len(joined) <= hard_max_chars:
-            chunks.append(joined)  # hard_max_chars 보다 이하이므로 청크로 바로 추가
-        else:
-            # 너무 긴 문단 묶음은 문장 단위로 쪼개야한다
-            for par in paragraph_buffer:
-                if len(par) <= hard_max_chars:
-                    chunks.append(par)
-                else:
-                    sentence_buffer: List[str] = []
-                    sentence_length = 0
-                    for s in split_sentences(par):
-                        if sentence_length + len(s) + (1 if sentence_buffer else 0) > hard_max_chars:  # 문장 간 공백 1 주기
-                            if sentence_buffer:
-                                chunks.append(" ".join(sentence_buffer))
-                            sentence_buffer = [s]
-                            sentence_length = len(s)
-                        else:
-                            sentence_buffer.append(s)
-                            sentence_length += len(s) + 1
+
+        # 너무 긴 문단 묶음은 문장 단위로 쪼개야한다
+        for ps, pe, pn in paragraph_buffer:
+            if pn <= hard_max_chars:
+                yield Chunk(text=text[ps:pe], start=ps, end=pe)
+                continue
+
+            sentence_buffer: List[Tuple[int, int, int]] = []
+            sentence_length = 0
+            for ss, se in split_spans(SENTENCE_SPLIT_RE, text[ps:pe], ps):
+                n = measure(ss, se)
+                if unit == "tokens" and n > hard_max_chars:
+                    # 문장 하나가 토큰 예산보다 길면 fixed처럼 예산 단위로 자른다 (예산을 넘는 청크는 만들지 않음)
+                    if sentence_buffer:
+                        yield joined_chunk(sentence_buffer, " ")
+                    sentence_buffer, sentence_length = [], 0
+                    for s, e in token_spans(text[ss:se], hard_max_chars, ss):
+                        yield Chunk(text=text[s:e], start=s, end=e)
+                    continue
+                if sentence_length + n + (sent_sep if sentence_buffer else 0) > hard_max_chars:  # 문장 간 공백 1 주기
                     if sentence_buffer:
-                        chunks.append(" ".join(sentence_buffer))
-        paragraph_buffer = []
-        current_length = 0
-
-    for par in split_paragraphs(text):
-        paragraph_length = len(par)
-        if current_length and current_length + 2 + paragraph_length > target_chars:
-            flush()
-            
-        paragraph_buffer.append(par)
-        current_length = len("\n\n".join(paragraph_buffer))
+                        yield joined_chunk(sentence_buffer, " ")
+                    sentence_buffer = [(ss, se, n)]
+                    sentence_length = n
+                else:
+                    sentence_buffer.append((ss, se, n))
+                    sentence_length += n + sent_sep
+            if sentence_buffer:
+                yield joined_chunk(sentence_buffer, " ")
+
+    for ps, pe in split_spans(PARAGRAPH_SPLIT_RE, text):
+        paragraph_length = measure(ps, pe)
+        if current_length and current_length + para_sep + paragraph_length > target_chars:
+            yield from flush()
+            paragraph_buffer, current_length = [], 0
+
+        current_length += paragraph_length + (para_sep if paragraph_buffer else 0)
+        paragraph_buffer.append((ps, pe, paragraph_length))
 
         if current_length > hard_max_chars:
-            flush()
+            yield from flush()
+            paragraph_buffer, current_length = [], 0
+
+    if paragraph_buffer:
+        yield from flush()
 
-    flush()
-    return chunks
\ No newline at end of file
+def recursive_chunk(text: str, chunk_size: int, unit: str = "chars") -> List[str]:
+    return [c.text for c in iter_recursive_chunks(text, chunk_size, unit)]
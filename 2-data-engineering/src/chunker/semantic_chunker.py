@@ -1,7 +1,9 @@
 import math
 import re
 from typing import List, Optional
+import numpy as np
 from ..embedding.embedder import BedrockEmbedder
+from .tokenizer import estimate_tokens
 
 SENT_SPLIT = re.compile(r"(?<=[\.!\?]|[。！？])\s+|(?<=\n)\s*")
 threshold = 0.7
@@ -38,7 +40,21 @@ def cosine_sim(vec1, vec2):
     return dot / (norm1 * norm2)
 
 
-def semantic_chunk(text: str, target_chars: int, embedder: BedrockEmbedder) -> List[str]:
+def to_unit_matrix(vectors: List[Optional[List[float]]]) -> np.ndarray:
+    # (n, d) float32 행렬로 만들고 각 행을 단위 벡터로. 임베딩 실패(None)는 0 벡터
+    dim = next((len(v) for v in vectors if v), 0)
+    matrix = np.zeros((len(vectors), dim), dtype=np.float32)
+    for i, v in enumerate(vectors):
+        if v:
+            matrix[i] = v
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def semantic_chunk(text: str, target_chars: int, embedder: BedrockEmbedder, mode: str = "centroid",
+                   max_tokens: Optional[int] = None) -> List[str]:
+    # max_tokens를 주면 target_chars 대신 토큰 예산으로 청크 길이를 제한 (centroid 모드만)
     if not text:
         return []
 
@@ -49,6 +65,45 @@ def semantic_chunk(text: str, target_chars: int, embedder: BedrockEmbedder) -> L
     if len(sentences) == 1:
         return [text]
 
+    if mode == "legacy":
+        return _semantic_chunk_legacy(sentences, target_chars, embedder)
+    return _semantic_chunk_centroid(sentences, target_chars, embedder, max_tokens)
+
+
+def _semantic_chunk_centroid(sentences: List[str], target_chars: int, embedder: BedrockEmbedder,
+                             max_tokens: Optional[int] = None) -> List[str]:
+    # 문장마다 한 번만 임베딩(배치)하고, 청크 임베딩은 문장 임베딩의 누적 centroid로 대신한다
+    matrix = to_unit_matrix(embedder.embed_texts(sentences))
+    measure = estimate_tokens if max_tokens else len
+    if max_tokens:
+        target_chars = max_tokens
+    lengths = np.fromiter((measure(s) for s in sentences), dtype=np.int64, count=len(sentences))
+    cum_len = np.concatenate(([0], np.cumsum(lengths)))
+
+    chunks: List[str] = []
+    start = 0
+    n = len(sentences)
+    while start < n:
+        # 길이 제한 안에서 가능한 마지막 위치 (첫 문장은 길어도 항상 포함)
+        limit = int(np.searchsorted(cum_len, cum_len[start] + target_chars, side="right")) - 1
+        limit = min(n, max(limit, start + 1))
+
+        window = matrix[start:limit]
+        centroids = np.cumsum(window[:-1], axis=0) # [start..j] 청크의 centroid (합)
+        norms = np.linalg.norm(centroids, axis=1)
+        dots = np.einsum("ij,ij->i", centroids, window[1:])
+        sims = np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+
+        breaks = np.flatnonzero(sims < threshold)
+        end = start + int(breaks[0]) + 1 if breaks.size else limit
+        chunks.append(' '.join(sentences[start:end]))
+        start = end
+
+    return chunks
+
+
+def _semantic_chunk_legacy(sentences: List[str], target_chars: int, embedder: BedrockEmbedder) -> List[str]:
+    # 이전 방식: 청크 텍스트 전체를 매번 다시 임베딩 (비교용)
     chunks: List[str] = []
     current_chunk_sentences: List[str] = [sentences[0]]
     current_chunk_embedding: Optional[List[float]] = None
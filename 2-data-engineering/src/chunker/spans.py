@@ -0,0 +1,49 @@
+import re
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
+
+@dataclass
+class Chunk:
+    text: str
+    start: int  # 원문에서 청크가 시작하는 문자 offset
+    end: int    # 끝 offset (exclusive)
+
+
+def strip_span(text: str, start: int, end: int) -> Optional[Tuple[int, int]]:
+    # text[start:end].strip()에 해당하는 구간. 공백뿐이면 None
+    segment = text[start:end]
+    stripped = segment.lstrip()
+    if not stripped:
+        return None
+    s = start + len(segment) - len(stripped)
+    return s, s + len(stripped.rstrip())
+
+def split_spans(pattern, text: str, offset: int = 0) -> Iterator[Tuple[int, int]]:
+    # [s.strip() for s in pattern.split(text) if s.strip()]의 구간 버전 (offset은 원문 기준 보정값)
+    prev = 0
+    for m in pattern.finditer(text):
+        span = strip_span(text, prev, m.start())
+        if span:
+            yield offset + span[0], offset + span[1]
+        prev = m.end()
+    span = strip_span(text, prev, len(text))
+    if span:
+        yield offset + span[0], offset + span[1]
+
+def align_chunks(text: str, chunk_texts: List[str]) -> List[Chunk]:
+    # 문자열만 돌려주는 청커(semantic)의 결과를 원문 offset에 맞춘다
+    # 청크는 원문 순서대로이고, 원문과는 공백만 다르다고 가정 (못 찾으면 start/end = -1)
+    chunks = []
+    pos = 0
+    for chunk in chunk_texts:
+        tokens = chunk.split()
+        m = None
+        if tokens:
+            pattern = re.compile(r"\s+".join(re.escape(t) for t in tokens))
+            m = pattern.search(text, pos)
+        if m is None:
+            chunks.append(Chunk(text=chunk, start=-1, end=-1))
+            continue
+        chunks.append(Chunk(text=chunk, start=m.start(), end=m.end()))
+        pos = m.end()
+    return chunks
@@ -0,0 +1,71 @@
+# Titan 임베딩 토큰 수를 추정하는 로컬 토크나이저 (외부 의존성 없음, 짧은 조각은 캐시)
+# 한글은 음절당 1토큰, 영어 단어는 4자당 1토큰, 숫자는 3자리당 1토큰, 그 외 기호는 1토큰으로 센 값에 SCALE을 곱한다
+# 정확한 값이 아니므로, SCALE은 Bedrock이 돌려주는 inputTextTokenCount로 보정해서 쓴다 (calibrate_scale, benchmarks/calibrate_tokenizer.py)
+import math
+import os
+import re
+from functools import lru_cache
+from typing import Iterable, Iterator, Optional, Tuple
+
+_PIECE_RE = re.compile(r"[가-힣]+|[A-Za-z]+|\d+|\S")
+CACHE_MAX_CHARS = 64 # 짧은 조각(단어, 짧은 문장)만 캐시 (긴 문장/문단은 거의 반복되지 않고 캐시 메모리만 차지)
+SCALE = float(os.getenv("TOKEN_ESTIMATE_SCALE", "1.0")) # 규칙으로 센 값 -> 실제 토큰 수 보정 배율
+
+def _piece_tokens(piece: str) -> int:
+    c = piece[0]
+    if "가" <= c <= "힣":
+        return len(piece)
+    if c.isascii() and c.isalpha():
+        return (len(piece) + 3) // 4
+    if c.isdigit():
+        return (len(piece) + 2) // 3
+    return 1
+
+def _count(text: str) -> int:
+    return sum(map(_piece_tokens, _PIECE_RE.findall(text)))
+
+@lru_cache(maxsize=100_000)
+def _count_cached(text: str) -> int:
+    return _count(text)
+
+def raw_tokens(text: str) -> int:
+    # 보정 전 규칙 기반 개수
+    if len(text) <= CACHE_MAX_CHARS:
+        return _count_cached(text)
+    return _count(text)
+
+def estimate_tokens(text: str, scale: Optional[float] = None) -> int:
+    return math.ceil(raw_tokens(text) * (SCALE if scale is None else scale))
+
+def calibrate_scale(samples: Iterable[Tuple[str, int]], margin: float = 1.05) -> float:
+    # (텍스트, 실제 토큰 수) 표본에서 모든 표본을 덮는 배율. margin은 표본에 없던 텍스트를 위한 여유
+    worst = 0.0
+    for text, actual in samples:
+        raw = raw_tokens(text)
+        if raw:
+            worst = max(worst, actual / raw)
+    return round(max(worst, 1.0) * margin, 3)
+
+def token_spans(text: str, max_tokens: int, offset: int = 0, scale: Optional[float] = None) -> Iterator[Tuple[int, int]]:
+    # 예산보다 긴 문장을 estimate_tokens가 max_tokens 이하인 조각의 (start, end)로 자른다 (offset: text의 원문 위치)
+    # 조각 경계는 단어 경계. 한 단어가 예산보다 길면 글자 단위로 (글자 하나는 보정 전 최대 1토큰)
+    budget = max(1, int(max_tokens / (SCALE if scale is None else scale))) # 보정 전 개수 기준 예산
+    start, end, used = -1, 0, 0
+    for m in _PIECE_RE.finditer(text):
+        cost = _piece_tokens(m.group())
+        if start >= 0 and used + cost > budget:
+            yield offset + start, offset + end
+            start, used = -1, 0
+        if cost > budget:
+            for s in range(m.start(), m.end(), budget):
+                yield offset + s, offset + min(s + budget, m.end())
+            continue
+        if start < 0:
+            start = m.start()
+        end = m.end()
+        used += cost
+    if start >= 0:
+        yield offset + start, offset + end
+
+def cache_info():
+    return _count_cached.cache_info()
@@ -0,0 +1,35 @@
+# text_normalize의 정규화 함수들과 결과가 완전히 같은 빠른 버전
+# 패턴은 모듈 로드 때 한 번만 컴파일하고, 들어있지 않은 문자는 치환하지 않는다
+# (str.translate는 한글처럼 ASCII가 아닌 문자열에서 replace보다 훨씬 느려서 사용하지 않음)
+import re
+
+_MULTI_SPACE = re.compile(r" {2,}")
+_MULTI_NEWLINE = re.compile(r"\n{3,}")
+_MULTI_WS = re.compile(r"\s{2,}")
+
+def _fold_whitespace(text: str) -> str:
+    # \r\n, \r -> \n / 탭, nbsp -> 공백
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    if "\t" in text:
+        text = text.replace("\t", " ")
+    if "\u00A0" in text:
+        text = text.replace("\u00A0", " ")
+    return text
+
+def normalize_whitespace_fast(text: str) -> str:
+    # normalize_whitespace와 동일. 공백 하나짜리는 건드리지 않도록 2개 이상만 매칭
+    text = _fold_whitespace(text)
+    text = _MULTI_SPACE.sub(" ", text)
+    text = _MULTI_NEWLINE.sub("\n\n", text)
+    return text.strip()
+
+def normalize_web_text_fast(text: str) -> str:
+    # normalize_web_text와 동일
+    # 어차피 \s{2,}가 공백/줄바꿈 연속을 전부 공백 하나로 합치므로 중간 단계(공백/줄바꿈 축약)는 생략
+    text = _fold_whitespace(text)
+    return _MULTI_WS.sub(" ", text).strip()
+
+def drop_short_lines_fast(text: str) -> str:
+    # drop_short_noise_lines를 문자열 하나에 적용한 것과 동일
+    return "\n".join(ln for ln in text.splitlines() if len(ln.strip()) >= 2)
@@ -0,0 +1,115 @@
+# 문서 전체를 보고 반복되는 머리글/바닥글을 찾는 2-pass 검출기
+# 1 pass: 페이지마다 위/아래 몇 줄의 fingerprint만 센다 (페이지 본문은 들고 있지 않음)
+# 2 pass: 위/아래 영역에서 반복 fingerprint와 같은 줄만 지운다
+# 스트리밍에서는 앞쪽 window 페이지만 보고 판정한 뒤, 나머지 페이지는 읽는 대로 지운다
+import math
+import pickle
+import re
+import tempfile
+from collections import Counter
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Set, Tuple, TypeVar
+
+T = TypeVar("T")
+
+_DIGITS = re.compile(r"\d+")
+MASK_MAX_CHARS = 60 # 이보다 긴 줄은 숫자를 가리지 않는다 (번호만 다른 본문 줄이 머리글로 잡히지 않게)
+
+def line_fingerprint(line: str) -> str:
+    # 숫자를 가려서 "Page 12"와 "Page 13", "- 3 -"과 "- 4 -"가 같은 줄로 취급되게
+    normalized = " ".join(line.split()).lower()
+    if len(normalized) > MASK_MAX_CHARS:
+        return normalized
+    return _DIGITS.sub("#", normalized)
+
+def _zones(lines: List[str], top_n: int, bottom_n: int) -> Tuple[List[int], List[int]]:
+    # 빈 줄을 제외한 위쪽 top_n줄, 아래쪽 bottom_n줄의 인덱스
+    non_empty = [i for i, ln in enumerate(lines) if ln.strip()]
+    head = non_empty[:top_n]
+    tail = non_empty[-bottom_n:] if bottom_n > 0 else []
+    return head, tail
+
+
+class HeaderFooterDetector: # 페이지 위/아래 영역의 줄 fingerprint 빈도로 머리글/바닥글 판정
+    def __init__(self, top_n: int = 2, bottom_n: int = 2, min_ratio: float = 0.5):
+        self.top_n = top_n
+        self.bottom_n = bottom_n
+        self.min_ratio = min_ratio # 이 비율 이상의 페이지에 반복되면 머리글/바닥글
+        self.pages = 0
+        self.removed_lines = 0
+        self.removed_chars = 0
+        self._head_counts: Counter = Counter()
+        self._tail_counts: Counter = Counter()
+        self.headers: Set[str] = set()
+        self.footers: Set[str] = set()
+
+    def observe(self, text: str):
+        lines = text.splitlines()
+        head, tail = _zones(lines, self.top_n, self.bottom_n)
+        # 한 페이지 안에서 같은 fingerprint는 한 번만 센다
+        self._head_counts.update({line_fingerprint(lines[i]) for i in head})
+        self._tail_counts.update({line_fingerprint(lines[i]) for i in tail})
+        self.pages += 1
+
+    @property
+    def threshold(self) -> int:
+        return max(2, math.ceil(self.pages * self.min_ratio))
+
+    def finalize(self):
+        threshold = self.threshold
+        self.headers = {fp for fp, c in self._head_counts.items() if c >= threshold}
+        self.footers = {fp for fp, c in self._tail_counts.items() if c >= threshold}
+
+    def strip(self, text: str) -> str:
+        if not self.headers and not self.footers:
+            return text
+        lines = text.splitlines()
+        head, tail = _zones(lines, self.top_n, self.bottom_n)
+        drop = {i for i in head if line_fingerprint(lines[i]) in self.headers}
+        drop.update(i for i in tail if line_fingerprint(lines[i]) in self.footers)
+        if not drop:
+            return text
+        self.removed_lines += len(drop)
+        self.removed_chars += sum(len(lines[i]) for i in drop)
+        return "\n".join(ln for i, ln in enumerate(lines) if i not in drop)
+
+    def summary(self) -> str:
+        return (f"{self.pages}페이지, 머리글 {len(self.headers)}종/바닥글 {len(self.footers)}종, "
+                f"{self.removed_lines}줄({self.removed_chars}자) 제거")
+
+
+def strip_headers_footers_stream(items: Iterable[T], text_of: Callable[[T], str],
+                                 detector: Optional[HeaderFooterDetector] = None,
+                                 spool_bytes: int = 32 * 1024 * 1024,
+                                 window: Optional[int] = None) -> Iterator[Tuple[T, str]]:
+    # items를 한 번만 읽으면서 1 pass를 하고, 항목은 임시 파일에 spool (spool_bytes까지만 메모리)
+    # 2 pass에서 다시 읽어 (항목, 머리글/바닥글 지운 텍스트)를 순서대로 yield
+    # window: 앞쪽 window개만 모아서 판정하고 나머지는 판정을 고정한 채 바로 yield (첫 항목이 문서 끝을 기다리지 않음)
+    detector = detector or HeaderFooterDetector()
+    if window is not None:
+        yield from _strip_with_window(iter(items), text_of, detector, window)
+        return
+    with tempfile.SpooledTemporaryFile(max_size=spool_bytes) as spool:
+        count = 0
+        for item in items:
+            detector.observe(text_of(item))
+            pickle.dump(item, spool, protocol=pickle.HIGHEST_PROTOCOL)
+            count += 1
+
+        detector.finalize()
+        spool.seek(0)
+        for _ in range(count):
+            item = pickle.load(spool)
+            yield item, detector.strip(text_of(item))
+
+
+def _strip_with_window(items: Iterator[T], text_of: Callable[[T], str], detector: HeaderFooterDetector,
+                       window: int) -> Iterator[Tuple[T, str]]:
+    head = list(islice(items, max(1, window))) # 메모리에는 window개까지만
+    for item in head:
+        detector.observe(text_of(item))
+    detector.finalize()
+    for item in head:
+        yield item, detector.strip(text_of(item))
+    for item in items:
+        yield item, detector.strip(text_of(item))
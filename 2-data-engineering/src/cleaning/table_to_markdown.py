@@ -1,5 +1,8 @@
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
 from bs4 import BeautifulSoup
-from typing import List
 
 def make_markdown_table(rows: List[List[str]]) -> str:
     if not rows:
@@ -21,9 +24,13 @@ def make_markdown_table(rows: List[List[str]]) -> str:
 
 def html_table_to_markdown(html: str) -> List[str]:
     soup = BeautifulSoup(html, "html.parser")
+    return soup_tables_to_markdown(soup.find_all("table"))
+
+def soup_tables_to_markdown(tables) -> List[str]:
+    # 이미 파싱된 soup의 table 태그들을 그대로 받아서 변환 (다시 파싱하지 않음)
     md_tables: List[str] = []
 
-    for table in soup.find_all("table"):
+    for table in tables:
         rows: List[List[str]] = []
 
         # thead 가 있는 경우
@@ -47,7 +54,105 @@ def html_table_to_markdown(html: str) -> List[str]:
     return md_tables
             
 
+# PDF 텍스트에서 표 찾기
+# 한 번 훑으면서 같은 구분자를 쓰는 연속된 줄을 후보 묶음으로 모으고,
+# 묶음마다 열 개수 일관성 x 구분자 신뢰도로 점수를 매겨 표인지 판정
+# 컴마는 문장에도 흔하므로 셀이 짧고 문장으로 끝나지 않는 줄만 후보로 본다
+# 구분자: (줄에 최소 몇 개 있어야 하는지, 신뢰도) - 컴마는 일반 문장에도 흔해서 신뢰도가 낮다
+DELIMITERS = {"|": (2, 1.0), "\t": (1, 0.9), ",": (2, 0.7)}
+MIN_ROWS = {"|": 2, "\t": 2, ",": 3}
+TABLE_MIN_SCORE = 0.5
+_RULE_CELL = re.compile(r":?-{3,}:?")
+MAX_WORDS_PER_CELL = 3 # 컴마 표의 셀은 보통 몇 단어. 평균이 이보다 길면 문장
+
+
+@dataclass
+class TableBlock: # text.splitlines() 기준 [start, end) 줄 범위의 표
+    start: int
+    end: int
+    delimiter: str
+    rows: List[List[str]]
+    score: float
+
+    def to_markdown(self) -> str:
+        width = max(len(r) for r in self.rows)
+        return make_markdown_table([r + [""] * (width - len(r)) for r in self.rows])
+
+
+def _split_row(line: str, delimiter: str) -> List[str]:
+    if delimiter == "|":
+        line = line.strip("|")
+    return [c.strip() for c in line.split(delimiter)]
+
+def _looks_like_sentence(cells: List[str]) -> bool:
+    words = sum(len(c.split()) for c in cells) / len(cells)
+    return words > MAX_WORDS_PER_CELL or cells[-1].endswith((".", "다"))
+
+def _line_delimiter(line: str, current: Optional[str] = None) -> Optional[str]:
+    # current: 이어지는 묶음의 구분자. 묶음 안에서는 열이 빠진 행(구분자 1개)도 받아준다
+    for delimiter, (min_count, _) in DELIMITERS.items():
+        if line.count(delimiter) >= (1 if delimiter == current else min_count):
+            if delimiter == "," and _looks_like_sentence(_split_row(line, delimiter)):
+                return None
+            return delimiter
+    return None
+
+def score_table(rows: List[List[str]], delimiter: str) -> float:
+    # 0~1. 열 개수가 가장 흔한 값인 행의 비율 x 구분자 신뢰도
+    if len(rows) < MIN_ROWS[delimiter]:
+        return 0.0
+    counts = Counter(len(r) for r in rows)
+    columns, same = counts.most_common(1)[0]
+    if columns < 2:
+        return 0.0
+    return same / len(rows) * DELIMITERS[delimiter][1]
+
+def detect_tables(lines: List[str]) -> List[TableBlock]:
+    blocks: List[TableBlock] = []
+    group_start, group_delimiter = 0, None
+    group_rows: List[List[str]] = []
+
+    def close(end: int):
+        if group_delimiter is None:
+            return
+        score = score_table(group_rows, group_delimiter)
+        if score >= TABLE_MIN_SCORE:
+            blocks.append(TableBlock(group_start, end, group_delimiter, group_rows, score))
+
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        delimiter = _line_delimiter(stripped, group_delimiter) if stripped else None
+        if delimiter != group_delimiter:
+            close(i)
+            group_start, group_delimiter, group_rows = i, delimiter, []
+        if delimiter is not None:
+            row = _split_row(stripped, delimiter)
+            if not (delimiter == "|" and all(_RULE_CELL.fullmatch(c) for c in row)): # 이미 있는 markdown 구분 행
+                group_rows.append(row)
+    close(len(lines))
+    return blocks
+
 def pdf_text_to_markdown(text: str) -> List[str]:
+    return [b.to_markdown() for b in detect_tables(text.splitlines())]
+
+def inline_pdf_tables(text: str) -> Tuple[str, int]:
+    # 표로 판정된 줄들을 그 자리에서 markdown 표로 바꾼다 (뒤에 한 벌 더 붙이지 않음). (텍스트, 표 개수)
+    lines = text.splitlines()
+    blocks = detect_tables(lines)
+    if not blocks:
+        return text, 0
+    out: List[str] = []
+    cursor = 0
+    for b in blocks:
+        out.extend(lines[cursor:b.start])
+        out.append(b.to_markdown())
+        cursor = b.end
+    out.extend(lines[cursor:])
+    return "\n".join(out), len(blocks)
+
+
+def pdf_text_to_markdown_legacy(text: str) -> List[str]:
+    # 예전 방식 (벤치마크 비교용): 컴마 2개 이상이면 전부 표 행으로 본다
     lines = [l.strip() for l in text.splitlines()]
     groups: List[List[List[str]]] = []
     current: List[List[str]] = []
@@ -81,11 +186,3 @@ def pdf_text_to_markdown(text: str) -> List[str]:
         if g:
             markdown_tables.append(make_markdown_table(g))
     return markdown_tables
-
-
-    
-
-    
-
-
-            
@@ -87,15 +87,21 @@ def web_to_plain(html_or_text):
     
     if has_lt and has_gt: # html 특
         soup = BeautifulSoup(html_or_text, "html.parser")
-        
-        tags_to_remove = ["script", "style", "noscript"]
-        for tag in soup(tags_to_remove): # script/style 제거
-            tag.decompose()
-        text = soup.get_text(separator="\n")
+        text = soup_to_plain_text(soup)
     else:
         text = html_or_text
 
+    return normalize_web_text(text)
+
+def soup_to_plain_text(soup):
+    tags_to_remove = ["script", "style", "noscript"]
+    for tag in soup(tags_to_remove): # script/style 제거
+        tag.decompose()
+    return soup.get_text(separator="\n")
+
+def normalize_web_text(text):
+    # 이미 HTML에서 뽑아낸 텍스트용 (다시 파싱하지 않음)
     text = normalize_whitespace(text)
     text = re.sub(r"\s{2,}", " ", text)
     stripped_text = text.strip()
-    return stripped_text
\ No newline at end of file
+    return stripped_text
@@ -0,0 +1,177 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+from langchain_core.embeddings import Embeddings
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def pack_vector(vector: List[float]) -> bytes:
+    return array("f", vector).tobytes() # float32 blob
+
+def unpack_vector(blob: bytes) -> List[float]:
+    vec = array("f")
+    vec.frombytes(blob)
+    return vec.tolist()
+
+
+class EmbeddingCache: # (model_id, sha256(text)) 키 기반 디스크 임베딩 캐시 (SQLite, LRU 삭제)
+    def __init__(self, path: str, max_entries: int = 50_000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        dirname = os.path.dirname(os.path.abspath(path))
+        os.makedirs(dirname, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model_id TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_access INTEGER NOT NULL,
+                PRIMARY KEY (model_id, text_hash)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_access ON embeddings(last_access)")
+        self._conn.commit()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        # LRU 순서용 논리 시계 (시스템 시간 해상도에 영향받지 않도록)
+        self._clock = self._conn.execute("SELECT COALESCE(MAX(last_access), 0) FROM embeddings").fetchone()[0]
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+    def __len__(self) -> int:
+        return self._count
+
+    def get(self, model_id: str, text: str) -> Optional[List[float]]:
+        return self.get_many(model_id, [text])[0]
+
+    def get_many(self, model_id: str, texts: List[str]) -> List[Optional[List[float]]]:
+        model_id = model_id or ""
+        hashes = [text_hash(t) for t in texts]
+        found: Dict[str, bytes] = {}
+        with self._lock:
+            unique = list(dict.fromkeys(hashes))
+            for i in range(0, len(unique), 500): # SQLite 변수 개수 제한
+                part = unique[i:i+500]
+                placeholders = ",".join("?" * len(part))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model_id = ? AND text_hash IN ({placeholders})",
+                    [model_id, *part],
+                ).fetchall()
+                for h, blob in rows:
+                    found[h] = blob
+
+            if found:
+                now = self._tick()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_access = ? WHERE model_id = ? AND text_hash = ?",
+                    [(now, model_id, h) for h in found],
+                )
+                self._conn.commit()
+
+            result = []
+            for h in hashes:
+                blob = found.get(h)
+                if blob is None:
+                    self.misses += 1
+                    result.append(None)
+                else:
+                    self.hits += 1
+                    result.append(unpack_vector(blob))
+        return result
+
+    def put(self, model_id: str, text: str, vector: List[float]):
+        self.put_many(model_id, [(text, vector)])
+
+    def put_many(self, model_id: str, items: Iterable[Tuple[str, Optional[List[float]]]]):
+        model_id = model_id or ""
+        rows = []
+        for text, vector in items:
+            if vector:
+                rows.append((model_id, text_hash(text), pack_vector(vector)))
+        if not rows:
+            return
+
+        with self._lock:
+            now = self._tick()
+            rows = [row + (now,) for row in rows]
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (model_id, text_hash, vector, last_access) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._count += self._conn.total_changes - before
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        # 최대 개수를 넘으면 가장 오래 안 쓴 항목부터 삭제
+        overflow = self._count - self.max_entries
+        if overflow <= 0:
+            return
+        self._conn.execute(
+            "DELETE FROM embeddings WHERE rowid IN (SELECT rowid FROM embeddings ORDER BY last_access LIMIT ?)",
+            (overflow,),
+        )
+        self._count -= overflow
+        self.evictions += overflow
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        if total == 0:
+            return 0.0
+        return self.hits / total
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "entries": self._count,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbeddings(Embeddings): # LangChain Embeddings 앞단에 EmbeddingCache를 끼우는 래퍼
+    def __init__(self, underlying: Embeddings, cache: EmbeddingCache, model_id: str):
+        self.underlying = underlying
+        self.cache = cache
+        self.model_id = model_id
+        self.calls = 0 # 실제 임베딩 모델로 보낸 텍스트 수
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        cached = self.cache.get_many(self.model_id, texts)
+        missing = list(dict.fromkeys(t for t, v in zip(texts, cached) if v is None))
+        if missing:
+            self.calls += len(missing)
+            vectors = self.underlying.embed_documents(missing)
+            self.cache.put_many(self.model_id, zip(missing, vectors))
+            fresh = dict(zip(missing, vectors))
+            cached = [v if v is not None else fresh[t] for t, v in zip(texts, cached)]
+        return cached
+
+    def embed_query(self, text: str) -> List[float]:
+        cached = self.cache.get(self.model_id, text)
+        if cached is not None:
+            return cached
+        self.calls += 1
+        vector = self.underlying.embed_query(text)
+        self.cache.put(self.model_id, text, vector)
+        return vector
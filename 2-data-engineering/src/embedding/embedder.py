@@ -1,50 +1,179 @@
 import boto3
 import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from typing import List, Optional
 import os
+from botocore.exceptions import ClientError
+from .cache import EmbeddingCache
+
+# 재시도 대상 에러 코드 (스로틀링/일시적 과부하)
+RETRYABLE_ERROR_CODES = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceUnavailableException",
+    "ModelNotReadyException",
+}
+
+@dataclass
+class EmbeddingStats:
+    texts: int = 0
+    cached: int = 0 # 캐시에서 바로 꺼낸 수
+    failed: int = 0
+    retries: int = 0
+    elapsed: float = 0.0
+    latencies: List[float] = field(default_factory=list) # 요청별 지연(초)
+
+    @property
+    def texts_per_sec(self) -> float:
+        if self.elapsed <= 0:
+            return 0.0
+        return self.texts / self.elapsed
+
+    def percentile(self, q: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        idx = min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))
+        return ordered[idx]
+
+    @property
+    def p50(self) -> float:
+        return self.percentile(50)
+
+    @property
+    def p99(self) -> float:
+        return self.percentile(99)
+
+    def summary(self) -> str:
+        return (f"{self.texts}개 임베딩, 캐시 {self.cached}, 실패 {self.failed}, 재시도 {self.retries}, "
+                f"{self.texts_per_sec:.1f} texts/sec, "
+                f"p50 {self.p50 * 1000:.1f}ms, p99 {self.p99 * 1000:.1f}ms")
+
 
 class BedrockEmbedder: # AWS Bedrock Titan Text Embeddings V2 모델 기반 텍스트 임베딩을 생성하는 클래스
-    def __init__(self):
+    def __init__(self, client=None, max_workers: int = 8, max_retries: int = 5,
+                 base_delay: float = 0.2, max_delay: float = 5.0,
+                 cache: Optional[EmbeddingCache] = None):
         self.model_id = os.getenv("BEDROCK_EMBEDDING_MODEL_ID")
         self.region = os.getenv("AWS_REGION")
-        self.session = boto3.Session()
-            
-        self.bedrock_runtime = self.session.client(
-            service_name='bedrock-runtime',
-            region_name=self.region
-        )
+        self.max_workers = max(1, max_workers)  # 동시에 보낼 최대 요청 수
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.cache = cache
+        self.last_stats: Optional[EmbeddingStats] = None
+        self._stats_lock = threading.Lock()
+
+        if client is not None:
+            # 오프라인 벤치마크/테스트용 가짜 클라이언트 주입
+            self.bedrock_runtime = client
+        else:
+            self.session = boto3.Session()
+            self.bedrock_runtime = self.session.client(
+                service_name='bedrock-runtime',
+                region_name=self.region
+            )
         print(f"BedrockEmbedder 초기화 성공")
 
-    def embed_texts(self, texts: List[str]) -> List[List[float]]:
-        embeddings = []
-        for i, text in enumerate(texts):
-            print(f"   {i+1}/{len(texts)} 청크 임베딩 중...")
-            embedding = self.embed_text(text)
-            if embedding:
-                embeddings.append(embedding)
+    def embed_texts(self, texts: List[str]) -> List[Optional[List[float]]]:
+        # 입력 순서 그대로 반환. 실패하거나 빈 텍스트는 해당 위치에 None
+        stats = EmbeddingStats(texts=len(texts))
+        if not texts:
+            self.last_stats = stats
+            return []
+
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        if self.cache is not None:
+            embeddings = self.cache.get_many(self.model_id, texts)
+            stats.cached = sum(1 for e in embeddings if e is not None)
+
+        # 캐시에 없는 텍스트만 (중복 제거해서) 요청
+        missing = list(dict.fromkeys(t for t, e in zip(texts, embeddings) if e is None))
+
+        def run(text):
+            return self._embed_timed(text, stats)
+
+        started = time.perf_counter()
+        if missing:
+            workers = min(self.max_workers, len(missing))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                fresh = dict(zip(missing, executor.map(run, missing))) # map은 입력 순서를 유지
+            if self.cache is not None:
+                self.cache.put_many(self.model_id, fresh.items())
+            embeddings = [e if e is not None else fresh[t] for t, e in zip(texts, embeddings)]
+        stats.elapsed = time.perf_counter() - started
+        stats.failed = sum(1 for e in embeddings if e is None)
+
+        self.last_stats = stats
+        print(f"   임베딩 완료: {stats.summary()}")
         return embeddings
 
     def embed_text(self, text: str) -> Optional[List[float]]:
+        if self.cache is not None:
+            cached = self.cache.get(self.model_id, text)
+            if cached is not None:
+                return cached
+
+        embedding = self._embed_timed(text, None)
+        if self.cache is not None and embedding:
+            self.cache.put(self.model_id, text, embedding)
+        return embedding
+
+    def _embed_timed(self, text: str, stats: Optional[EmbeddingStats]) -> Optional[List[float]]:
         if not text.strip():
             print("빈 텍스트 들어왔음")
             return None
-        
+
+        started = time.perf_counter()
         try:
-            body = json.dumps({
-                "inputText": text
-            })
-            
-            response = self.bedrock_runtime.invoke_model(
-                body=body,
-                modelId=self.model_id,
-                accept="application/json",
-                contentType="application/json",
-            )
-            
-            response_body = json.loads(response["body"].read())
-            return response_body.get("embedding")
-            
+            return self._invoke_with_retry(text, stats)
         except Exception as e:
             print(f"임베딩 실패: '{text}'. error: {e}")
             return None
+        finally:
+            if stats is not None:
+                stats.latencies.append(time.perf_counter() - started)
+
+    def _invoke_with_retry(self, text: str, stats: Optional[EmbeddingStats]) -> Optional[List[float]]:
+        attempt = 0
+        while True:
+            try:
+                return self._invoke(text)
+            except ClientError as e:
+                code = e.response.get("Error", {}).get("Code", "")
+                if code not in RETRYABLE_ERROR_CODES or attempt >= self.max_retries:
+                    raise
+                # exponential backoff + full jitter
+                delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+                time.sleep(random.uniform(0, delay))
+                attempt += 1
+                if stats is not None:
+                    with self._stats_lock:
+                        stats.retries += 1
+
+    def token_count(self, text: str) -> Optional[int]:
+        # Titan이 센 입력 토큰 수 (inputTextTokenCount). 토큰 추정 배율 보정용
+        response_body = self._invoke_raw(text)
+        count = response_body.get("inputTextTokenCount")
+        return int(count) if count is not None else None
+
+    def _invoke(self, text: str) -> Optional[List[float]]:
+        return self._invoke_raw(text).get("embedding")
+
+    def _invoke_raw(self, text: str) -> dict:
+        body = json.dumps({
+            "inputText": text
+        })
+
+        response = self.bedrock_runtime.invoke_model(
+            body=body,
+            modelId=self.model_id,
+            accept="application/json",
+            contentType="application/json",
+        )
 
+        return json.loads(response["body"].read())
@@ -0,0 +1,339 @@
+import json
+import os
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urljoin, urlsplit, urlunsplit
+from urllib.robotparser import RobotFileParser
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_USER_AGENT = "nxt-ai-ingest/0.1"
+SITEMAP_NS = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+
+def normalize_url(url: str) -> str:
+    # 중복 판단용: fragment 제거, scheme/host 소문자, 기본 포트 제거
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+    path = parts.path or "/"
+    return urlunsplit((scheme, host, path, parts.query, ""))
+
+def host_of(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+def parse_sitemap(xml_text) -> Tuple[List[str], List[str]]:
+    # (페이지 url 목록, 하위 sitemap url 목록)
+    root = ET.fromstring(xml_text)
+    return _sitemap_locs(root)
+
+def _sitemap_locs(root) -> Tuple[List[str], List[str]]:
+    locs = [el.text.strip() for el in root.iter(f"{SITEMAP_NS}loc") if el.text]
+    if not locs:
+        locs = [el.text.strip() for el in root.iter("loc") if el.text] # namespace 없는 sitemap
+    if root.tag.endswith("sitemapindex"):
+        return [], locs
+    return locs, []
+
+def is_sitemap_candidate(url: str) -> bool:
+    # 받아서 확인해 볼 url (실제 sitemap인지는 parse_sitemap_response로 판단)
+    path = urlsplit(url).path.lower()
+    return path.endswith(".xml") or "sitemap" in path
+
+def parse_sitemap_response(content, content_type: str = "") -> Optional[Tuple[List[str], List[str]]]:
+    # 응답이 sitemap(root가 urlset / sitemapindex인 XML)이면 parse_sitemap 결과, 아니면 None
+    if "html" in content_type.lower():
+        return None
+    try:
+        root = ET.fromstring(content)
+    except ET.ParseError:
+        return None
+    if root.tag.rsplit("}", 1)[-1] not in ("urlset", "sitemapindex"):
+        return None
+    return _sitemap_locs(root)
+
+
+@dataclass
+class CrawlResult:
+    url: str
+    status: int = 0
+    html: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.html is not None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+
+@dataclass
+class CrawlStats:
+    fetched: int = 0        # 200으로 받은 페이지 수
+    not_modified: int = 0   # 304 (조건부 GET으로 건너뜀)
+    failed: int = 0
+    robots_blocked: int = 0
+    duplicates: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def pages_per_sec(self) -> float:
+        if self.elapsed <= 0:
+            return 0.0
+        return (self.fetched + self.not_modified) / self.elapsed
+
+    def summary(self) -> str:
+        return (f"수집 {self.fetched}, 변경 없음 {self.not_modified}, 실패 {self.failed}, "
+                f"robots 차단 {self.robots_blocked}, 중복 {self.duplicates}, {self.pages_per_sec:.1f} pages/sec")
+
+
+class CrawlState: # url별 ETag / Last-Modified 기록 (조건부 GET용, JSON)
+    def __init__(self, path: str):
+        self.path = path
+        self.validators: Dict[str, Dict[str, str]] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.validators = json.load(f)
+
+    def get(self, url: str) -> Dict[str, str]:
+        return dict(self.validators.get(normalize_url(url), {}))
+
+    def record(self, result: CrawlResult):
+        entry = {}
+        if result.etag:
+            entry["etag"] = result.etag
+        if result.last_modified:
+            entry["last_modified"] = result.last_modified
+        if entry:
+            self.validators[normalize_url(result.url)] = entry
+
+    def clear(self):
+        self.validators = {}
+
+    def save(self):
+        dirname = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(dirname, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.validators, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+class WebCrawler: # seed 목록 / sitemap 기반 동시 수집기 (세션 풀, host별 동시성 제한, robots, 조건부 GET)
+    def __init__(self, max_workers: int = 8, per_host: int = 2, delay: float = 0.5, timeout: float = 10.0,
+                 user_agent: str = DEFAULT_USER_AGENT, respect_robots: bool = True,
+                 state: Optional[CrawlState] = None, session: Optional[requests.Session] = None,
+                 max_pages: Optional[int] = None):
+        self.max_workers = max(1, max_workers)
+        self.per_host = max(1, per_host)
+        self.delay = delay # 같은 host에 요청을 보내는 최소 간격(초)
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.respect_robots = respect_robots
+        self.state = state
+        self.max_pages = max_pages
+        self.last_stats: Optional[CrawlStats] = None
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        session.headers["User-Agent"] = user_agent
+        self.session = session
+
+        self._lock = threading.Lock()
+        self._host_slots: Dict[str, threading.Semaphore] = {}
+        self._host_next: Dict[str, float] = {}   # host별 다음 요청 가능 시각
+        self._host_delay: Dict[str, float] = {}  # robots Crawl-delay 반영한 host별 간격
+        self._robots: Dict[str, RobotFileParser] = {}
+        self._robots_locks: Dict[str, threading.Lock] = {}
+
+    def expand_seeds(self, seeds: Iterable[str], max_depth: int = 3) -> List[str]:
+        # sitemap url은 안에 있는 페이지 url로 펼친다 (sitemap index는 max_depth까지)
+        # sitemap도 페이지와 같이 robots.txt / Crawl-delay / host별 동시성 제한을 지켜서 받는다
+        urls: List[str] = []
+        queue = [(s, 0) for s in seeds]
+        while queue:
+            url, depth = queue.pop(0)
+            if not is_sitemap_candidate(url):
+                urls.append(url)
+                continue
+            if self.respect_robots and not self._allowed(normalize_url(url)):
+                print(f"sitemap robots.txt 차단: {url}")
+                continue
+            try:
+                resp = self._get(normalize_url(url))
+                resp.raise_for_status()
+            except Exception as e:
+                print(f"sitemap 로딩 실패: {url} - {e}")
+                continue
+            parsed = parse_sitemap_response(resp.content, resp.headers.get("Content-Type", ""))
+            if parsed is None:
+                # 이름만 sitemap / .xml인 일반 페이지 (RSS, sitemap 안내 HTML 등)
+                urls.append(url)
+                continue
+            pages, children = parsed
+            urls.extend(pages)
+            if depth < max_depth:
+                queue.extend((c, depth + 1) for c in children)
+        return urls
+
+    def crawl(self, urls: Iterable[str]) -> Iterator[CrawlResult]:
+        # 완료되는 순서대로 yield. 진행 중인 요청은 max_workers * 2개로 제한 (소비가 느리면 수집도 멈춤)
+        stats = CrawlStats()
+        self.last_stats = stats
+        started = time.perf_counter()
+        seen: Set[str] = set()
+        pending: Set[Future] = set()
+        submitted = 0
+
+        def drain(block: bool):
+            nonlocal pending
+            if not pending:
+                return []
+            done, pending = wait(pending, timeout=None if block else 0, return_when=FIRST_COMPLETED)
+            return [f.result() for f in done]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for url in urls:
+                key = normalize_url(url)
+                if key in seen:
+                    stats.duplicates += 1
+                    continue
+                seen.add(key)
+                if self.max_pages is not None and submitted >= self.max_pages:
+                    break
+
+                if self.respect_robots and not self._allowed(key):
+                    stats.robots_blocked += 1
+                    continue
+
+                pending.add(executor.submit(self._fetch, key))
+                submitted += 1
+                while len(pending) >= self.max_workers * 2:
+                    for result in drain(block=True):
+                        self._count(stats, result)
+                        yield result
+                for result in drain(block=False):
+                    self._count(stats, result)
+                    yield result
+
+            while pending:
+                for result in drain(block=True):
+                    self._count(stats, result)
+                    yield result
+
+        stats.elapsed = time.perf_counter() - started
+        print(f"   크롤링 완료: {stats.summary()}")
+
+    def _count(self, stats: CrawlStats, result: CrawlResult):
+        if result.ok:
+            stats.fetched += 1
+        elif result.not_modified:
+            stats.not_modified += 1
+        else:
+            stats.failed += 1
+            print(f"페이지 수집 실패: {result.url} - {result.error}")
+
+    def _fetch(self, url: str) -> CrawlResult:
+        headers = {}
+        if self.state is not None:
+            validators = self.state.get(url)
+            if "etag" in validators:
+                headers["If-None-Match"] = validators["etag"]
+            if "last_modified" in validators:
+                headers["If-Modified-Since"] = validators["last_modified"]
+
+        started = time.perf_counter()
+        try:
+            resp = self._get(url, headers)
+        except Exception as e:
+            return CrawlResult(url=url, error=str(e), elapsed=time.perf_counter() - started)
+
+        result = CrawlResult(
+            url=url,
+            status=resp.status_code,
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+            elapsed=time.perf_counter() - started,
+        )
+        if resp.status_code == 304:
+            return result
+        if resp.status_code >= 400:
+            result.error = f"HTTP {resp.status_code}"
+            return result
+
+        # 헤더에 charset이 없을 때만 내용으로 추정 (apparent_encoding은 느림)
+        if "charset" not in resp.headers.get("Content-Type", "").lower():
+            resp.encoding = resp.apparent_encoding or "utf-8"
+        result.html = resp.text
+        return result
+
+    def _get(self, url: str, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        # host별 동시성 제한 + 요청 간격을 지켜서 GET
+        host = host_of(url)
+        with self._slot(host):
+            self._wait_turn(host)
+            return self.session.get(url, headers=headers or {}, timeout=self.timeout)
+
+    def _slot(self, host: str) -> threading.Semaphore:
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.Semaphore(self.per_host)
+                self._host_slots[host] = slot
+            return slot
+
+    def _wait_turn(self, host: str):
+        # host별로 delay 간격이 되도록 요청 시각을 예약하고 그때까지 대기
+        with self._lock:
+            now = time.monotonic()
+            turn = max(now, self._host_next.get(host, now))
+            self._host_next[host] = turn + self._host_delay.get(host, self.delay)
+        if turn > now:
+            time.sleep(turn - now)
+
+    def _allowed(self, url: str) -> bool:
+        parser = self._robots_for(url)
+        return parser.can_fetch(self.user_agent, url)
+
+    def _robots_for(self, url: str) -> RobotFileParser:
+        parts = urlsplit(url)
+        host = parts.netloc.lower()
+        with self._lock:
+            host_lock = self._robots_locks.setdefault(host, threading.Lock())
+        with host_lock:
+            parser = self._robots.get(host)
+            if parser is not None:
+                return parser
+
+            parser = RobotFileParser()
+            robots_url = urljoin(f"{parts.scheme}://{parts.netloc}", "/robots.txt")
+            try:
+                resp = self.session.get(robots_url, timeout=self.timeout)
+                if resp.status_code in (401, 403):
+                    parser.disallow_all = True
+                elif resp.status_code >= 400:
+                    parser.allow_all = True
+                else:
+                    parser.parse(resp.text.splitlines())
+            except Exception:
+                parser.allow_all = True # robots.txt를 못 받으면 막지 않는다
+
+            crawl_delay = parser.crawl_delay(self.user_agent)
+            with self._lock:
+                self._host_delay[host] = max(self.delay, float(crawl_delay or 0))
+            self._robots[host] = parser
+            return parser
@@ -1,5 +1,8 @@
+from collections import deque
 from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import List, Dict, Any, Deque, Optional, Iterator, Tuple
+import itertools
 import os
 from pypdf import PdfReader
 
@@ -15,36 +18,85 @@ class PDFLoadResult:
     total_pages: int
     pages: List[Page]
 
-def load_pdf(path: str, max_pages: Optional[int] = None) -> PDFLoadResult:
+def load_pdf(path: str, max_pages: Optional[int] = None, workers: int = 1) -> PDFLoadResult:
     if not os.path.exists(path):
         raise FileNotFoundError(f"File not found: {path}")
     
     abs_path = os.path.abspath(path)
-    pages: List[Page] = []
+    total, lim = count_pages(abs_path, max_pages)
 
-    with open(abs_path, "rb") as f:
-        reader = PdfReader(f)
-
-        total = len(reader.pages)
-        lim = total
-        if max_pages:
-            lim = min(total, max_pages)
-
-        for i in range(lim):
-            pages.append(Page(
-                page = i+1,
-                content = reader.pages[i].extract_text() or "",
-                meta = {
-                    "source": abs_path,
-                    "page": i+1,
-                    "total_pages": total
-                }
-            ))
+    pages: List[Page] = []
+    for i, text in enumerate(iter_page_texts(abs_path, lim, workers)):
+        pages.append(make_page(i, text, abs_path, total))
 
     return PDFLoadResult(
         source = abs_path,
         total_pages = total,
         pages = pages
     )
-        
-            
+
+def iter_pdf_pages(path: str, max_pages: Optional[int] = None, workers: int = 1) -> Iterator[Page]:
+    # 한 페이지씩 추출해서 바로 넘겨줌 (전체 페이지를 메모리에 들고 있지 않음)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"File not found: {path}")
+
+    abs_path = os.path.abspath(path)
+    total, lim = count_pages(abs_path, max_pages)
+    for i, text in enumerate(iter_page_texts(abs_path, lim, workers)):
+        yield make_page(i, text, abs_path, total)
+
+def count_pages(abs_path: str, max_pages: Optional[int] = None) -> Tuple[int, int]:
+    with open(abs_path, "rb") as f:
+        total = len(PdfReader(f).pages)
+    lim = total
+    if max_pages:
+        lim = min(total, max_pages)
+    return total, lim
+
+def iter_page_texts(abs_path: str, lim: int, workers: int = 1) -> Iterator[str]:
+    # workers > 1 이면 페이지 구간을 나눠 프로세스별로 추출 (pypdf 추출은 CPU 바운드라 스레드로는 이득 없음)
+    if workers <= 1 or lim <= 1:
+        with open(abs_path, "rb") as f:
+            reader = PdfReader(f)
+            for i in range(lim):
+                yield reader.pages[i].extract_text() or ""
+        return
+
+    # executor.map은 구간을 한꺼번에 submit해서, 소비가 느리면 추출이 끝난 구간 텍스트가 전부 메모리에 쌓인다
+    # 진행 중인 구간을 workers * 2개로 제한하고 앞 구간부터 순서대로 yield
+    ranges = iter(page_ranges(lim, workers))
+    window: Deque[Future] = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for start, end in itertools.islice(ranges, workers * 2):
+            window.append(executor.submit(extract_page_range, abs_path, start, end))
+        while window:
+            texts = window.popleft().result()
+            for start, end in itertools.islice(ranges, 1):
+                window.append(executor.submit(extract_page_range, abs_path, start, end))
+            yield from texts
+
+def page_ranges(lim: int, workers: int) -> List[Tuple[int, int]]:
+    # 워커 수보다 구간을 잘게 나눠서 페이지별 추출 시간 편차를 흡수
+    n_ranges = min(lim, workers * 4)
+    step = -(-lim // n_ranges) # 올림
+    return [(start, min(start + step, lim)) for start in range(0, lim, step)]
+
+def extract_page_range(abs_path: str, start: int, end: int) -> List[str]:
+    # 워커마다 파일을 따로 열어서 [start, end) 페이지만 추출
+    texts = []
+    with open(abs_path, "rb") as f:
+        reader = PdfReader(f)
+        for i in range(start, end):
+            texts.append(reader.pages[i].extract_text() or "")
+    return texts
+
+def make_page(i: int, content: str, abs_path: str, total: int) -> Page:
+    return Page(
+        page = i+1,
+        content = content,
+        meta = {
+            "source": abs_path,
+            "page": i+1,
+            "total_pages": total
+        }
+    )
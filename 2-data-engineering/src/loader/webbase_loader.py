@@ -1,6 +1,10 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional
 from bs4 import BeautifulSoup
+from ..cleaning.table_to_markdown import soup_tables_to_markdown
+from ..cleaning.text_normalize import soup_to_plain_text
+import importlib.util
+import os
 import requests
 
 @dataclass
@@ -11,6 +15,45 @@ class WebLoadResult:
     text_raw: str
     image_urls: List[str]
     meta: Dict[str, Any]
+    text_plain: str = "" # script/style 제거한 텍스트 (web_to_plain에서 다시 파싱하지 않도록)
+    tables: List[str] = field(default_factory=list) # markdown 표
+
+@dataclass
+class ParsedHtml:
+    title: Optional[str]
+    text_raw: str
+    text_plain: str
+    image_urls: List[str]
+    tables: List[str]
+
+def default_parser() -> str:
+    # lxml이 설치되어 있으면 lxml(C 구현), 없으면 기본 html.parser
+    parser = os.getenv("HTML_PARSER")
+    if parser:
+        return parser
+    if importlib.util.find_spec("lxml") is not None:
+        return "lxml"
+    return "html.parser"
+
+def parse_html(html: str, parser: Optional[str] = None) -> ParsedHtml:
+    # 한 번 파싱한 트리에서 title / 텍스트 / 이미지 / 표를 모두 뽑는다
+    soup = BeautifulSoup(html, parser or default_parser())
+
+    title = None
+    if soup.title:
+        title = soup.title.string
+    text_raw = soup.get_text()
+    img_srcs = [img["src"] for img in soup.find_all("img") if img.get("src")]
+    tables = soup_tables_to_markdown(soup.find_all("table"))
+    text_plain = soup_to_plain_text(soup) # script/style을 지우므로 마지막에
+
+    return ParsedHtml(
+        title = title,
+        text_raw = text_raw,
+        text_plain = text_plain,
+        image_urls = img_srcs,
+        tables = tables
+    )
 
 def fetch_html(url):
     try:
@@ -51,7 +94,7 @@ def extract_img_src(html):
     return img_srcs
 
 
-def load_web(url):
+def load_web(url, parser: Optional[str] = None):
     html = ""
     try:
         html = fetch_html(url)
@@ -60,9 +103,14 @@ def load_web(url):
         error_msg = "웹페이지 로딩 실패: " + url + " - " + error_str
         raise Exception(error_msg)
 
-    title = extract_title(html)
-    text = extract_text(html)
-    img_srcs = extract_img_src(html)
+    return build_web_result(url, html, parser)
+
+def build_web_result(url, html, parser: Optional[str] = None) -> WebLoadResult:
+    # 이미 받아온 HTML로 WebLoadResult 생성 (크롤러에서도 사용)
+    parsed = parse_html(html, parser)
+    title = parsed.title
+    text = parsed.text_raw
+    img_srcs = parsed.image_urls
 
     html_length = len(html)
     text_length = len(text)
@@ -80,7 +128,9 @@ def load_web(url):
         html_raw = html,
         text_raw = text,
         image_urls = img_srcs,
-        meta = meta_dict
+        meta = meta_dict,
+        text_plain = parsed.text_plain,
+        tables = parsed.tables
     )
     return result
     
@@ -0,0 +1,191 @@
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+from langchain_core.documents import Document
+from .streaming import batched
+
+# 항목 단위로 다시 보내볼 만한 상태 코드
+RETRYABLE_STATUS = {429, 502, 503, 504}
+
+@dataclass
+class BulkStats:
+    docs: int = 0           # 적재 성공한 문서 수
+    failed: int = 0         # 재시도 후에도 실패한 문서 수 (임베딩 실패 포함)
+    failed_ids: List[str] = field(default_factory=list) # 실패한 문서의 metadata id
+    retried: int = 0        # 다시 보낸 항목 수
+    requests: int = 0       # _bulk 요청 수
+    bytes: int = 0          # 보낸 body 크기
+    elapsed: float = 0.0
+
+    @property
+    def docs_per_sec(self) -> float:
+        if self.elapsed <= 0:
+            return 0.0
+        return self.docs / self.elapsed
+
+    def summary(self) -> str:
+        return (f"{self.docs}개 적재, 실패 {self.failed}, 재시도 {self.retried}, "
+                f"요청 {self.requests}회 ({self.bytes / 1e6:.1f} MB), {self.docs_per_sec:.1f} docs/sec")
+
+
+class BulkWriteError(Exception): # 일부 문서가 인덱스에 들어가지 못함 (stats.failed_ids로 확인)
+    def __init__(self, stats: BulkStats):
+        preview = ", ".join(str(i) for i in stats.failed_ids[:5])
+        super().__init__(f"bulk 적재 실패 {stats.failed}개 ({preview}{' ...' if stats.failed > 5 else ''})")
+        self.stats = stats
+
+
+class BulkIndexWriter: # opensearchpy client의 _bulk API로 직접 적재하는 writer (동시 요청 + 부분 실패 재전송)
+    def __init__(self, client, index_name: str, max_docs: int = 200, max_bytes: int = 5 * 1024 * 1024,
+                 concurrency: int = 4, max_retries: int = 3, base_delay: float = 0.5,
+                 is_aoss: bool = True, vector_field: str = "vector_field", text_field: str = "text"):
+        self.client = client
+        self.index_name = index_name
+        self.max_docs = max(1, max_docs)
+        self.max_bytes = max_bytes
+        self.concurrency = max(1, concurrency)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.is_aoss = is_aoss
+        self.vector_field = vector_field
+        self.text_field = text_field
+        self.last_stats: Optional[BulkStats] = None
+        self._lock = threading.Lock()
+
+    def write(self, docs: Iterable[Document], embed_fn: Callable[[List[str]], List[Optional[List[float]]]],
+              raise_on_error: bool = True) -> BulkStats:
+        # raise_on_error=False면 실패해도 stats만 반환 (호출 쪽에서 stats.failed_ids 정리 후 raise)
+        stats = BulkStats()
+        for _ in self.iter_write(docs, embed_fn, stats):
+            pass
+        if raise_on_error and stats.failed:
+            raise BulkWriteError(stats)
+        return stats
+
+    def iter_write(self, docs: Iterable[Document],
+                   embed_fn: Callable[[List[str]], List[Optional[List[float]]]],
+                   stats: Optional[BulkStats] = None) -> Iterator[List[Document]]:
+        # docs를 max_docs씩 임베딩 -> 바이트 기준으로 다시 쪼개서 _bulk 전송
+        # 전송 중인 요청이 concurrency개로 꽉 차면 다음 배치 임베딩을 멈춘다 (backpressure)
+        # 적재가 끝난 문서 묶음을 완료되는 순서대로 yield. 실패한 문서는 stats.failed_ids에 (raise하지 않음)
+        # 여러 스레드가 같은 writer를 쓰므로 실패 확인은 last_stats 대신 넘긴 stats로
+        stats = stats if stats is not None else BulkStats()
+        self.last_stats = stats
+        slots = threading.BoundedSemaphore(self.concurrency)
+        pending: List[Future] = []
+        started = time.perf_counter()
+
+        def send(batch):
+            try:
+                return self._send_with_retry(batch, stats)
+            finally:
+                slots.release()
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for doc_batch in batched(docs, self.max_docs):
+                vectors = embed_fn([d.page_content for d in doc_batch])
+                ready = []
+                for doc, vector in zip(doc_batch, vectors):
+                    if vector:
+                        ready.append((doc, self._encode(doc, vector)))
+                    else:
+                        self._fail(stats, [doc])
+
+                for request_batch in self._split_by_bytes(ready):
+                    slots.acquire()
+                    pending.append(executor.submit(send, request_batch))
+
+                    done = [f for f in pending if f.done()]
+                    for f in done:
+                        pending.remove(f)
+                        yield f.result()
+
+            for f in pending:
+                yield f.result()
+
+        stats.elapsed = time.perf_counter() - started
+        print(f"   bulk 적재 완료: {stats.summary()}")
+
+    def _fail(self, stats: BulkStats, docs: List[Document]):
+        with self._lock:
+            stats.failed += len(docs)
+            stats.failed_ids.extend(doc.metadata.get("id") for doc in docs)
+
+    def _encode(self, doc: Document, vector: List[float]) -> str:
+        # langchain OpenSearchVectorSearch와 같은 문서 형태로 맞춘다
+        doc_id = doc.metadata.get("id")
+        action = {"index": {"_index": self.index_name}}
+        source = {
+            self.vector_field: vector,
+            self.text_field: doc.page_content,
+            "metadata": doc.metadata,
+        }
+        if doc_id:
+            if self.is_aoss:
+                source["id"] = doc_id # AOSS는 _id 지정 불가
+            else:
+                action["index"]["_id"] = doc_id
+        return json.dumps(action) + "\n" + json.dumps(source, ensure_ascii=False) + "\n"
+
+    def _split_by_bytes(self, items: List[Tuple[Document, str]]) -> Iterator[List[Tuple[Document, str]]]:
+        batch: List[Tuple[Document, str]] = []
+        size = 0
+        for item in items:
+            item_size = len(item[1].encode("utf-8"))
+            if batch and size + item_size > self.max_bytes:
+                yield batch
+                batch, size = [], 0
+            batch.append(item)
+            size += item_size
+        if batch:
+            yield batch
+
+    def _send_with_retry(self, items: List[Tuple[Document, str]], stats: BulkStats) -> List[Document]:
+        written: List[Document] = []
+        attempt = 0
+        while items:
+            body = "".join(line for _, line in items)
+            with self._lock:
+                stats.requests += 1
+                stats.bytes += len(body.encode("utf-8"))
+
+            try:
+                resp = self.client.bulk(body=body)
+                results = resp.get("items", [])
+            except Exception as e:
+                # 요청 자체가 실패하면 전부 다시 보낸다
+                print(f"bulk 요청 실패: {e}")
+                results = []
+            if len(results) < len(items):
+                results = results + [{"index": {"status": 503}}] * (len(items) - len(results))
+
+            retry = []
+            for item, result in zip(items, results):
+                status = next(iter(result.values()), {}).get("status", 500)
+                if status < 300:
+                    written.append(item[0])
+                elif status in RETRYABLE_STATUS:
+                    retry.append(item)
+                else:
+                    self._fail(stats, [item[0]])
+
+            if not retry:
+                break
+            if attempt >= self.max_retries:
+                self._fail(stats, [doc for doc, _ in retry])
+                break
+
+            # 실패한 항목만 backoff 후 재전송
+            time.sleep(random.uniform(0, self.base_delay * (2 ** attempt)))
+            attempt += 1
+            with self._lock:
+                stats.retried += len(retry)
+            items = retry
+
+        with self._lock:
+            stats.docs += len(written)
+        return written
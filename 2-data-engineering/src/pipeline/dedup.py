@@ -0,0 +1,179 @@
+# 청크 근사 중복 제거 (MinHash + LSH)
+# 청크마다 단어 3-gram 집합의 MinHash signature를 만들고, 추정 Jaccard 유사도가 threshold 이상이면 같은 청크로 본다
+# 후보 검색은 signature를 band로 나눈 LSH 테이블 (band 하나라도 완전히 같은 청크만 비교)
+import base64
+import json
+import os
+import re
+import threading
+import zlib
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, TypeVar
+import numpy as np
+
+T = TypeVar("T")
+
+_TOKEN_RE = re.compile(r"\w+")
+SHINGLE = 3
+NUM_PERM = 64
+BANDS = 16 # band당 4행. 유사도 0.5 근처부터 후보가 되고, 실제 판정은 threshold로
+# 순열 대신 multiply-shift 해시 ((a * x + b) mod 2^64의 상위 32bit). 파일에 저장하므로 계수는 고정
+_rng = np.random.default_rng(20240601)
+_A = _rng.integers(0, 1 << 63, size=NUM_PERM, dtype=np.uint64) * np.uint64(2) + np.uint64(1) # 홀수
+_B = _rng.integers(0, 1 << 63, size=NUM_PERM, dtype=np.uint64)
+
+def shingle_hashes(text: str) -> np.ndarray:
+    tokens = _TOKEN_RE.findall(text.lower())
+    if len(tokens) >= SHINGLE:
+        features = {" ".join(tokens[i:i + SHINGLE]) for i in range(len(tokens) - SHINGLE + 1)}
+    else:
+        features = set(tokens)
+    # 프로세스마다 값이 바뀌는 hash() 대신 crc32
+    return np.fromiter((zlib.crc32(f.encode("utf-8")) for f in features), dtype=np.uint64, count=len(features))
+
+def minhash(text: str) -> np.ndarray:
+    hashes = shingle_hashes(text)
+    if len(hashes) == 0:
+        return np.zeros(NUM_PERM, dtype=np.uint32)
+    values = (hashes[:, None] * _A + _B) >> np.uint64(32) # (shingle 수, NUM_PERM), uint64 곱은 2^64에서 wrap
+    return values.min(axis=0).astype(np.uint32)
+
+def jaccard(a: np.ndarray, b: np.ndarray) -> float:
+    # 같은 값인 순열의 비율 = Jaccard 유사도 추정치
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+class MinHashLSH: # 메모리 안의 근사 중복 검색 테이블 (key -> signature)
+    def __init__(self, threshold: float = 0.7, bands: int = BANDS):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = NUM_PERM // bands
+        self._tables: List[Dict[bytes, Set[str]]] = [{} for _ in range(bands)]
+        self.signatures: Dict[str, np.ndarray] = {}
+
+    def _band_keys(self, sig: np.ndarray) -> Iterator[bytes]:
+        for b in range(self.bands):
+            yield sig[b * self.rows:(b + 1) * self.rows].tobytes()
+
+    def add(self, key: str, sig: np.ndarray):
+        self.remove(key)
+        self.signatures[key] = sig
+        for table, band in zip(self._tables, self._band_keys(sig)):
+            table.setdefault(band, set()).add(key)
+
+    def remove(self, key: str):
+        sig = self.signatures.pop(key, None)
+        if sig is None:
+            return
+        for table, band in zip(self._tables, self._band_keys(sig)):
+            bucket = table.get(band)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del table[band]
+
+    def find(self, sig: np.ndarray, accept: Optional[Callable[[str], bool]] = None) -> Optional[str]:
+        # 추정 유사도가 threshold 이상인 key 하나 (accept로 후보를 거를 수 있음)
+        seen: Set[str] = set()
+        for table, band in zip(self._tables, self._band_keys(sig)):
+            for key in table.get(band, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                if jaccard(sig, self.signatures[key]) >= self.threshold and (accept is None or accept(key)):
+                    return key
+        return None
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+
+class NearDuplicateIndex: # 인덱스에 들어간 청크의 MinHash signature를 로컬에 저장 ({doc_id: [source, signature]}, JSON)
+    # filter에서 통과한 청크는 pending 상태 (같은 ingest 안의 비교에는 쓰지만 저장하지 않음)
+    # 적재에 성공하면 commit, 실패하거나 중단되면 rollback으로 제거
+    def __init__(self, path: str, threshold: float = 0.7):
+        self.path = path
+        self.threshold = threshold
+        self.table = MinHashLSH(threshold)
+        self.sources: Dict[str, str] = {} # doc_id -> source
+        self.pending: Set[str] = set() # 아직 적재가 확인되지 않은 doc_id
+        self.checked = 0
+        self.dropped = 0
+        self._lock = threading.Lock() # 배치 ingest는 여러 스레드에서 동시에 적재
+        self._save_lock = threading.Lock() # snapshot과 파일 쓰기를 한 번에 (오래된 snapshot이 나중에 덮어쓰지 않게)
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for doc_id, (source, encoded) in json.load(f).items():
+                    self.table.add(doc_id, np.frombuffer(base64.b64decode(encoded), dtype=np.uint32))
+                    self.sources[doc_id] = source
+
+    def filter(self, source: str, items: Iterable[Tuple[str, str, T]],
+               accepted: Optional[List[str]] = None) -> Iterator[T]:
+        # (doc_id, 청크, 값) 순서대로 받아서 근사 중복이 아닌 청크의 값만 yield (스트리밍 가능)
+        # 같은 source 안에서는 이번 청크 목록끼리만 비교 (이전 적재분은 다시 넣는 중이므로 비교하지 않음)
+        # 다른 source와는 저장된 signature 전체와 비교. 남긴 청크는 pending으로 추가 (accepted에 doc_id 기록)
+        local = MinHashLSH(self.threshold)
+        other_source = lambda key: self.sources.get(key) != source
+        for doc_id, text, value in items:
+            sig = minhash(text)
+            if not sig.any():
+                # 단어가 없는 청크 (표 구분선, 기호만 있는 줄 등)는 signature가 모두 0이라 서로 유사도 1.0이 되므로 비교하지 않고 통과
+                with self._lock:
+                    self.checked += 1
+                yield value
+                continue
+            with self._lock:
+                self.checked += 1
+                if local.find(sig) is not None or self.table.find(sig, accept=other_source) is not None:
+                    self.dropped += 1
+                    continue
+                local.add(doc_id, sig)
+                self.table.add(doc_id, sig)
+                self.sources[doc_id] = source
+                self.pending.add(doc_id)
+            if accepted is not None:
+                accepted.append(doc_id)
+            yield value
+
+    def commit(self, doc_ids: Iterable[str]):
+        # 적재에 성공한 청크의 signature를 저장 대상으로
+        with self._lock:
+            self.pending.difference_update(doc_ids)
+
+    def rollback(self, doc_ids: Iterable[str]):
+        # 아직 pending인 signature 제거 (적재 실패 / 중단)
+        with self._lock:
+            for doc_id in doc_ids:
+                if doc_id in self.pending:
+                    self.pending.discard(doc_id)
+                    self.table.remove(doc_id)
+                    self.sources.pop(doc_id, None)
+
+    def remove(self, doc_ids: Iterable[str]):
+        with self._lock:
+            for doc_id in doc_ids:
+                self.table.remove(doc_id)
+                self.sources.pop(doc_id, None)
+                self.pending.discard(doc_id)
+
+    def clear(self):
+        with self._lock:
+            self.table = MinHashLSH(self.threshold)
+            self.sources = {}
+            self.pending = set()
+
+    def summary(self) -> str:
+        return f"signature {len(self.table)}개, 검사 {self.checked}, 중복 제외 {self.dropped}"
+
+    def save(self):
+        with self._save_lock:
+            with self._lock:
+                data = {
+                    doc_id: [self.sources[doc_id], base64.b64encode(sig.tobytes()).decode("ascii")]
+                    for doc_id, sig in self.table.signatures.items() if doc_id not in self.pending
+                }
+            dirname = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(dirname, exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
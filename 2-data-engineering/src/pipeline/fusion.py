@@ -0,0 +1,75 @@
+import hashlib
+from typing import Any, Dict, List, Tuple
+from langchain_core.documents import Document
+
+ScoredDocs = List[Tuple[Document, float]]
+
+RRF_K = 60 # RRF 상수 (원 논문 기본값)
+
+# server hybrid 검색을 아예 못 쓰는 환경(AOSS, neural-search 플러그인 없음 등)에서 나오는 오류 문구
+SERVER_HYBRID_UNSUPPORTED = ("search_pipeline", "search pipeline", "unknown query [hybrid]", "no [query] registered for [hybrid]")
+
+def doc_key(doc: Document) -> str:
+    # hash()는 프로세스마다 달라지므로 내용 기반 sha1 사용
+    doc_id = doc.metadata.get("id") if doc.metadata else None
+    if doc_id:
+        return str(doc_id)
+    return hashlib.sha1(doc.page_content.encode("utf-8")).hexdigest()
+
+def is_server_hybrid_unsupported(error: Exception) -> bool:
+    # 4xx + search pipeline / hybrid 쿼리 미지원 문구일 때만 확정적으로 못 쓰는 것으로 본다
+    # (timeout, 429, 5xx 같은 일시적인 오류는 False)
+    status = getattr(error, "status_code", None)
+    if not isinstance(status, int) or not 400 <= status < 500 or status in (408, 429):
+        return False
+    message = str(error).lower()
+    return any(marker in message for marker in SERVER_HYBRID_UNSUPPORTED)
+
+def normalize(scores: List[float]) -> List[float]:
+    if not scores:
+        return []
+    m = max(scores) or 1.0
+    return [s / m for s in scores]
+
+def weighted_sum_fusion(vec_results: ScoredDocs, text_results: ScoredDocs, k: int,
+                        vector_weight: float = 0.5, text_weight: float = 0.5) -> List[Dict[str, Any]]:
+    # 각 결과를 최대값으로 정규화한 뒤 가중합
+    vec_scores = normalize([s for _, s in vec_results])
+    txt_scores = normalize([s for _, s in text_results])
+
+    combined: Dict[str, Dict[str, Any]] = {}
+    for (doc, _), ns in zip(vec_results, vec_scores):
+        combined[doc_key(doc)] = {"doc": doc, "v": ns, "t": 0.0}
+
+    for (doc, _), ns in zip(text_results, txt_scores):
+        key = doc_key(doc)
+        if key in combined:
+            combined[key]["t"] = ns
+        else:
+            combined[key] = {"doc": doc, "v": 0.0, "t": ns}
+
+    items = [(vector_weight * e["v"] + text_weight * e["t"], e["doc"]) for e in combined.values()]
+    return to_result_list(items, k)
+
+def rrf_fusion(vec_results: ScoredDocs, text_results: ScoredDocs, k: int, rrf_k: int = RRF_K) -> List[Dict[str, Any]]:
+    # Reciprocal Rank Fusion: 점수 스케일과 무관하게 순위만 사용
+    combined: Dict[str, Dict[str, Any]] = {}
+    for results in (vec_results, text_results):
+        for rank, (doc, _) in enumerate(results, 1):
+            key = doc_key(doc)
+            entry = combined.setdefault(key, {"doc": doc, "score": 0.0})
+            entry["score"] += 1.0 / (rrf_k + rank)
+
+    items = [(e["score"], e["doc"]) for e in combined.values()]
+    return to_result_list(items, k)
+
+def to_result_list(items: List[Tuple[float, Document]], k: int) -> List[Dict[str, Any]]:
+    items = sorted(items, key=lambda x: x[0], reverse=True)[:k]
+    result_list = []
+    for s, d in items:
+        result_list.append({
+            "score": s,
+            "page_content": d.page_content,
+            "metadata": d.metadata,
+        })
+    return result_list
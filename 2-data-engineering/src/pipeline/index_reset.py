@@ -0,0 +1,154 @@
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+# indices.get 응답에 들어있지만 create 때 넣을 수 없는 설정들
+READONLY_INDEX_SETTINGS = {"creation_date", "uuid", "version", "provided_name", "resize", "history"}
+
+@dataclass
+class ResetReport:
+    strategy: str       # recreate / delete_by_query / scroll
+    deleted: int = 0    # 삭제한 문서 수 (recreate는 삭제 전 count)
+    calls: int = 0      # OpenSearch 호출 수
+    elapsed: float = 0.0
+
+    def summary(self) -> str:
+        return f"{self.strategy}: {self.deleted}개 삭제, 호출 {self.calls}회, {self.elapsed:.2f}s"
+
+
+class IndexRecreateError(RuntimeError): # 인덱스를 지운 뒤 다시 만들지 못함 (body: 재생성에 쓰려던 mapping/settings)
+    def __init__(self, index_name: str, body: Dict[str, Any], cause: Exception):
+        super().__init__(f"인덱스 {index_name} 삭제 후 재생성 실패 (저장한 mapping으로 직접 생성 필요): {cause} / body={body}")
+        self.index_name = index_name
+        self.body = body
+
+
+class IndexResetter: # 인덱스 문서 전체 삭제. recreate -> delete_by_query -> scroll 순서로 가능한 방법 사용
+    def __init__(self, client, index_name: str, is_aoss: bool = True, page_size: int = 1000,
+                 on_progress: Optional[Callable[[int, int], None]] = None):
+        self.client = client
+        self.index_name = index_name
+        self.is_aoss = is_aoss
+        self.page_size = page_size
+        self.on_progress = on_progress # (삭제한 수, 전체 수)
+        self.calls = 0
+
+    def reset(self, strategy: str = "auto") -> Optional[ResetReport]:
+        self.calls = 0
+        started = time.perf_counter()
+        if not self._call(self.client.indices.exists, index=self.index_name):
+            return None
+
+        total = self._count()
+        strategies = [strategy] if strategy != "auto" else ["recreate", "delete_by_query", "scroll"]
+        report = None
+        for name in strategies:
+            if name == "delete_by_query" and self.is_aoss:
+                continue # AOSS는 delete_by_query 미지원
+            try:
+                report = getattr(self, "_reset_" + name)(total)
+                break
+            except IndexRecreateError:
+                raise # 인덱스가 없어진 상태라 다른 방법으로 넘어갈 수 없음
+            except Exception as e:
+                print(f"인덱스 초기화 {name} 실패, 다음 방법 시도: {e}")
+
+        if report is None:
+            raise RuntimeError(f"인덱스 초기화 실패: {self.index_name}")
+        report.calls = self.calls
+        report.elapsed = time.perf_counter() - started
+        print(f"인덱스 초기화 완료 - {report.summary()}")
+        return report
+
+    def _reset_recreate(self, total: int) -> ResetReport:
+        # 같은 mapping/settings로 인덱스를 지우고 다시 만든다 (문서 수와 상관없이 호출 몇 번)
+        info = self._call(self.client.indices.get, index=self.index_name)[self.index_name]
+        body = {"mappings": info.get("mappings", {})}
+        settings = self._creatable_settings(info.get("settings", {}))
+        if settings:
+            body["settings"] = {"index": settings}
+
+        # delete 전에 실패하면 인덱스는 그대로이므로 다음 방법으로 넘어간다
+        self._call(self.client.indices.delete, index=self.index_name)
+        try:
+            self._call(self.client.indices.create, index=self.index_name, body=body)
+        except Exception as e:
+            # settings 때문에 실패하면 mapping + knn만으로 다시 시도 (인덱스가 없어진 채로 두지 않기 위해)
+            print(f"같은 settings로 재생성 실패, mapping만으로 재시도: {e}")
+            fallback = {"settings": {"index": {"knn": True}}, "mappings": body["mappings"]}
+            try:
+                self._call(self.client.indices.create, index=self.index_name, body=fallback)
+            except Exception as e2:
+                raise IndexRecreateError(self.index_name, fallback, e2) from e2
+        self._progress(total, total)
+        return ResetReport(strategy="recreate", deleted=total)
+
+    def _reset_delete_by_query(self, total: int) -> ResetReport:
+        resp = self._call(
+            self.client.delete_by_query,
+            index=self.index_name,
+            body={"query": {"match_all": {}}},
+            params={"conflicts": "proceed", "refresh": "true"},
+        )
+        deleted = resp.get("deleted", total)
+        self._progress(deleted, total)
+        return ResetReport(strategy="delete_by_query", deleted=deleted)
+
+    def _reset_scroll(self, total: int) -> ResetReport:
+        # id를 전부 모으지 않고, 한 페이지 읽을 때마다 바로 지운다
+        deleted = 0
+        cursor = None
+        while True:
+            body: Dict[str, Any] = {
+                "size": self.page_size,
+                "query": {"match_all": {}},
+                "sort": [{"_id": "asc"}],
+                "_source": False,
+            }
+            if cursor is not None:
+                body["search_after"] = cursor
+
+            resp = self._call(self.client.search, index=self.index_name, body=body)
+            hits = resp.get("hits", {}).get("hits", [])
+            if not hits:
+                break
+
+            deleted += self._delete_ids([h["_id"] for h in hits])
+            cursor = hits[-1]["sort"]
+            self._progress(deleted, total)
+
+        return ResetReport(strategy="scroll", deleted=deleted)
+
+    def _delete_ids(self, ids: List[str]) -> int:
+        # 삭제한 수. 404(이미 없음) 외의 실패가 있으면 raise (search_after로 넘어가면 남은 문서를 다시 보지 않으므로)
+        actions = [{"delete": {"_index": self.index_name, "_id": _id}} for _id in ids]
+        resp = self._call(self.client.bulk, body=actions)
+        if not resp.get("errors"):
+            return len(ids)
+        failed = [
+            item for item in (next(iter(it.values())) for it in resp.get("items", []))
+            if item.get("status", 500) >= 300 and item.get("status") != 404
+        ]
+        if failed:
+            raise RuntimeError(f"bulk delete 실패 {len(failed)}건: {failed[0].get('error')}")
+        return len(ids)
+
+    def _count(self) -> int:
+        try:
+            return int(self._call(self.client.count, index=self.index_name).get("count", 0))
+        except Exception:
+            return 0
+
+    def _creatable_settings(self, settings: Dict[str, Any]) -> Dict[str, Any]:
+        index_settings = dict(settings.get("index", {}))
+        for key in READONLY_INDEX_SETTINGS:
+            index_settings.pop(key, None)
+        return index_settings
+
+    def _progress(self, deleted: int, total: int):
+        if self.on_progress is not None:
+            self.on_progress(deleted, total)
+
+    def _call(self, fn, **kwargs):
+        self.calls += 1
+        return fn(**kwargs)
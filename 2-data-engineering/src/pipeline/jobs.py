@@ -0,0 +1,199 @@
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional, Tuple
+from ..chunker.spans import Chunk
+from .stages import PageOffsets, chunk_spans, load_text_pages
+
+# source별 진행 상태
+QUEUED = "queued"
+LOADING = "loading"
+INDEXING = "indexing"
+DONE = "done"
+FAILED = "failed"
+
+def prepare_source(source: str, chunker: str, chunk_size: int, chunk_overlap: int, chunk_unit: str = "chars"
+                   ) -> Tuple[Optional[List[Chunk]], str, PageOffsets, Dict[str, float]]:
+    # 프로세스 풀에서 실행: load + clean (+ semantic이 아니면 chunk까지)
+    # semantic 청커는 임베딩 호출(I/O)이 필요하므로 index 단계에서 청크
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+    text, pages = load_text_pages(source) # 워커 안에서 또 프로세스를 띄우지 않도록 pdf_workers=1
+    timings["load"] = time.perf_counter() - started
+
+    if chunker == "semantic":
+        return None, text, pages, timings
+
+    started = time.perf_counter()
+    chunks = chunk_spans(text, chunker, chunk_size, chunk_overlap, unit=chunk_unit)
+    timings["chunk"] = time.perf_counter() - started
+    return chunks, "", pages, timings
+
+
+@dataclass
+class SourceStatus:
+    source: str
+    state: str = QUEUED
+    timings: Dict[str, float] = field(default_factory=dict) # 단계별 소요 시간(초)
+    chunks: int = 0
+    error: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.state in (DONE, FAILED)
+
+
+@dataclass
+class IngestJob:
+    job_id: str
+    sources: Dict[str, SourceStatus]
+    chunker: str
+    chunk_unit: str = "chars"
+    created: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        # 모든 source가 끝나고 정리(임시 파일 삭제)까지 마친 상태
+        return self.finished_at is not None
+
+    @property
+    def state(self) -> str:
+        if not self.finished:
+            return "running"
+        failed = sum(1 for s in self.sources.values() if s.state == FAILED)
+        if failed == 0:
+            return DONE
+        if failed == len(self.sources):
+            return FAILED
+        return "partial"
+
+    @property
+    def progress(self) -> float:
+        if not self.sources:
+            return 1.0
+        return sum(1 for s in self.sources.values() if s.finished) / len(self.sources)
+
+    def failures(self) -> Dict[str, str]:
+        return {s.source: s.error for s in self.sources.values() if s.state == FAILED}
+
+    def summary(self) -> str:
+        done = sum(1 for s in self.sources.values() if s.state == DONE)
+        failed = sum(1 for s in self.sources.values() if s.state == FAILED)
+        chunks = sum(s.chunks for s in self.sources.values())
+        return f"{self.state}: {done}/{len(self.sources)} 완료, 실패 {failed}, 청크 {chunks}개"
+
+
+class IngestJobQueue: # 여러 source를 받아 load/clean은 프로세스 풀, embed/index는 스레드 풀에서 처리하는 작업 큐
+    def __init__(self, pipeline, load_workers: Optional[int] = None, index_workers: int = 4):
+        self.pipeline = pipeline # index_chunks(source, chunks, pages)와 chunk_spans(...)만 사용
+        self.load_workers = load_workers or os.cpu_count() or 1
+        self.index_workers = max(1, index_workers)
+        self._jobs: Dict[str, IngestJob] = {}
+        self._cleanup: Dict[str, List[str]] = {} # job이 끝나면 지울 임시 파일
+        self._lock = threading.Lock()
+        # Streamlit처럼 스레드가 많은 프로세스에서 fork는 위험하므로 spawn
+        self._load_pool = ProcessPoolExecutor(
+            max_workers=self.load_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        self._index_pool = ThreadPoolExecutor(max_workers=self.index_workers)
+
+    def submit(self, sources: List[str], chunker: str, chunk_size: int, chunk_overlap: int,
+               remove_after: bool = False, chunk_unit: str = "chars") -> str:
+        # 바로 job_id를 반환하고, 진행 상태는 get()으로 조회
+        # remove_after: 처리 후 source 파일 삭제 (업로드된 임시 PDF용)
+        duplicates = sorted({s for s in sources if sources.count(s) > 1})
+        if duplicates:
+            raise ValueError(f"같은 source가 여러 번 들어 있습니다: {', '.join(duplicates)}")
+        job_id = uuid.uuid4().hex[:12]
+        job = IngestJob(job_id=job_id, sources={s: SourceStatus(source=s) for s in sources}, chunker=chunker,
+                        chunk_unit=chunk_unit)
+        with self._lock:
+            self._jobs[job_id] = job
+            if remove_after:
+                self._cleanup[job_id] = list(sources)
+
+        for source in job.sources:
+            self._update(job, source, state=LOADING)
+            future = self._load_pool.submit(prepare_source, source, chunker, chunk_size, chunk_overlap, chunk_unit)
+            future.add_done_callback(
+                lambda f, source=source: self._schedule_index(job, source, f, chunk_size, chunk_overlap)
+            )
+        if not job.sources:
+            self._finish_source(job)
+        return job_id
+
+    def get(self, job_id: str) -> Optional[IngestJob]:
+        # 호출 쪽에서 읽는 동안 바뀌지 않도록 복사본 반환
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            sources = {k: replace(v, timings=dict(v.timings)) for k, v in job.sources.items()}
+            return replace(job, sources=sources)
+
+    def jobs(self) -> List[IngestJob]:
+        with self._lock:
+            job_ids = list(self._jobs)
+        return [self.get(job_id) for job_id in job_ids]
+
+    def shutdown(self, wait: bool = True):
+        self._load_pool.shutdown(wait=wait)
+        self._index_pool.shutdown(wait=wait)
+
+    def _schedule_index(self, job: IngestJob, source: str, load_future: Future, chunk_size: int, chunk_overlap: int):
+        # load 풀의 done-callback: shutdown() 뒤에 load가 끝나면 index 풀에 넣을 수 없으므로 실패로 기록
+        try:
+            self._index_pool.submit(self._index_stage, job, source, load_future, chunk_size, chunk_overlap)
+        except RuntimeError as e:
+            print(f"배치 ingest 실패: {source} - {e}")
+            self._update(job, source, state=FAILED, error=str(e))
+            self._finish_source(job)
+
+    def _index_stage(self, job: IngestJob, source: str, load_future: Future, chunk_size: int, chunk_overlap: int):
+        try:
+            chunks, text, pages, timings = load_future.result()
+            self._update(job, source, state=INDEXING, timings=timings)
+
+            if chunks is None: # semantic
+                started = time.perf_counter()
+                chunks = self.pipeline.chunk_spans(text, job.chunker, chunk_size, chunk_overlap, job.chunk_unit)
+                self._update(job, source, timings={"chunk": time.perf_counter() - started})
+
+            started = time.perf_counter()
+            self.pipeline.index_chunks(source, chunks, pages)
+            self._update(job, source, state=DONE, chunks=len(chunks),
+                         timings={"index": time.perf_counter() - started})
+        except Exception as e:
+            print(f"배치 ingest 실패: {source} - {e}")
+            self._update(job, source, state=FAILED, error=str(e))
+        finally:
+            self._finish_source(job)
+
+    def _update(self, job: IngestJob, source: str, state: Optional[str] = None,
+                timings: Optional[Dict[str, float]] = None, chunks: Optional[int] = None, error: Optional[str] = None):
+        with self._lock:
+            status = job.sources[source]
+            if state is not None:
+                status.state = state
+            if timings:
+                status.timings.update(timings)
+            if chunks is not None:
+                status.chunks = chunks
+            if error is not None:
+                status.error = error
+
+    def _finish_source(self, job: IngestJob):
+        with self._lock:
+            if job.finished or not all(s.finished for s in job.sources.values()):
+                return
+            job.finished_at = time.time()
+            paths = self._cleanup.pop(job.job_id, [])
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+        print(f"배치 ingest {job.job_id} 종료 - {job.summary()}")
@@ -0,0 +1,80 @@
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Tuple
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+@dataclass
+class ChunkFingerprint:
+    doc_id: str
+    content_hash: str
+    chunk_index: int
+    content: str
+
+@dataclass
+class IngestReport:
+    source: str
+    added: int = 0
+    kept: int = 0
+    removed: int = 0
+    duplicates: int = 0 # 근사 중복이라 적재하지 않은 청크 수
+    docs: List[Dict[str, Any]] = field(default_factory=list) # 새로 적재된 청크 결과
+
+    def summary(self) -> str:
+        return f"추가 {self.added}, 유지 {self.kept}, 삭제 {self.removed}, 중복 제외 {self.duplicates}"
+
+
+class IngestManifest: # source별로 {doc_id: 청크 content hash}를 기록하는 로컬 매니페스트 (JSON)
+    def __init__(self, path: str):
+        self.path = path
+        self.sources: Dict[str, Dict[str, str]] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.sources = json.load(f)
+
+    def get(self, source: str) -> Dict[str, str]:
+        return dict(self.sources.get(source, {}))
+
+    def set(self, source: str, entries: Dict[str, str]):
+        if entries:
+            self.sources[source] = entries
+        else:
+            self.sources.pop(source, None)
+
+    def clear(self):
+        self.sources = {}
+
+    def save(self):
+        dirname = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(dirname, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.sources, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path) # 중간에 죽어도 매니페스트가 깨지지 않게
+
+
+def plan_incremental(previous: Dict[str, str], current: List[ChunkFingerprint]) -> Tuple[List[ChunkFingerprint], List[str], int]:
+    # (새로 넣을 청크, 지울 doc_id, 유지 개수)
+    current_ids = {c.doc_id for c in current}
+    added = [c for c in current if c.doc_id not in previous]
+    removed = [doc_id for doc_id in previous if doc_id not in current_ids]
+    kept = len(current) - len(added)
+    return added, removed, kept
+
+def fingerprint_chunks(source_url: str, chunks: List[str], make_id: Callable[[str, str, int], str]) -> List[ChunkFingerprint]:
+    fingerprints = []
+    seen: Dict[str, int] = {}
+    for i, chunk in enumerate(chunks):
+        h = content_hash(chunk)
+        occurrence = seen.get(h, 0)
+        seen[h] = occurrence + 1
+        fingerprints.append(ChunkFingerprint(
+            doc_id=make_id(source_url, h, occurrence),
+            content_hash=h,
+            chunk_index=i,
+            content=chunk,
+        ))
+    return fingerprints
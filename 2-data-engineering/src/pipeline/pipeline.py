@@ -1,26 +1,52 @@
 from langchain_aws import BedrockEmbeddings
 from langchain_community.vectorstores import OpenSearchVectorSearch
-from ..loader.pdf_loader import load_pdf
-from ..loader.webbase_loader import load_web
-from ..chunker.semantic_chunker import semantic_chunk
-from ..chunker.fixed_chunker import fixed_chunk
-from ..chunker.recursive_chunker import recursive_chunk
-from ..cleaning.text_normalize import pdf_to_plain, web_to_plain
-from ..cleaning.table_to_markdown import pdf_text_to_markdown
+from ..loader.webbase_loader import build_web_result, WebLoadResult
+from ..loader.crawler import WebCrawler, CrawlState
 from ..structuring.structurer import DocumentStructurer
+from .stages import iter_cleaned, clean_web, chunk_spans, load_text_pages, span_metadata, PageOffsets
+from ..chunker.spans import Chunk
+from .streaming import stream_chunk_spans, batched
+from .manifest import IngestManifest, IngestReport, fingerprint_chunks, plan_incremental
+from .bulk_writer import BulkIndexWriter, BulkStats, BulkWriteError
+from .index_reset import IndexResetter, ResetReport
+from .fusion import weighted_sum_fusion, rrf_fusion, to_result_list, is_server_hybrid_unsupported
+from .query_cache import SearchCache
+from .dedup import NearDuplicateIndex
 from langchain_core.documents import Document
 from ..embedding.embedder import BedrockEmbedder
+from ..embedding.cache import EmbeddingCache, CachedEmbeddings
 from opensearchpy import AWSV4SignerAuth, RequestsHttpConnection
+from concurrent.futures import ThreadPoolExecutor
 import boto3
 import os
-from typing import Optional, List, Dict, Any
+import time
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple
 
 class Pipeline:
-    def __init__(self, embeddings: BedrockEmbeddings, index_name: str):
+    SERVER_HYBRID_RETRY_S = 300.0 # server hybrid가 일시적으로 실패했을 때 다시 시도하기까지 client 쪽 fusion을 쓰는 시간(초)
+    STREAM_HEADER_WINDOW = 20 # 스트리밍 ingest에서 머리글/바닥글 판정에 쓰는 앞쪽 페이지 수
+
+    def __init__(self, embeddings: BedrockEmbeddings, index_name: str, embedding_cache: Optional[EmbeddingCache] = None,
+                 pdf_workers: int = 1, manifest: Optional[IngestManifest] = None,
+                 search_cache: Optional[SearchCache] = None, crawler: Optional[WebCrawler] = None,
+                 structurer: Optional[DocumentStructurer] = None, dedup: Optional[NearDuplicateIndex] = None):
         self.embeddings = embeddings
         self.index_name = index_name
-        self.structurer = DocumentStructurer()
-        self.bedrock_embedder = BedrockEmbedder()
+        self.embedding_cache = embedding_cache
+        self.pdf_workers = pdf_workers # PDF 텍스트 추출 프로세스 수
+        self.manifest = manifest or IngestManifest(".cache/ingest_manifest.json")
+        self.last_reset_report: Optional[ResetReport] = None
+        self.last_crawl_report: Optional[IngestReport] = None
+        self.crawler = crawler or WebCrawler(state=CrawlState(".cache/crawl_state.json"))
+        self.last_search_timings: Dict[str, float] = {}
+        self.search_cache = search_cache or SearchCache() # 질의 벡터 / 검색 결과 캐시
+        self._search_executor = ThreadPoolExecutor(max_workers=8) # k-NN / BM25 동시 실행용
+        self._search_pipelines = set()
+        self._server_hybrid_available: Optional[bool] = None # False: 이 환경에서는 못 씀 (확정)
+        self._server_hybrid_retry_at = 0.0 # 일시적인 실패 뒤 다시 시도할 시각 (monotonic)
+        self.structurer = structurer or DocumentStructurer()
+        self.dedup = dedup # None이면 근사 중복 제거 안 함
+        self.bedrock_embedder = BedrockEmbedder(cache=embedding_cache)
 
         credentials = boto3.Session().get_credentials()
         auth = AWSV4SignerAuth(credentials, os.getenv("AWS_REGION"), "aoss")
@@ -47,73 +73,333 @@ class Pipeline:
         #     verify_certs=True,
         #     connection_class=RequestsHttpConnection
         # )
+
+        # 적재는 add_documents 대신 _bulk API를 직접 사용
+        self.bulk_writer = BulkIndexWriter(
+            client = self.vector_store.client,
+            index_name = self.index_name,
+            max_docs = int(os.getenv("BULK_MAX_DOCS", "200")),
+            max_bytes = int(os.getenv("BULK_MAX_BYTES", str(5 * 1024 * 1024))),
+            concurrency = int(os.getenv("BULK_CONCURRENCY", "4")),
+            is_aoss = True,
+        )
         print("Pipeline 초기화 성공")
 
-    def run(self, source: str, chunker: str, chunk_size: int, chunk_overlap: int):
+    def run(self, source: str, chunker: str, chunk_size: int, chunk_overlap: int, streaming: bool = False,
+            chunk_unit: str = "chars"):
+        # chunk_unit: "chars"(글자 수) / "tokens"(recursive, semantic 청커에서 chunk_size를 토큰 예산으로)
+        if streaming:
+            result_list = []
+            for batch_result in self.run_stream(source, chunker, chunk_size, chunk_overlap, chunk_unit):
+                result_list.extend(batch_result)
+            return result_list
+
+        chunks, pages = self._load_chunks(source, chunker, chunk_size, chunk_overlap, chunk_unit)
+        return self.index_chunks(source, chunks, pages)
+
+    def index_chunks(self, source: str, chunks: List[Chunk], pages: Optional[PageOffsets] = None) -> List[Dict[str, Any]]:
+        # 이미 만들어진 청크를 구조화해서 적재 (배치 ingest의 index 단계에서도 사용)
         is_pdf = source.endswith(".pdf")
+        accepted = []
+        try:
+            keep = list(self._skip_near_duplicates(
+                source, ((self.structurer._generate_doc_id(source, i), chunk.text, i) for i, chunk in enumerate(chunks)),
+                accepted
+            ))
+            structured_docs = self.structurer.structure_documents(
+                [chunks[i].text for i in keep],
+                source_url=source,
+                source_type="pdf" if is_pdf else "web",
+                chunk_indexes=keep,
+                metadatas=[span_metadata(chunks[i], pages) for i in keep] # 검색 결과에서 원문 위치(페이지)로 돌아갈 수 있게
+            )
+            if len(keep) < len(chunks):
+                print(f"   근사 중복 청크 {len(chunks) - len(keep)}개 제외")
 
-        # Loader로 로드하고 Cleaning
-        cleaned: List[Dict[str, Any]] = []
-        if is_pdf:
-            pdf = load_pdf(source)
-            for p in pdf.pages:
-                plain = pdf_to_plain([p.content])
-                tables = pdf_text_to_markdown(plain)
-                if tables:
-                    plain = plain + "\n\n" + "\n\n".join(tables)
-                cleaned.append({
-                    "page_content": plain,
-                    "metadata": {
-                        "source": pdf.source,
-                        "page_number": p.page,
-                        "total_pages": pdf.total_pages,
-                    }
-                })
-        else:
-            web = load_web(source)
-            plain = web_to_plain(web.text_raw)
-            meta_data = {"source": web.url, "title": web.title}
-            for key in web.meta:
-                meta_data[key] = web.meta[key]
-            cleaned.append({
-                "page_content": plain,
-                "metadata": meta_data
-            })
+            stats = self._index_documents(structured_docs)
+            self.search_cache.invalidate()
+            self._commit_dedup(structured_docs, stats)
+        finally:
+            self._release_dedup(accepted)
+        self._save_dedup()
+        self._raise_for_failures(stats)
+        return self._to_result_list(structured_docs)
 
-        content_list = []
-        for c in cleaned:
-            content_list.append(c["page_content"])
-        merged_content = "\n\n".join(content_list)
+    def run_incremental(self, source: str, chunker: str, chunk_size: int, chunk_overlap: int,
+                        chunk_unit: str = "chars") -> IngestReport:
+        # 매니페스트의 청크 content hash와 비교해서 바뀐 청크만 임베딩/적재, 사라진 청크만 삭제
+        # (유지된 청크의 chunk_index 메타데이터는 처음 적재될 때 값 그대로 남는다)
+        chunks, pages = self._load_chunks(source, chunker, chunk_size, chunk_overlap, chunk_unit)
+        accepted = []
+        try:
+            structured_docs, removed, kept, duplicates, entries = self._plan_source(source, chunks, pages, accepted)
 
-        # Chunker로 청크
-        if chunker == "semantic":
-            chunks = semantic_chunk(
-                text=merged_content,
-                target_chars=chunk_size,
-                embedder=self.bedrock_embedder
-            )
-        elif chunker == "fixed":
-            chunks = fixed_chunk(merged_content, max_chars=chunk_size, overlap=chunk_overlap)
-        elif chunker == "recursive":
-            chunks = recursive_chunk(merged_content, chunk_size=chunk_size)
-        else:
-            chunks = [merged_content]
+            stats = self._index_documents(structured_docs) if structured_docs else BulkStats()
+            if removed:
+                self._delete_doc_ids(removed)
+            if structured_docs or removed:
+                self.search_cache.invalidate()
+            self._commit_dedup(structured_docs, stats)
+        finally:
+            self._release_dedup(accepted)
+        # 적재가 끝난 뒤에만 매니페스트 갱신. 실패한 청크는 빼서 다음 증분 ingest에서 다시 적재되게
+        failed = set(stats.failed_ids)
+        self.manifest.set(source, {doc_id: h for doc_id, h in entries.items() if doc_id not in failed})
+        self.manifest.save()
+        self._save_dedup()
 
-        structured_docs = []
-        i = 0
-        for chunk in chunks:
-            opensearch_doc = self.structurer.structure_document(
-                content=chunk,
+        report = IngestReport(
+            source=source,
+            added=len(structured_docs),
+            kept=kept,
+            removed=len(removed),
+            duplicates=duplicates,
+            docs=self._to_result_list(structured_docs)
+        )
+        print(f"증분 ingest 완료: {report.summary()}")
+        self._raise_for_failures(stats)
+        return report
+
+    def _plan_source(self, source: str, chunks: List[Chunk], pages: Optional[PageOffsets] = None,
+                     accepted: Optional[List[str]] = None):
+        # 매니페스트와 비교해서 (새로 넣을 문서, 지울 doc_id, 유지 개수, 근사 중복 개수, 새 매니페스트 항목)
+        # 매니페스트는 바꾸지 않는다 (적재가 끝난 뒤 호출 쪽에서 set)
+        # 근사 중복은 매니페스트에도 넣지 않는다 (원본이 지워지면 다음 증분 ingest에서 다시 검사되도록)
+        is_pdf = source.endswith(".pdf")
+        fingerprints = fingerprint_chunks(source, [c.text for c in chunks], self.structurer._generate_content_doc_id)
+        current = list(self._skip_near_duplicates(source, ((c.doc_id, c.content, c) for c in fingerprints), accepted))
+        previous = self.manifest.get(source)
+        added, removed, kept = plan_incremental(previous, current)
+        if self.dedup is not None:
+            # 유지된 청크는 이미 인덱스에 있으므로 바로 commit
+            self.dedup.commit(c.doc_id for c in current if c.doc_id in previous)
+
+        structured_docs = self.structurer.structure_documents(
+            [c.content for c in added],
+            source_url=source,
+            source_type="pdf" if is_pdf else "web",
+            chunk_indexes=[c.chunk_index for c in added],
+            metadatas=[{"content_hash": c.content_hash, **span_metadata(chunks[c.chunk_index], pages)} for c in added],
+            doc_ids=[c.doc_id for c in added],
+            corpus=[c.content for c in current] # tfidf는 바뀐 청크만이 아니라 source의 현재 청크 전체 기준
+        )
+
+        entries = {c.doc_id: c.content_hash for c in current}
+        return structured_docs, removed, kept, len(fingerprints) - len(current), entries
+
+    def run_crawl(self, seeds: List[str], chunker: str, chunk_size: int, chunk_overlap: int, chunk_unit: str = "chars"):
+        # seed url / sitemap 목록을 동시에 수집하면서 페이지마다 clean -> chunk -> 증분 비교 -> bulk index
+        # 조건부 GET(304)으로 바뀌지 않은 페이지는 건너뛰고, 배치가 인덱싱될 때마다 결과를 yield
+        report = IngestReport(source=f"crawl ({len(seeds)} seeds)")
+        self.last_crawl_report = report
+        fetched = [] # (페이지, 새 매니페스트 항목)
+        accepted = []
+        waiting: Dict[str, set] = {}            # 페이지 url -> 아직 적재가 확인되지 않은 새 청크 doc_id
+        deferred: Dict[str, List[str]] = {}     # 페이지 url -> 새 청크가 다 적재되면 지울 예전 청크 doc_id
+        page_of: Dict[str, str] = {}            # 새 청크 doc_id -> 페이지 url
+
+        def delete_removed(url: str):
+            self._delete_doc_ids(deferred.pop(url))
+            self.search_cache.invalidate()
+
+        def structured_docs():
+            for page in self.crawler.crawl(self.crawler.expand_seeds(seeds)):
+                if not page.ok:
+                    continue
+                cleaned = self._clean_web(build_web_result(page.url, page.html))
+                chunks = self.chunk_spans(cleaned["page_content"], chunker, chunk_size, chunk_overlap, chunk_unit)
+                docs, removed, kept, duplicates, entries = self._plan_source(page.url, chunks, accepted=accepted)
+                if removed:
+                    # 예전 청크는 이 페이지의 새 청크가 적재된 뒤에 지운다 (적재가 실패하면 예전 청크가 남도록)
+                    deferred[page.url] = removed
+                    if not docs:
+                        delete_removed(page.url)
+                if docs:
+                    waiting[page.url] = {d.metadata["id"] for d in docs}
+                    page_of.update((d.metadata["id"], page.url) for d in docs)
+                report.added += len(docs)
+                report.kept += kept
+                report.removed += len(removed)
+                report.duplicates += duplicates
+                fetched.append((page, entries))
+                yield from docs
+
+        self._ensure_index()
+        stats = BulkStats()
+        try:
+            for written in self.bulk_writer.iter_write(structured_docs(), self.bedrock_embedder.embed_texts, stats):
+                self._commit_dedup(written)
+                for d in written:
+                    url = page_of.pop(d.metadata["id"])
+                    waiting[url].discard(d.metadata["id"])
+                    if not waiting[url]:
+                        del waiting[url]
+                        if url in deferred:
+                            delete_removed(url)
+                self.search_cache.invalidate()
+                docs = self._to_result_list(written)
+                report.docs.extend(docs)
+                yield docs
+        finally:
+            self._release_dedup(accepted)
+
+        # 적재가 끝난 뒤에만 매니페스트 / ETag 기록 (중간에 실패하면 다음 크롤링에서 다시 받음)
+        # 적재에 실패한 청크가 있는 페이지는 ETag를 남기지 않아서 다음 크롤링에서 304로 건너뛰지 않게
+        # 그 페이지에서 지우지 못한 예전 청크는 매니페스트에 남겨서 다음 크롤링에서 다시 지우게
+        failed = set(stats.failed_ids)
+        for page, entries in fetched:
+            previous = self.manifest.get(page.url)
+            leftover = {doc_id: previous[doc_id] for doc_id in deferred.get(page.url, []) if doc_id in previous}
+            self.manifest.set(page.url, {**leftover, **{doc_id: h for doc_id, h in entries.items() if doc_id not in failed}})
+        self.manifest.save()
+        self._save_dedup()
+        if self.crawler.state is not None:
+            for page, entries in fetched:
+                if failed.isdisjoint(entries):
+                    self.crawler.state.record(page)
+            self.crawler.state.save()
+        print(f"크롤링 ingest 완료: {report.summary()}")
+        self._raise_for_failures(stats)
+
+    def run_stream(self, source: str, chunker: str, chunk_size: int, chunk_overlap: int, chunk_unit: str = "chars"):
+        # 페이지 단위 스트리밍: load -> clean -> chunk(carry-over) -> 마이크로 배치로 structure + embed + bulk index
+        # 배치가 인덱싱될 때마다 결과를 yield 하므로, 앞쪽 청크는 문서 처리 중에도 검색 가능
+        # 머리글/바닥글은 앞쪽 STREAM_HEADER_WINDOW 페이지로 판정 (문서 전체 추출을 기다리지 않음)
+        pages = (
+            (c["page_content"], c["metadata"].get("page_number"))
+            for c in self._iter_cleaned(source, header_window=self.STREAM_HEADER_WINDOW)
+        )
+        max_carry = chunk_size * 4 if chunk_unit == "tokens" else chunk_size # 토큰 예산은 글자 수로 넉넉히 환산
+        chunks = stream_chunk_spans(
+            pages, lambda text: self.chunk_spans(text, chunker, chunk_size, chunk_overlap, chunk_unit), max_carry
+        )
+
+        accepted = []
+        indexed_chunks = self._skip_near_duplicates(
+            source,
+            ((self.structurer._generate_doc_id(source, i), chunk.text, (i, chunk, offsets))
+             for i, (chunk, offsets) in enumerate(chunks)),
+            accepted
+        )
+        structured_docs = self._structure_stream(source, indexed_chunks)
+
+        self._ensure_index()
+        indexed = 0
+        stats = BulkStats()
+        try:
+            for written in self.bulk_writer.iter_write(structured_docs, self.bedrock_embedder.embed_texts, stats):
+                self._commit_dedup(written)
+                indexed = indexed + len(written)
+                self.search_cache.invalidate() # 배치가 들어갈 때마다 이전 검색 결과는 무효
+                print(f"   {indexed}개 청크 인덱싱 완료")
+                yield self._to_result_list(written)
+        finally:
+            self._release_dedup(accepted)
+        self._save_dedup()
+        self._raise_for_failures(stats)
+
+    def _structure_stream(self, source: str, indexed_chunks) -> Iterator[Document]:
+        # (chunk_index, 청크, 페이지 offset)을 bulk 배치 크기로 묶어 배치 ingest와 같은 structure_documents로 구조화
+        # (tfidf의 idf는 문서 전체가 아니라 마이크로 배치 기준)
+        is_pdf = source.endswith(".pdf")
+        for batch in batched(indexed_chunks, self.bulk_writer.max_docs):
+            yield from self.structurer.structure_documents(
+                [chunk.text for _, chunk, _ in batch],
                 source_url=source,
                 source_type="pdf" if is_pdf else "web",
-                chunk_index=i,
-                metadata={}
+                chunk_indexes=[i for i, _, _ in batch],
+                metadatas=[span_metadata(chunk, offsets) for _, chunk, offsets in batch]
             )
-            structured_docs.append(opensearch_doc)
-            i = i + 1
 
-        self.vector_store.add_documents(structured_docs)
+    def _skip_near_duplicates(self, source: str, items, accepted: Optional[List[str]] = None):
+        # (doc_id, 청크, 값) 중 근사 중복이 아닌 청크의 값만 (dedup이 꺼져 있으면 전부)
+        # 통과한 청크의 signature는 pending: 적재 후 _commit_dedup, 끝나면 _release_dedup으로 나머지 제거
+        if self.dedup is None:
+            return (value for _, _, value in items)
+        return self.dedup.filter(source, items, accepted)
+
+    def _commit_dedup(self, docs: Iterable[Document], stats: Optional[BulkStats] = None):
+        # 인덱스에 들어간 청크의 signature만 근사 중복 인덱스에 남긴다
+        if self.dedup is None:
+            return
+        failed = set(stats.failed_ids) if stats is not None else set()
+        self.dedup.commit(d.metadata["id"] for d in docs if d.metadata["id"] not in failed)
+
+    def _release_dedup(self, accepted: List[str]):
+        # 적재에 실패했거나 중간에 멈춰서 commit되지 않은 signature 제거 (다음 적재 때 중복으로 걸러지지 않게)
+        if self.dedup is not None:
+            self.dedup.rollback(accepted)
+
+    def _save_dedup(self):
+        if self.dedup is not None:
+            self.dedup.save()
+            print(f"   근사 중복 인덱스: {self.dedup.summary()}")
+
+    def _index_documents(self, structured_docs: List[Document]) -> BulkStats:
+        # 실패해도 바로 raise하지 않는다: 호출 쪽에서 실패한 doc_id를 매니페스트 / 근사 중복 인덱스에서 뺀 뒤
+        # _raise_for_failures로 raise
+        self._ensure_index()
+        return self.bulk_writer.write(structured_docs, self.bedrock_embedder.embed_texts, raise_on_error=False)
+
+    @staticmethod
+    def _raise_for_failures(stats: BulkStats):
+        if stats.failed:
+            raise BulkWriteError(stats)
+
+    def _ensure_index(self):
+        if not self.vector_store.index_exists():
+            self.vector_store.create_index(dimension=1024, index_name=self.index_name)
+
+    def _load_chunks(self, source: str, chunker: str, chunk_size: int, chunk_overlap: int,
+                     chunk_unit: str = "chars") -> Tuple[List[Chunk], PageOffsets]:
+        # Loader로 로드하고 Cleaning (페이지를 합칠 때 페이지 경계 offset도 같이 받아둔다)
+        merged_content, pages = load_text_pages(source, pdf_workers=self.pdf_workers)
 
+        # Chunker로 청크
+        return self.chunk_spans(merged_content, chunker, chunk_size, chunk_overlap, chunk_unit), pages
+
+    def _delete_doc_ids(self, doc_ids: List[str]):
+        if self.dedup is not None:
+            self.dedup.remove(doc_ids)
+        # AOSS는 _id를 지정할 수 없으므로 metadata.id로 실제 _id를 찾아서 삭제
+        client = self.vector_store.client
+        B = 1000
+        i = 0
+        while i < len(doc_ids):
+            batch_ids = doc_ids[i:i+B]
+            # 같은 metadata.id로 여러 번 적재된 문서도 있으므로 hit 수는 batch 크기보다 클 수 있다
+            # -> _id 정렬 + search_after로 남은 hit이 없을 때까지 페이지를 넘기며 삭제 (AOSS는 scroll / delete_by_query 미지원)
+            cursor = None
+            while True:
+                body = {
+                    "size": B,
+                    "query": {"terms": {"metadata.id.keyword": batch_ids}},
+                    "sort": [{"_id": "asc"}],
+                    "_source": False,
+                }
+                if cursor is not None:
+                    body["search_after"] = cursor
+                resp = client.search(index=self.index_name, body=body)
+                hits = resp.get("hits", {}).get("hits", [])
+                if hits:
+                    self.vector_store.delete(ids=[h["_id"] for h in hits], refresh_indices=False)
+                if len(hits) < B:
+                    break
+                cursor = hits[-1]["sort"]
+            i = i + B
+
+    def _iter_cleaned(self, source: str, header_window: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        return iter_cleaned(source, pdf_workers=self.pdf_workers, header_window=header_window)
+
+    def _clean_web(self, web: WebLoadResult) -> Dict[str, Any]:
+        return clean_web(web)
+
+    def chunk_spans(self, text: str, chunker: str, chunk_size: int, chunk_overlap: int,
+                    chunk_unit: str = "chars") -> List[Chunk]:
+        # semantic 청커는 파이프라인의 embedder를 사용 (IngestJobQueue도 이 메서드로 청크)
+        return chunk_spans(text, chunker, chunk_size, chunk_overlap, embedder=self.bedrock_embedder, unit=chunk_unit)
+
+    def _to_result_list(self, structured_docs: List[Document]) -> List[Dict[str, Any]]:
         result_list = []
         for doc in structured_docs:
             content = doc.page_content
@@ -129,115 +415,164 @@ class Pipeline:
                 "metadata": doc.metadata,
             })
         return result_list
-        
 
-        
+    def search(self, query: str, k: int, fusion: str = "weighted",
+               text_weight: float = 0.5, vector_weight: float = 0.5) -> List[Dict[str, Any]]:
+        # (정규화 질의, k, 결합 방식, 가중치, 인덱스 세대)가 같으면 캐시된 결과 반환
+        started = time.perf_counter()
+        key = self.search_cache.result_key(query, k, fusion, text_weight, vector_weight)
+        cached = self.search_cache.get_results(key)
+        if cached is not None:
+            self.last_search_timings = {"cache": time.perf_counter() - started}
+            return cached
+
+        results = self.hybrid_search(query=query, k=k, text_weight=text_weight,
+                                     vector_weight=vector_weight, fusion=fusion)
+        self.search_cache.set_results(key, results)
+        return results
+
+    def hybrid_search(self, query, k=10, text_weight=0.5, vector_weight=0.5, fusion="weighted"):
+        # fusion: weighted(정규화 가중합) / rrf(Reciprocal Rank Fusion) / server(OpenSearch hybrid 쿼리 1회)
+        started = time.perf_counter()
+        if (fusion == "server" and self._server_hybrid_available is not False
+                and time.monotonic() >= self._server_hybrid_retry_at):
+            try:
+                results = self._server_hybrid_search(query, k, text_weight, vector_weight)
+                self._server_hybrid_available = True
+                self.last_search_timings = {"server": time.perf_counter() - started}
+                return results
+            except Exception as e:
+                if is_server_hybrid_unsupported(e):
+                    # AOSS 등 search pipeline을 못 쓰는 환경이면 이후로는 client 쪽 fusion 사용
+                    print(f"server hybrid 검색 미지원, 이후 weighted로 대체: {e}")
+                    self._server_hybrid_available = False
+                else:
+                    # 일시적인 오류는 잠시 weighted로 대체했다가 다시 시도
+                    print(f"server hybrid 검색 실패, {self.SERVER_HYBRID_RETRY_S:.0f}s 동안 weighted로 대체: {e}")
+                    self._server_hybrid_retry_at = time.monotonic() + self.SERVER_HYBRID_RETRY_S
+
+        # k-NN / BM25 두 쿼리를 동시에 보내서 지연이 max(knn, bm25) 정도가 되게
+        vec_future = self._search_executor.submit(self._timed, self._knn_search, query, k)
+        text_future = self._search_executor.submit(self._timed, self._text_search, query, k)
+        vec_results, knn_time = vec_future.result()
+        text_results, bm25_time = text_future.result()
+
+        if fusion == "rrf":
+            results = rrf_fusion(vec_results, text_results, k)
+        else:
+            results = weighted_sum_fusion(vec_results, text_results, k, vector_weight, text_weight)
 
-    def search(self, query: str, k: int) -> List[Dict[str, Any]]:
-        return self.hybrid_search(query=query, k=k)
+        self.last_search_timings = {"knn": knn_time, "bm25": bm25_time, "total": time.perf_counter() - started}
+        return results
 
-    def hybrid_search(self, query, k=10, text_weight=0.5, vector_weight=0.5):
-        vec_results = self.vector_store.similarity_search_with_score(query, k=k)
+    def _knn_search(self, query: str, k: int):
+        return self.vector_store.similarity_search_with_score_by_vector(self._embed_query(query), k=k)
 
+    def _embed_query(self, query: str) -> List[float]:
+        # 같은 질의는 Bedrock 호출 없이 메모리에서 바로
+        vector = self.search_cache.get_vector(query)
+        if vector is None:
+            vector = self.embeddings.embed_query(query)
+            self.search_cache.set_vector(query, vector)
+        return vector
+
+    def _text_search(self, query: str, k: int):
         text_results = []
         client = getattr(self.vector_store, "client", None)
-        if client is not None:
-            body = {
-                "query": {
-                    "multi_match": {
-                        "query": query,
-                        "fields": ["text^2", "metadata.title^3", "metadata.keywords^4", "metadata.summary^2"],
-                        "type": "best_fields",
-                        "fuzziness": "AUTO",
-                    }
-                },
-                "size": k,
-                "_source": True,
-            }
-            resp = client.search(index=self.index_name, body=body)
-            hits = resp.get("hits", {}).get("hits", [])
-            for h in hits:
-                src = h.get("_source", {})
-                page = src.get("text", "")
-                meta = src.get("metadata", {}) or {}
-                text_results.append((Document(page_content=page, metadata=meta), float(h.get("_score", 0.0))))
-
-        # 정규화 및 결합
-        def normalize(scores: List[float]) -> List[float]:
-            if not scores:
-                return []
-            m = max(scores) or 1.0
-            return [s / m for s in scores]
-
-        vec_scores = normalize([s for _, s in vec_results])
-        txt_scores = normalize([s for _, s in text_results])
-
-        combined = {}
-
-        for (doc, s), ns in zip(vec_results, vec_scores):
-            key = str(doc.metadata.get("id") or hash(doc.page_content))
-            combined[key] = {"doc": doc, "v": ns, "t": 0.0}
-
-        for (doc, s), ns in zip(text_results, txt_scores):
-            key = str(doc.metadata.get("id") or hash(doc.page_content))
-            if key in combined:
-                combined[key]["t"] = ns
-            else:
-                combined[key] = {"doc": doc, "v": 0.0, "t": ns}
+        if client is None:
+            return text_results
 
-        items = []
-        for key, entry in combined.items():
-            score = vector_weight * entry["v"] + text_weight * entry["t"]
-            d = entry["doc"]
-            items.append((score, d))
+        body = {
+            "query": self._text_query(query),
+            "size": k,
+            "_source": True,
+        }
+        resp = client.search(index=self.index_name, body=body)
+        hits = resp.get("hits", {}).get("hits", [])
+        for h in hits:
+            src = h.get("_source", {})
+            page = src.get("text", "")
+            meta = src.get("metadata", {}) or {}
+            text_results.append((Document(page_content=page, metadata=meta), float(h.get("_score", 0.0))))
+        return text_results
 
-        items.sort(key=lambda x: x[0], reverse=True)
-        items = items[:k]
+    def _text_query(self, query: str) -> Dict[str, Any]:
+        return {
+            "multi_match": {
+                "query": query,
+                "fields": ["text^2", "metadata.title^3", "metadata.keywords^4", "metadata.summary^2"],
+                "type": "best_fields",
+                "fuzziness": "AUTO",
+            }
+        }
 
-        result_list = []
-        for s, d in items:
-            result_list.append({
-                "score": s,
-                "page_content": d.page_content,
-                "metadata": d.metadata,
-            })
-        return result_list
-    
-    def reset_index(self):
-        # https://python.langchain.com/api_reference/community/vectorstores/langchain_community.vectorstores.opensearch_vector_search.OpenSearchVectorSearch.html
-        client = self.vector_store.client
-        idx = self.index_name
-        if not self.vector_store.index_exists():
-            return False
+    def _server_hybrid_search(self, query: str, k: int, text_weight: float, vector_weight: float):
+        # OpenSearch neural-search의 hybrid 쿼리 + normalization search pipeline (왕복 1회)
+        pipeline_name = f"hybrid_{int(text_weight * 100)}_{int(vector_weight * 100)}"
+        if pipeline_name not in self._search_pipelines:
+            if not self.vector_store.search_pipeline_exists(pipeline_name):
+                self.vector_store.configure_search_pipelines(
+                    pipeline_name, keyword_weight=text_weight, vector_weight=vector_weight
+                )
+            self._search_pipelines.add(pipeline_name)
 
-        ids = []
-        cursor = None
-        size = 1000
-        while True:
-            body = {
-                "size": size,
-                "query": {"match_all": {}},
-                "sort": [{"_id": "asc"}],
-                "_source": False,
-            }
-            if cursor is not None:
-                body["search_after"] = cursor
+        query_vector = self._embed_query(query)
+        body = {
+            "size": k,
+            "_source": {"excludes": ["vector_field"]},
+            "query": {
+                "hybrid": {
+                    "queries": [
+                        self._text_query(query), # 순서가 pipeline weights 순서(keyword, vector)와 같아야 함
+                        {"knn": {"vector_field": {"vector": query_vector, "k": k}}},
+                    ]
+                }
+            },
+        }
+        resp = self.vector_store.client.transport.perform_request(
+            "GET", f"/{self.index_name}/_search", params={"search_pipeline": pipeline_name}, body=body
+        )
+        hits = resp.get("hits", {}).get("hits", [])
+        items = []
+        for h in hits:
+            src = h.get("_source", {})
+            doc = Document(page_content=src.get("text", ""), metadata=src.get("metadata", {}) or {})
+            items.append((float(h.get("_score", 0.0)), doc))
+        return to_result_list(items, k)
 
-            resp = client.search(index=idx, body=body)
-            hits = resp.get("hits", {}).get("hits", [])
-            if not hits:
-                break
+    @staticmethod
+    def _timed(fn, *args):
+        started = time.perf_counter()
+        result = fn(*args)
+        return result, time.perf_counter() - started
 
-            for h in hits:
-                ids.append(h["_id"])
-            cursor = hits[-1]["sort"]
+    def reset_index(self, strategy: str = "auto", on_progress=None):
+        # 인덱스 재생성(같은 mapping) -> delete_by_query -> search_after 스트리밍 삭제 순서로 시도
+        def print_progress(deleted, total):
+            print(f"   인덱스 초기화 진행: {deleted}/{total}")
 
-        B = 1000
-        i = 0
-        while i < len(ids):
-            batch_ids = ids[i:i+B]
-            self.vector_store.delete(ids=batch_ids, refresh_indices=False)
-            i = i + B
+        resetter = IndexResetter(
+            client=self.vector_store.client,
+            index_name=self.index_name,
+            is_aoss=True,
+            on_progress=on_progress or print_progress,
+        )
+        report = resetter.reset(strategy=strategy)
+        self.last_reset_report = report
+        self.search_cache.invalidate()
+        if report is None:
+            return False
+
+        # 인덱스가 비었으니 증분 매니페스트 / 근사 중복 인덱스도 초기화
+        self.manifest.clear()
+        self.manifest.save()
+        if self.dedup is not None:
+            self.dedup.clear()
+            self.dedup.save()
+        if self.crawler.state is not None:
+            # ETag가 남아 있으면 다시 크롤링해도 304로 건너뛰게 되므로 같이 초기화
+            self.crawler.state.clear()
+            self.crawler.state.save()
         return True
 
 
@@ -246,12 +581,47 @@ def get_pipeline() -> Optional[Pipeline]:
     opensearch_endpoint = os.getenv("OPENSEARCH_ENDPOINT")
     index_name = os.getenv("OPENSEARCH_INDEX_NAME")
     
+    model_id = os.getenv("BEDROCK_EMBEDDING_MODEL_ID")
+    
     embeddings = BedrockEmbeddings(
-        model_id=os.getenv("BEDROCK_EMBEDDING_MODEL_ID"),
+        model_id=model_id,
         region_name=os.getenv("AWS_REGION")
     )
 
+    # 임베딩 캐시 (재적재 시 같은 청크는 다시 임베딩하지 않음)
+    embedding_cache = EmbeddingCache(
+        path=os.getenv("EMBEDDING_CACHE_PATH", ".cache/embeddings.sqlite"),
+        max_entries=int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "50000")),
+    )
+    embeddings = CachedEmbeddings(embeddings, embedding_cache, model_id)
+
+    # 근사 중복 청크 제거 (반복되는 메뉴/면책 문구 등은 한 번만 임베딩/적재)
+    dedup = None
+    if os.getenv("DEDUP_ENABLED", "false").lower() == "true":
+        dedup = NearDuplicateIndex(
+            path=os.getenv("DEDUP_INDEX_PATH", ".cache/dedup_index.json"),
+            threshold=float(os.getenv("DEDUP_THRESHOLD", "0.7")),
+        )
+
     return Pipeline(
         embeddings=embeddings,
-        index_name=index_name
+        index_name=index_name,
+        embedding_cache=embedding_cache,
+        pdf_workers=int(os.getenv("PDF_EXTRACT_WORKERS", "1")),
+        manifest=IngestManifest(os.getenv("INGEST_MANIFEST_PATH", ".cache/ingest_manifest.json")),
+        search_cache=SearchCache(
+            result_maxsize=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "512")),
+            result_ttl=float(os.getenv("SEARCH_CACHE_TTL", "300")),
+        ),
+        crawler=WebCrawler(
+            max_workers=int(os.getenv("CRAWL_MAX_WORKERS", "8")),
+            per_host=int(os.getenv("CRAWL_PER_HOST", "2")),
+            delay=float(os.getenv("CRAWL_DELAY", "0.5")),
+            state=CrawlState(os.getenv("CRAWL_STATE_PATH", ".cache/crawl_state.json")),
+        ),
+        structurer=DocumentStructurer(
+            keyword_mode=os.getenv("KEYWORD_MODE", "tf"),
+            workers=int(os.getenv("STRUCTURE_WORKERS", "1")),
+        ),
+        dedup=dedup
     )
\ No newline at end of file
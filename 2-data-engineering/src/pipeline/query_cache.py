@@ -0,0 +1,106 @@
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+_MISSING = object()
+
+def normalize_query(query: str) -> str:
+    # 대소문자/공백/전각 문자 차이만 나는 질의는 같은 질의로 취급
+    return " ".join(unicodedata.normalize("NFKC", query).lower().split())
+
+
+class TTLCache: # 크기 제한(LRU) + TTL 인메모리 캐시
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict() # key -> (만료 시각, 값)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING and entry[0] <= self.clock():
+                del self._data[key]
+                self.expired += 1
+                entry = _MISSING
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = (self.clock() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        if total == 0:
+            return 0.0
+        return self.hits / total
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "entries": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expired": self.expired,
+            "hit_rate": self.hit_rate,
+        }
+
+
+class SearchCache: # 질의 -> 질의 벡터, (정규화 질의, k, 결합 방식, 인덱스 세대) -> 검색 결과 2단계 캐시
+    def __init__(self, vector_maxsize: int = 2048, vector_ttl: float = 3600.0,
+                 result_maxsize: int = 512, result_ttl: float = 300.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.query_vectors = TTLCache(vector_maxsize, vector_ttl, clock)
+        self.results = TTLCache(result_maxsize, result_ttl, clock)
+        self.generation = 0 # 인덱스가 바뀔 때마다 증가
+
+    def get_vector(self, query: str) -> Optional[List[float]]:
+        return self.query_vectors.get(query)
+
+    def set_vector(self, query: str, vector: List[float]):
+        self.query_vectors.set(query, vector)
+
+    def result_key(self, query: str, k: int, fusion: str, text_weight: float, vector_weight: float) -> tuple:
+        return (normalize_query(query), k, fusion, text_weight, vector_weight, self.generation)
+
+    def get_results(self, key: tuple) -> Optional[List[Dict[str, Any]]]:
+        return self.results.get(key)
+
+    def set_results(self, key: tuple, results: List[Dict[str, Any]]):
+        self.results.set(key, results)
+
+    def invalidate(self):
+        # 질의 벡터는 인덱스와 무관하므로 결과만 버린다
+        self.generation += 1
+        self.results.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "generation": self.generation,
+            "query_vectors": self.query_vectors.stats(),
+            "results": self.results.stats(),
+        }
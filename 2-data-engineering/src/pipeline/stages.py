@@ -0,0 +1,117 @@
+# Pipeline의 load / clean / chunk 단계 (프로세스 풀에서도 돌 수 있게 모듈 함수로 분리)
+from bisect import bisect_right
+from operator import itemgetter
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from ..loader.pdf_loader import iter_pdf_pages
+from ..loader.webbase_loader import load_web, WebLoadResult
+from ..chunker.semantic_chunker import semantic_chunk
+from ..chunker.fixed_chunker import fixed_chunk, iter_fixed_chunks
+from ..chunker.recursive_chunker import recursive_chunk, iter_recursive_chunks
+from ..chunker.spans import Chunk, align_chunks
+from ..cleaning.fast_normalize import drop_short_lines_fast, normalize_web_text_fast, normalize_whitespace_fast
+from ..cleaning.header_footer import HeaderFooterDetector, strip_headers_footers_stream
+from ..cleaning.table_to_markdown import inline_pdf_tables
+
+def iter_cleaned(source: str, pdf_workers: int = 1, detector: Optional[HeaderFooterDetector] = None,
+                 header_window: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    if source.endswith(".pdf"):
+        # 머리글/바닥글은 문서 전체를 한 번 훑은 뒤에 판정하므로 첫 페이지는 추출이 끝난 뒤에 나온다
+        # (페이지는 임시 파일에 spool 되므로 메모리는 페이지 수와 상관없이 일정)
+        # header_window를 주면 앞쪽 header_window 페이지로만 판정하고 나머지는 추출되는 대로 내보낸다 (스트리밍용)
+        detector = detector or HeaderFooterDetector()
+        pages = (
+            (p.page, p.meta["total_pages"], p.meta["source"], normalize_whitespace_fast(p.content))
+            for p in iter_pdf_pages(source, workers=pdf_workers)
+        )
+        for (page_number, total_pages, page_source, _), text in strip_headers_footers_stream(pages, itemgetter(3), detector, window=header_window):
+            # 표로 판정된 줄은 그 자리에서 markdown 표로 바꾼다 (원문 줄 + 표를 두 번 임베딩하지 않게)
+            plain, _ = inline_pdf_tables(drop_short_lines_fast(text))
+            yield {
+                "page_content": plain,
+                "metadata": {
+                    "source": page_source,
+                    "page_number": page_number,
+                    "total_pages": total_pages,
+                }
+            }
+        print(f"   머리글/바닥글 제거: {detector.summary()}")
+    else:
+        yield clean_web(load_web(source))
+
+def clean_web(web: WebLoadResult) -> Dict[str, Any]:
+    # load_web에서 한 번 파싱한 결과 사용 (표 셀 텍스트도 text_plain에 이미 들어 있으므로 web.tables는 다시 붙이지 않음)
+    plain = normalize_web_text_fast(web.text_plain)
+    meta_data = {"source": web.url, "title": web.title}
+    for key in web.meta:
+        meta_data[key] = web.meta[key]
+    return {
+        "page_content": plain,
+        "metadata": meta_data
+    }
+
+PageOffsets = List[Tuple[int, int]] # (합친 텍스트에서 페이지가 시작하는 offset, page_number)
+
+def load_text(source: str, pdf_workers: int = 1) -> str:
+    return load_text_pages(source, pdf_workers)[0]
+
+def load_text_pages(source: str, pdf_workers: int = 1) -> Tuple[str, PageOffsets]:
+    # load_text와 같은 텍스트 + 페이지 경계 (page_number가 없는 웹 문서는 빈 목록)
+    content_list = []
+    pages: PageOffsets = []
+    offset = 0
+    for c in iter_cleaned(source, pdf_workers):
+        if content_list:
+            offset += 2 # "\n\n"
+        page_number = c["metadata"].get("page_number")
+        if page_number is not None:
+            pages.append((offset, page_number))
+        content_list.append(c["page_content"])
+        offset += len(c["page_content"])
+    return "\n\n".join(content_list), pages
+
+def chunk_text(text: str, chunker: str, chunk_size: int, chunk_overlap: int, embedder=None,
+               unit: str = "chars") -> List[str]:
+    # unit="tokens"면 recursive/semantic은 chunk_size를 토큰 예산으로 사용 (fixed는 항상 글자 수)
+    if chunker == "semantic":
+        return semantic_chunk(
+            text=text,
+            target_chars=chunk_size,
+            embedder=embedder,
+            max_tokens=chunk_size if unit == "tokens" else None
+        )
+    elif chunker == "fixed":
+        return fixed_chunk(text, max_chars=chunk_size, overlap=chunk_overlap)
+    elif chunker == "recursive":
+        return recursive_chunk(text, chunk_size=chunk_size, unit=unit)
+    else:
+        return [text]
+
+def chunk_spans(text: str, chunker: str, chunk_size: int, chunk_overlap: int, embedder=None,
+                unit: str = "chars") -> List[Chunk]:
+    # chunk_text와 같은 청크 + 원문(merged_content) 기준 offset
+    if chunker == "semantic":
+        return align_chunks(text, chunk_text(text, chunker, chunk_size, chunk_overlap, embedder, unit))
+    elif chunker == "fixed":
+        return list(iter_fixed_chunks(text, max_chars=chunk_size, overlap=chunk_overlap))
+    elif chunker == "recursive":
+        return list(iter_recursive_chunks(text, chunk_size=chunk_size, unit=unit))
+    else:
+        return [Chunk(text=text, start=0, end=len(text))]
+
+def page_range(pages: PageOffsets, start: int, end: int) -> Optional[Tuple[int, int]]:
+    # [start, end) 구간이 걸치는 첫 페이지 / 마지막 페이지 번호
+    if not pages or start < 0:
+        return None
+    starts = [offset for offset, _ in pages]
+    first = bisect_right(starts, start) - 1
+    last = bisect_right(starts, max(start, end - 1)) - 1
+    return pages[max(first, 0)][1], pages[max(last, 0)][1]
+
+def span_metadata(chunk: Chunk, pages: Optional[PageOffsets] = None) -> Dict[str, Any]:
+    if chunk.start < 0:
+        return {}
+    meta: Dict[str, Any] = {"char_start": chunk.start, "char_end": chunk.end}
+    page = page_range(pages or [], chunk.start, chunk.end)
+    if page is not None:
+        meta["page_start"], meta["page_end"] = page
+    return meta
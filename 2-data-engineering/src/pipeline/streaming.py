@@ -0,0 +1,61 @@
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, TypeVar
+from ..chunker.spans import Chunk
+
+T = TypeVar("T")
+PageOffsets = List[Tuple[int, int]] # (합친 텍스트에서 페이지가 시작하는 offset, page_number)
+
+def stream_chunk_spans(pages: Iterable[Tuple[str, Optional[int]]], chunk_fn: Callable[[str], List[Chunk]],
+                       max_carry: int) -> Iterator[Tuple[Chunk, PageOffsets]]:
+    # (페이지 텍스트, page_number)를 받아 (청크, 청크 근처 페이지 offset)을 yield
+    # offset은 load_text_pages처럼 페이지를 "\n\n"으로 합친 텍스트 기준 (배치 ingest와 같은 char_start/page 메타데이터)
+    # 페이지 경계를 넘어 청크를 이어붙이기 위해, 마지막 청크 구간은 다음 페이지와 합쳐서 다시 청크
+    # 마지막 청크가 max_carry자를 넘으면(청커가 버퍼를 통째로 돌려주는 경우 등) 더 키우지 않고 내보낸다
+    carry = "" # 합친 텍스트의 [carry_start, 현재 끝) 구간
+    carry_start = 0
+    offsets: PageOffsets = [] # carry에 걸친 페이지만
+    first = True
+    for text, page_number in pages:
+        if not first:
+            carry += "\n\n"
+        first = False
+        page_start = carry_start + len(carry)
+        if page_number is not None:
+            offsets.append((page_start, page_number))
+        carry += text
+        if not text.strip():
+            continue
+
+        chunks = chunk_fn(carry)
+        if not chunks:
+            carry_start, carry = carry_start + len(carry), ""
+            offsets = offsets[-1:]
+            continue
+
+        last = chunks[-1]
+        flush_all = last.start < 0 or len(carry) - last.start > max_carry
+        for chunk in chunks if flush_all else chunks[:-1]:
+            yield _shift(chunk, carry_start), offsets
+
+        cut = len(carry) if flush_all else last.start
+        carry_start, carry = carry_start + cut, carry[cut:]
+        # carry 시작 전에 시작한 페이지는 carry가 걸친 첫 페이지 하나만 남긴다
+        keep = max(0, sum(1 for offset, _ in offsets if offset <= carry_start) - 1)
+        offsets = offsets[keep:]
+
+    if carry.strip():
+        for chunk in chunk_fn(carry):
+            yield _shift(chunk, carry_start), offsets
+
+def _shift(chunk: Chunk, offset: int) -> Chunk:
+    if chunk.start < 0:
+        return chunk
+    return Chunk(text=chunk.text, start=chunk.start + offset, end=chunk.end + offset)
+
+def batched(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    it = iter(items)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
@@ -1,47 +1,156 @@
 import hashlib
+import multiprocessing
 import re
+import threading
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import chain
+from typing import Any, Dict, List, Optional
+import numpy as np
 from langchain_core.documents import Document
 
+WORD_RE = re.compile(r'[가-힣a-zA-Z0-9]{2,}') # 한글, 영어, 숫자 (한 글자 단어는 키워드에서 제외)
+STOPWORDS = frozenset({'의', '가', '이', '을', '를', '에', '와', '과', '으로', '로', 'and', 'or', 'the', 'a', 'an', 'in', 'on', 'at', 'to', 'for'}) # 불용어
+
+def term_counts(text: str) -> Counter:
+    # 세는 건 C 구현(Counter(list))에 맡기고, 불용어는 센 다음에 있는 것만 지운다
+    counts = Counter(WORD_RE.findall(text.lower()))
+    for w in STOPWORDS.intersection(counts):
+        del counts[w]
+    return counts
+
+def top_terms(counts: Counter, max_keywords: int = 10) -> List[str]:
+    # 빈도수 내림차순 (같은 빈도는 먼저 나온 단어 순서)
+    # 청크 하나의 어휘는 수백 개 수준이라 heap(most_common(n))보다 전체 정렬 후 자르는 쪽이 빠르다
+    return [w for w, _ in counts.most_common()[:max_keywords]]
+
+def extract_keywords(text: str, max_keywords: int = 10) -> List[str]:
+    return top_terms(term_counts(text), max_keywords)
+
+def batch_term_counts(texts: List[str], workers: int = 1, pool: Optional[Executor] = None) -> List[Counter]:
+    # pool: 재사용할 프로세스 풀 (없으면 이번 호출에서만 쓰는 spawn 풀)
+    if workers <= 1 or len(texts) < 1000:
+        return [term_counts(t) for t in texts]
+    chunksize = max(1, len(texts) // (workers * 8))
+    if pool is not None:
+        return list(pool.map(term_counts, texts, chunksize=chunksize))
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return list(pool.map(term_counts, texts, chunksize=chunksize))
+
+def tfidf_keywords(counts: List[Counter], max_keywords: int = 10,
+                   corpus: Optional[List[Counter]] = None) -> List[List[str]]:
+    # corpus(없으면 counts 자신)로 idf를 계산해서 counts 문서마다 tf * idf 상위 단어. 단어 id / 점수 배열을 한 번에 만들고
+    # 문서별로 점수 내림차순 정렬해서 문서마다 앞의 max_keywords개만 고른다
+    corpus = counts if corpus is None else corpus
+    vocab: Dict[str, int] = {w: i for i, w in enumerate(dict.fromkeys(chain.from_iterable(chain(counts, corpus))))}
+    if not vocab:
+        return [[] for _ in counts]
+    lengths = np.fromiter(map(len, counts), dtype=np.int64, count=len(counts))
+    total = int(lengths.sum())
+    indices_arr = np.fromiter(map(vocab.__getitem__, chain.from_iterable(counts)), dtype=np.int64, count=total)
+    if total == 0:
+        return [[] for _ in counts]
+    tf = np.fromiter(chain.from_iterable(c.values() for c in counts), dtype=np.float64, count=total)
+    if corpus is counts:
+        corpus_indices = indices_arr
+    else:
+        corpus_indices = np.fromiter(map(vocab.__getitem__, chain.from_iterable(corpus)), dtype=np.int64)
+    df = np.bincount(corpus_indices, minlength=len(vocab))
+    idf = np.log((1 + len(corpus)) / (1 + df)) + 1 # smooth idf
+    scores = tf * idf[indices_arr]
+
+    rows = np.repeat(np.arange(len(counts)), lengths)
+    # (문서, -점수) 정렬을 float 키 하나로: 점수를 (0, 1) 구간으로 줄여 문서 번호에서 뺀다 (lexsort보다 10배 빠름)
+    # stable 정렬이라 같은 점수는 원래(등장) 순서 유지
+    order = np.argsort(rows - scores / (scores.max() * 1.001), kind="stable")
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    rank = np.arange(len(order)) - starts[rows[order]]
+    picked = order[rank < max_keywords]
+
+    words = list(vocab)
+    result: List[List[str]] = [[] for _ in counts]
+    for row, idx in zip(rows[picked].tolist(), indices_arr[picked].tolist()):
+        result[row].append(words[idx])
+    return result
+
 
 class DocumentStructurer:
+    def __init__(self, keyword_mode: str = "tf", workers: int = 1, max_keywords: int = 10):
+        self.keyword_mode = keyword_mode # "tf"(청크 안 빈도) / "tfidf"(같은 source의 청크 전체 기준)
+        self.workers = workers # structure_documents에서 키워드 추출에 쓸 프로세스 수
+        self.max_keywords = max_keywords
+        self._pool: Optional[ProcessPoolExecutor] = None # 처음 필요할 때 만들어서 계속 재사용
+        self._pool_lock = threading.Lock()
+
     def _generate_doc_id(self, source_url, chunk_index=0):
         content = source_url + "#" + str(chunk_index)
         return hashlib.md5(content.encode()).hexdigest()
 
+    def _generate_content_doc_id(self, source_url, content_hash, occurrence=0):
+        # 위치가 아닌 내용 기준 id (같은 내용이 여러 번 나오면 occurrence로 구분)
+        content = source_url + "#" + content_hash + "#" + str(occurrence)
+        return hashlib.md5(content.encode()).hexdigest()
+
     def _extract_keywords(self, text, max_keywords=10):
-        words = re.findall(r'[가-힣a-zA-Z0-9]+', text.lower()) # 한글, 영어, 숫자 추출
-        
-        stopwords = {'의', '가', '이', '을', '를', '에', '와', '과', '으로', '로', 'and', 'or', 'the', 'a', 'an', 'in', 'on', 'at', 'to', 'for'} # 불용어
-        
-        filtered_words = []
-        for w in words:
-            if w not in stopwords and len(w) > 1:
-                filtered_words.append(w)
-        
-        word_freq = {} # 단어 빈도수
-        for word in filtered_words:
-            if word in word_freq:
-                word_freq[word] = word_freq[word] + 1
-            else:
-                word_freq[word] = 1
-        
-        sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True) # 빈도수 내림차순 정렬
-        result = []
-        for word, freq in sorted_words[:max_keywords]:
-            result.append(word)
-        return result
-
-    def structure_document(self, content, source_url, source_type, chunk_index, metadata=None):
+        return extract_keywords(text, max_keywords)
+
+    def _term_counts(self, texts: List[str]) -> List[Counter]:
+        if self.workers <= 1 or len(texts) < 1000:
+            return batch_term_counts(texts)
+        with self._pool_lock:
+            if self._pool is None:
+                # Streamlit처럼 스레드가 많은 프로세스에서 fork는 위험하므로 spawn (호출마다 새로 띄우지 않게 재사용)
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+        return batch_term_counts(texts, self.workers, self._pool)
+
+    def close(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+    def structure_document(self, content, source_url, source_type, chunk_index, metadata=None, doc_id=None):
+        return self._build(content, source_url, source_type, chunk_index, metadata, doc_id,
+                           self._extract_keywords(content, self.max_keywords))
+
+    def structure_documents(self, contents: List[str], source_url: str, source_type: str,
+                            chunk_indexes: Optional[List[int]] = None,
+                            metadatas: Optional[List[Optional[Dict[str, Any]]]] = None,
+                            doc_ids: Optional[List[Optional[str]]] = None,
+                            corpus: Optional[List[str]] = None) -> List[Document]:
+        # 같은 source의 청크 여러 개를 한 번에 구조화 (키워드 추출을 배치로)
+        # corpus: tfidf의 idf를 계산할 같은 source의 현재 청크 전체 (증분 ingest에서 바뀐 청크만 넘길 때, 없으면 contents)
+        n = len(contents)
+        chunk_indexes = chunk_indexes if chunk_indexes is not None else list(range(n))
+        metadatas = metadatas if metadatas is not None else [None] * n
+        doc_ids = doc_ids if doc_ids is not None else [None] * n
+
+        if self.keyword_mode == "tfidf":
+            counts = self._term_counts(contents)
+            keywords = tfidf_keywords(counts, self.max_keywords,
+                                      self._term_counts(corpus) if corpus is not None else None)
+        elif self.workers > 1:
+            keywords = [top_terms(c, self.max_keywords) for c in self._term_counts(contents)]
+        else:
+            # 빈도표를 모아둘 필요가 없으므로 청크마다 바로 키워드만 남긴다
+            keywords = [extract_keywords(t, self.max_keywords) for t in contents]
+
+        return [
+            self._build(contents[i], source_url, source_type, chunk_indexes[i], metadatas[i], doc_ids[i], keywords[i])
+            for i in range(n)
+        ]
+
+    def _build(self, content, source_url, source_type, chunk_index, metadata, doc_id, keywords) -> Document:
         meta = {} # 메타데이터
         if metadata is not None:
             meta = metadata.copy()
-        else:
-            meta = {}
-        
-        meta["id"] = self._generate_doc_id(source_url, chunk_index)
+
+        meta["id"] = doc_id or self._generate_doc_id(source_url, chunk_index)
         meta["source_type"] = source_type
         meta["source_url"] = source_url
-        meta["keywords"] = self._extract_keywords(content)
+        meta["keywords"] = keywords
         meta["chunk_index"] = chunk_index
-        
+
         return Document(page_content=content, metadata=meta)
@@ -0,0 +1,110 @@
+import json
+import random
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+class FakeIndices:
+    def __init__(self, owner: "FakeOpenSearch"):
+        self.owner = owner
+
+    def exists(self, index: str) -> bool:
+        return index in self.owner.indices_data
+
+    def create(self, index: str, body: Optional[Dict[str, Any]] = None):
+        self.owner.indices_data.setdefault(index, {})
+        self.owner.mappings[index] = body or {}
+        return {"acknowledged": True, "index": index}
+
+    def get(self, index: str):
+        body = self.owner.mappings.get(index, {})
+        settings = {"index": dict(body.get("settings", {}).get("index", {}))}
+        settings["index"].update({"uuid": "fake-uuid", "creation_date": "0", "provided_name": index})
+        return {index: {"mappings": body.get("mappings", {}), "settings": settings}}
+
+    def delete(self, index: str):
+        self.owner.indices_data.pop(index, None)
+        self.owner.mappings.pop(index, None)
+        return {"acknowledged": True}
+
+
+class FakeOpenSearch: # 오프라인 테스트/벤치마크용 opensearchpy client 대역 (_bulk 위주)
+    def __init__(self, latency: float = 0.0, per_doc_latency: float = 0.0,
+                 failure_rate: float = 0.0, seed: int = 0):
+        self.latency = latency                  # 요청당 지연(초)
+        self.per_doc_latency = per_doc_latency  # 문서당 추가 지연(초)
+        self.failure_rate = failure_rate        # 항목별 429 확률
+        self.indices_data: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.mappings: Dict[str, Dict[str, Any]] = {}
+        self.indices = FakeIndices(self)
+        self.bulk_calls = 0
+        self.search_calls = 0
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._rand = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def bulk(self, body, index: Optional[str] = None, **kwargs):
+        lines = body.splitlines() if isinstance(body, str) else body
+        lines = [json.loads(l) if isinstance(l, str) else l for l in lines if l]
+
+        with self._lock:
+            self.bulk_calls += 1
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            time.sleep(self.latency + self.per_doc_latency * (len(lines) // 2))
+            items = []
+            i = 0
+            while i < len(lines):
+                action = lines[i]
+                op, meta = next(iter(action.items()))
+                idx = meta.get("_index", index)
+                if op == "delete":
+                    removed = self.indices_data.get(idx, {}).pop(meta.get("_id"), None)
+                    items.append({op: {"_id": meta.get("_id"), "status": 200 if removed else 404}})
+                    i += 1
+                    continue
+
+                source = lines[i + 1]
+                i += 2
+                with self._lock:
+                    failed = self._rand.random() < self.failure_rate
+                if failed:
+                    items.append({op: {"status": 429, "error": {"type": "es_rejected_execution_exception"}}})
+                    continue
+                doc_id = meta.get("_id") or str(uuid.uuid4())
+                with self._lock:
+                    self.indices_data.setdefault(idx, {})[doc_id] = source
+                items.append({op: {"_id": doc_id, "status": 201}})
+            return {"errors": any(next(iter(it.values()))["status"] >= 300 for it in items), "items": items}
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def search(self, index: str, body: Dict[str, Any], **kwargs):
+        # match_all / metadata.id terms + _id 정렬 + search_after 정도만 지원
+        self.search_calls += 1
+        ids = sorted(self.indices_data.get(index, {}))
+        terms = body.get("query", {}).get("terms", {}).get("metadata.id.keyword")
+        if terms is not None:
+            wanted = set(terms)
+            ids = [i for i in ids if self.indices_data[index][i].get("metadata", {}).get("id") in wanted]
+        cursor = body.get("search_after")
+        if cursor:
+            ids = [i for i in ids if i > cursor[0]]
+        ids = ids[:body.get("size", 10)]
+        hits = [{"_id": i, "_score": 1.0, "sort": [i], "_source": self.indices_data[index][i]} for i in ids]
+        return {"hits": {"total": {"value": len(hits)}, "hits": hits}}
+
+    def delete_by_query(self, index: str, body: Dict[str, Any], **kwargs):
+        deleted = len(self.indices_data.get(index, {}))
+        self.indices_data[index] = {}
+        return {"deleted": deleted}
+
+    def count(self, index: str, body: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+        return {"count": len(self.indices_data.get(index, {}))}
+
+    def docs(self, index: str) -> List[Dict[str, Any]]:
+        return list(self.indices_data.get(index, {}).values())
@@ -0,0 +1,71 @@
+import hashlib
+import io
+import json
+import math
+import random
+import re
+import threading
+import time
+from botocore.exceptions import ClientError
+
+TOKEN_RE = re.compile(r"[가-힣a-zA-Z0-9]+")
+_SUBWORD_RE = re.compile(r"[가-힣]|[A-Za-z]+|\d|\s*\n\s*| {2,}|\S")
+
+def fake_token_count(text: str) -> int:
+    # 실제 subword 토크나이저 흉내: 한글 음절/숫자/기호는 글자마다, 영어 단어는 3자마다, 줄바꿈/들여쓰기도 토큰
+    count = 0
+    for piece in _SUBWORD_RE.findall(text):
+        if piece[0].isascii() and piece[0].isalpha():
+            count += (len(piece) + 2) // 3
+        elif piece.startswith(" ") and "\n" not in piece:
+            count += (len(piece) + 3) // 4
+        else:
+            count += 1
+    return count
+
+class FakeBedrockRuntime: # 오프라인 테스트/벤치마크용 bedrock-runtime 대역 (invoke_model만 흉내)
+    def __init__(self, dimension: int = 1024, latency: float = 0.0,
+                 throttle_rate: float = 0.0, seed: int = 0):
+        self.dimension = dimension
+        self.latency = latency              # 요청당 지연(초)
+        self.throttle_rate = throttle_rate  # ThrottlingException 발생 확률
+        self.calls = 0
+        self.throttled = 0
+        self._rand = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def invoke_model(self, body, modelId=None, accept=None, contentType=None):
+        with self._lock:
+            self.calls += 1
+            throttle = self._rand.random() < self.throttle_rate
+            if throttle:
+                self.throttled += 1
+
+        if self.latency:
+            time.sleep(self.latency)
+        if throttle:
+            raise ClientError(
+                {"Error": {"Code": "ThrottlingException", "Message": "Too many requests"}},
+                "InvokeModel",
+            )
+
+        text = json.loads(body)["inputText"]
+        payload = {
+            "embedding": self.embed(text),
+            "inputTextTokenCount": fake_token_count(text),
+        }
+        return {"body": io.BytesIO(json.dumps(payload).encode("utf-8"))}
+
+    def embed(self, text: str):
+        # feature hashing: 단어가 겹칠수록 코사인 유사도가 높아지도록
+        vec = [0.0] * self.dimension
+        for token in TOKEN_RE.findall(text.lower()):
+            digest = hashlib.md5(token.encode("utf-8")).digest()
+            idx = int.from_bytes(digest[:4], "little") % self.dimension
+            sign = 1.0 if digest[4] & 1 else -1.0
+            vec[idx] += sign
+
+        norm = math.sqrt(sum(v * v for v in vec))
+        if norm == 0:
+            return vec
+        return [v / norm for v in vec]
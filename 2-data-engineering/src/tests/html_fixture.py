@@ -0,0 +1,29 @@
+# 테스트/벤치마크용 문서 사이트 스타일 HTML 생성기
+def make_html_page(sections: int = 20, title: str = "AWS 문서 예제", seed: int = 0) -> str:
+    parts = [
+        "<!DOCTYPE html><html><head>",
+        f"<title>{title}</title>",
+        "<meta charset='utf-8'><style>body { font-family: sans-serif; }</style>",
+        "<script>window.dataLayer = []; function track(a, b) { return a < b; }</script>",
+        "</head><body><nav><ul>",
+    ]
+    for i in range(10):
+        parts.append(f"<li><a href='/docs/{seed}/{i}'>메뉴 {i}</a></li>")
+    parts.append("</ul></nav><main>")
+
+    for s in range(sections):
+        n = seed * sections + s
+        parts.append(f"<h2 id='s{n}'>섹션 {n}: S3 버킷 정책</h2>")
+        parts.append(f"<p>Amazon S3 버킷 {n}번에 대한 설명입니다. IAM 정책으로 접근을 제어하고 "
+                     f"<b>버전 관리</b>와 <a href='/lifecycle/{n}'>수명 주기</a> 규칙을 설정합니다.</p>")
+        parts.append(f"<pre><code>aws s3api get-bucket-policy --bucket demo-{n} &lt;policy.json&gt;</code></pre>")
+        parts.append(f"<img src='/img/diagram-{n}.png' alt='diagram {n}'>")
+        if s % 4 == 0:
+            parts.append("<table><thead><tr><th>설정</th><th>기본값</th><th>설명</th></tr></thead><tbody>")
+            for r in range(5):
+                parts.append(f"<tr><td>option_{n}_{r}</td><td>{r * 10}</td><td>옵션 {r} 설명</td></tr>")
+            parts.append("</tbody></table>")
+
+    parts.append("</main><footer>Copyright Example</footer>")
+    parts.append("<noscript>자바스크립트를 켜 주세요</noscript></body></html>")
+    return "\n".join(parts)
@@ -0,0 +1,83 @@
+# 테스트용 로컬 HTTP 서버 (robots.txt, sitemap, ETag 조건부 GET, 동시 요청 수 기록)
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+
+class LocalSite:
+    def __init__(self, pages: Dict[str, str], robots: str = "", latency: float = 0.0):
+        self.pages = pages # path -> html
+        self.robots = robots
+        self.latency = latency
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def sitemap(self) -> str:
+        locs = "".join(f"<url><loc>{self.base_url}{path}</loc></url>" for path in self.pages)
+        return f'<?xml version="1.0"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{locs}</urlset>'
+
+    def _handler(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with site._lock:
+                    site.requests.append(self.path)
+                    site.in_flight += 1
+                    site.max_in_flight = max(site.max_in_flight, site.in_flight)
+                try:
+                    if site.latency:
+                        time.sleep(site.latency)
+                    self._respond()
+                finally:
+                    with site._lock:
+                        site.in_flight -= 1
+
+            def _respond(self):
+                if self.path == "/robots.txt":
+                    return self._send(200, site.robots, "text/plain")
+                if self.path == "/sitemap.xml":
+                    return self._send(200, site.sitemap(), "application/xml")
+                html = site.pages.get(self.path)
+                if html is None:
+                    return self._send(404, "not found", "text/plain")
+
+                etag = f'"{abs(hash(html))}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self._send(200, html, "text/html; charset=utf-8", {"ETag": etag})
+
+            def _send(self, status, body, content_type, headers=None):
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
@@ -0,0 +1,35 @@
+# 테스트/벤치마크용 텍스트 PDF 생성기
+from typing import Optional
+from pypdf import PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+def make_text_pdf(path: str, pages: int, lines_per_page: int = 40, header: Optional[str] = None) -> str:
+    writer = PdfWriter()
+    font = DictionaryObject({
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/Helvetica"),
+    })
+    font_ref = writer._add_object(font)
+
+    for p in range(pages):
+        lines = []
+        if header:
+            lines.append(header)
+        for i in range(lines_per_page):
+            lines.append(f"Page {p + 1} line {i + 1}: the quick brown fox jumps over the lazy dog {p * lines_per_page + i}.")
+        lines.append(f"Page {p + 1}")
+
+        ops = "BT /F1 9 Tf 11 TL 40 770 Td " + " ".join(f"({line}) '" for line in lines) + " ET"
+        stream = DecodedStreamObject()
+        stream.set_data(ops.encode("latin-1"))
+
+        page = writer.add_blank_page(612, 792)
+        page[NameObject("/Resources")] = DictionaryObject({
+            NameObject("/Font"): DictionaryObject({NameObject("/F1"): font_ref})
+        })
+        page[NameObject("/Contents")] = writer._add_object(stream)
+
+    with open(path, "wb") as f:
+        writer.write(f)
+    return path
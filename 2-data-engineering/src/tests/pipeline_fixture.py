@@ -0,0 +1,41 @@
+# AWS 없이 Pipeline을 돌리기 위한 조립 (가짜 bedrock-runtime / OpenSearch client)
+from typing import List
+from src.embedding.embedder import BedrockEmbedder
+from src.tests.fake_runtime import FakeBedrockRuntime
+from src.pipeline.bulk_writer import BulkIndexWriter
+from src.tests.fake_opensearch import FakeOpenSearch
+from src.pipeline.manifest import IngestManifest
+from src.pipeline.pipeline import Pipeline
+from src.pipeline.query_cache import SearchCache
+from src.structuring.structurer import DocumentStructurer
+
+
+class FakeVectorStore: # Pipeline이 쓰는 OpenSearchVectorSearch 메서드만
+    def __init__(self, client: FakeOpenSearch, index_name: str):
+        self.client = client
+        self.index_name = index_name
+
+    def index_exists(self) -> bool:
+        return self.client.indices.exists(self.index_name)
+
+    def create_index(self, dimension: int, index_name: str):
+        self.client.indices.create(index_name)
+
+    def delete(self, ids: List[str], refresh_indices: bool = False):
+        self.client.bulk([{"delete": {"_index": self.index_name, "_id": i}} for i in ids])
+
+
+def offline_pipeline(tmp_path, index_name: str = "idx", max_docs: int = 50, **kwargs) -> Pipeline:
+    pipeline = Pipeline.__new__(Pipeline)
+    client = FakeOpenSearch()
+    pipeline.index_name = index_name
+    pipeline.pdf_workers = 1
+    pipeline.manifest = IngestManifest(str(tmp_path / "manifest.json"))
+    pipeline.search_cache = SearchCache()
+    pipeline.structurer = kwargs.pop("structurer", None) or DocumentStructurer()
+    pipeline.dedup = kwargs.pop("dedup", None)
+    pipeline.crawler = kwargs.pop("crawler", None)
+    pipeline.bedrock_embedder = BedrockEmbedder(client=FakeBedrockRuntime(dimension=8))
+    pipeline.vector_store = FakeVectorStore(client, index_name)
+    pipeline.bulk_writer = BulkIndexWriter(client, index_name, max_docs=max_docs, is_aoss=False)
+    return pipeline
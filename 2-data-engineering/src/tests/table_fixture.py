@@ -0,0 +1,118 @@
+# 표 검출 정확도 확인용 PDF 텍스트 조각 (테스트/벤치마크 공용)
+# 케이스마다 ("text" | "table", 내용) 구간 목록. table 구간의 줄이 정답 표 줄
+from typing import List, Set, Tuple
+
+PROSE_KO = (
+    "Amazon S3는 버킷, 객체, 접근 정책을 기반으로 데이터를 저장하며, 수명 주기 규칙으로 비용을 줄일 수 있다.\n"
+    "버킷 정책은 계정, 역할, 조건 키를 조합해 작성하고, 변경 사항은 CloudTrail에 기록된다.\n"
+    "대부분의 워크로드에서는 버전 관리, 기본 암호화, 퍼블릭 액세스 차단을 함께 켜 두는 것을 권장한다."
+)
+PROSE_EN = (
+    "When a request fails, the SDK retries with exponential backoff, adds jitter, and gives up after five attempts.\n"
+    "Lambda functions, unlike containers, are billed per millisecond, so short handlers are cheap to run.\n"
+    "For this reason, we recommend keeping dependencies small, caching clients, and reusing connections."
+)
+PROSE_WRAPPED = (
+    "IAM 정책의 Effect, Action, Resource 요소는 반드시 포함되어야 하며, Condition 요소는 선택 사항으로\n"
+    "요청 시각, 원본 IP, MFA 여부 같은 조건을 지정할 때 사용하고, 여러 조건은 AND로 결합되어 평가되므로\n"
+    "의도치 않게 접근이 막히지 않도록 정책 시뮬레이터로 먼저 확인한 뒤 배포하는 편이 안전하다고 볼 수 있다"
+)
+
+PIPE_TABLE = (
+    "| 설정 | 기본값 | 설명 |\n"
+    "| --- | --- | --- |\n"
+    "| max_connections | 100 | 최대 연결 수 |\n"
+    "| timeout | 30 | 요청 제한 시간(초) |\n"
+    "| retries | 3 | 재시도 횟수 |"
+)
+PIPE_NO_EDGES = (
+    "리전 | 가용 영역 | 엔드포인트\n"
+    "서울 | 4 | s3.ap-northeast-2.amazonaws.com\n"
+    "도쿄 | 4 | s3.ap-northeast-1.amazonaws.com"
+)
+TAB_TABLE = (
+    "인스턴스\tvCPU\t메모리\n"
+    "t3.micro\t2\t1 GiB\n"
+    "t3.small\t2\t2 GiB\n"
+    "m5.large\t2\t8 GiB"
+)
+CSV_TABLE = (
+    "서비스,요청 수,오류율\n"
+    "S3,120000,0.1%\n"
+    "Lambda,54000,0.4%\n"
+    "DynamoDB,87000,0.2%\n"
+    "SQS,33000,0.0%"
+)
+CSV_RAGGED = (
+    "name,type,default\n"
+    "bucket,string,\n"
+    "versioning,bool,false\n"
+    "encryption,string\n"
+    "lifecycle,list,[]"
+)
+BREADCRUMB = "홈 | 문서 | 스토리지"
+
+CASES: List[Tuple[str, List[Tuple[str, str]]]] = [
+    ("prose_ko", [("text", PROSE_KO)]),
+    ("prose_en", [("text", PROSE_EN)]),
+    ("prose_wrapped", [("text", PROSE_WRAPPED)]),
+    ("breadcrumb", [("text", BREADCRUMB), ("text", PROSE_KO)]),
+    ("pipe", [("text", PROSE_KO), ("table", PIPE_TABLE), ("text", PROSE_EN)]),
+    ("pipe_no_edges", [("table", PIPE_NO_EDGES), ("text", PROSE_WRAPPED)]),
+    ("tab", [("text", PROSE_EN), ("table", TAB_TABLE)]),
+    ("csv", [("text", PROSE_KO), ("table", CSV_TABLE), ("text", PROSE_WRAPPED)]),
+    ("csv_ragged", [("table", CSV_RAGGED), ("text", PROSE_EN)]),
+    ("two_tables", [("table", PIPE_TABLE), ("text", PROSE_KO), ("table", CSV_TABLE)]),
+    ("prose_between", [("text", PROSE_WRAPPED), ("text", PROSE_EN), ("text", PROSE_KO)]),
+]
+
+# 검출 점수/임계값을 맞출 때 보지 않은 케이스 (벤치마크에서 CASES와 따로 정확도를 보고)
+PROSE_LIST_HEAVY = (
+    "지원 리전은 서울, 도쿄, 싱가포르, 시드니, 뭄바이이며, 요금은 리전, 스토리지 클래스, 요청 수에 따라 다르다.\n"
+    "Supported engines are MySQL, PostgreSQL, MariaDB, Oracle, and SQL Server, each with its own limits.\n"
+    "백업, 스냅샷, 복제본은 같은 KMS 키로 암호화되며, 키를 교체하면 새 스냅샷부터 적용된다."
+)
+SHELL_PIPES = (
+    "로그에서 오류만 세려면 다음과 같이 실행한다.\n"
+    "cat app.log | grep ERROR | sort | uniq -c\n"
+    "결과는 오류 메시지별 발생 횟수로, 가장 많이 나온 항목부터 확인하면 된다."
+)
+PIPE_PRICING = (
+    "| 스토리지 클래스 | GB당 월 요금 | 최소 보관 기간 | 검색 요금 |\n"
+    "| --- | --- | --- | --- |\n"
+    "| Standard | 0.025 | 없음 | 없음 |\n"
+    "| Standard-IA | 0.0138 | 30일 | GB당 0.01 |\n"
+    "| Glacier Instant | 0.005 | 90일 | GB당 0.03 |\n"
+    "| Deep Archive | 0.002 | 180일 | GB당 0.02 |"
+)
+TAB_LIMITS = (
+    "API	기본 한도	최대 한도	단위	조정 가능\n"
+    "PutObject	3500	없음	초당 요청	아니오\n"
+    "GetObject	5500	없음	초당 요청	아니오\n"
+    "ListBuckets	1000	1000	계정당 버킷	예"
+)
+CSV_METRICS = (
+    "date,latency_p50,latency_p95,errors\n"
+    "2024-05-01,120,340,3\n"
+    "2024-05-02,118,362,0\n"
+    "2024-05-03,131,401,7"
+)
+
+HELD_OUT_CASES: List[Tuple[str, List[Tuple[str, str]]]] = [
+    ("prose_list_heavy", [("text", PROSE_LIST_HEAVY)]),
+    ("shell_pipes", [("text", SHELL_PIPES), ("text", PROSE_EN)]),
+    ("pipe_pricing", [("text", PROSE_LIST_HEAVY), ("table", PIPE_PRICING), ("text", SHELL_PIPES)]),
+    ("tab_limits", [("table", TAB_LIMITS), ("text", PROSE_LIST_HEAVY)]),
+    ("csv_metrics", [("text", SHELL_PIPES), ("table", CSV_METRICS)]),
+]
+
+def build_case(segments: List[Tuple[str, str]]) -> Tuple[str, Set[int]]:
+    # (PDF 페이지처럼 빈 줄 없이 이어 붙인 텍스트, 정답 표 줄 번호)
+    lines: List[str] = []
+    table_lines: Set[int] = set()
+    for kind, content in segments:
+        for line in content.splitlines():
+            if kind == "table":
+                table_lines.add(len(lines))
+            lines.append(line)
+    return "\n".join(lines), table_lines
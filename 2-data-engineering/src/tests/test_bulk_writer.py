@@ -0,0 +1,50 @@
+from langchain_core.documents import Document
+import pytest
+from src.pipeline.bulk_writer import BulkIndexWriter, BulkWriteError
+from src.tests.fake_opensearch import FakeOpenSearch
+
+def make_docs(n):
+    return [Document(page_content=f"chunk {i}", metadata={"id": f"doc-{i}", "chunk_index": i}) for i in range(n)]
+
+def fake_embed(texts):
+    return [[float(len(t)), 1.0] for t in texts]
+
+def test_bulk_writer_writes_everything_with_retries():
+    client = FakeOpenSearch(failure_rate=0.3, seed=3)
+    writer = BulkIndexWriter(client, "idx", max_docs=10, concurrency=3, max_retries=10, base_delay=0.001)
+
+    stats = writer.write(make_docs(57), fake_embed)
+    assert stats.docs == 57 and stats.failed == 0
+    assert stats.retried > 0
+    docs = client.docs("idx")
+    assert sorted(d["id"] for d in docs) == sorted(f"doc-{i}" for i in range(57))
+    assert docs[0]["vector_field"] and docs[0]["metadata"]["chunk_index"] is not None
+
+def test_bulk_writer_splits_by_bytes_and_uses_id_outside_aoss():
+    client = FakeOpenSearch()
+    writer = BulkIndexWriter(client, "idx", max_docs=100, max_bytes=300, is_aoss=False)
+
+    stats = writer.write(make_docs(10), fake_embed)
+    assert stats.docs == 10
+    assert client.bulk_calls > 1
+    assert set(client.indices_data["idx"]) == {f"doc-{i}" for i in range(10)}
+
+def test_bulk_writer_skips_failed_embeddings_and_bounds_in_flight():
+    client = FakeOpenSearch(latency=0.01)
+    writer = BulkIndexWriter(client, "idx", max_docs=2, concurrency=2)
+    embed = lambda texts: [None if t.endswith("3") else [1.0] for t in texts]
+
+    written = [d for batch in writer.iter_write(make_docs(12), embed) for d in batch]
+    assert len(written) == 11
+    assert writer.last_stats.failed == 1
+    assert writer.last_stats.failed_ids == ["doc-3"]
+    assert client.max_in_flight <= 2
+
+def test_bulk_writer_raises_with_failed_ids_after_retries():
+    client = FakeOpenSearch(failure_rate=1.0)
+    writer = BulkIndexWriter(client, "idx", max_docs=5, max_retries=1, base_delay=0.001)
+
+    with pytest.raises(BulkWriteError) as exc:
+        writer.write(make_docs(4), fake_embed)
+    assert sorted(exc.value.stats.failed_ids) == [f"doc-{i}" for i in range(4)]
+    assert writer.write(make_docs(2), fake_embed, raise_on_error=False).failed == 2
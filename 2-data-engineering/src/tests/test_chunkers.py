@@ -0,0 +1,51 @@
+import random
+from itertools import islice
+import pytest
+from src.chunker.fixed_chunker import fixed_chunk, iter_fixed_chunks
+from src.chunker.recursive_chunker import iter_recursive_chunks, recursive_chunk
+from src.chunker.spans import align_chunks
+
+def random_doc(rng, n=300):
+    parts = ["S3 버킷 정책", "IAM 역할.", "Lambda 함수! ", " ", "\n", "\n\n", "\n\n\n", "문장입니다. " * 8, "\t"]
+    return "".join(rng.choice(parts) for _ in range(n))
+
+def test_recursive_spans_point_back_to_source():
+    rng = random.Random(0)
+    for _ in range(200):
+        text = random_doc(rng)
+        size = rng.randint(20, 200)
+        chunks = list(iter_recursive_chunks(text, chunk_size=size))
+        assert [c.text for c in chunks] == recursive_chunk(text, chunk_size=size)
+        for c in chunks:
+            # 문단은 "\n\n", 문장은 " "로 다시 합치므로 원문과는 공백만 다르다
+            assert text[c.start:c.end].split() == c.text.split()
+
+def test_recursive_chunk_sizes():
+    text = "\n\n".join(f"{i}번 문단입니다. " * 3 for i in range(200))
+    chunks = recursive_chunk(text, chunk_size=300)
+    assert all(len(c) <= 450 for c in chunks)
+    assert " ".join(" ".join(chunks).split()) == " ".join(text.split())
+
+def test_fixed_spans_and_overlap():
+    text = "abcdefghij" * 10
+    chunks = list(iter_fixed_chunks(text, max_chars=30, overlap=10))
+    assert [c.text for c in chunks] == fixed_chunk(text, 30, 10)
+    assert all(text[c.start:c.end] == c.text for c in chunks)
+    assert [c.start for c in chunks] == [0, 20, 40, 60, 80]
+
+@pytest.mark.parametrize("overlap", [30, 31, -1])
+def test_fixed_rejects_non_advancing_overlap(overlap):
+    with pytest.raises(ValueError):
+        fixed_chunk("x" * 100, max_chars=30, overlap=overlap)
+
+def test_chunkers_are_lazy():
+    text = ("문단 하나. " * 20 + "\n\n") * 200_000 # 약 20MB
+    first = list(islice(iter_recursive_chunks(text, chunk_size=500), 3))
+    assert len(first) == 3 and first[0].start == 0
+
+def test_align_chunks():
+    text = "첫 문장.\n두 번째   문장.\n\n세 번째 문장."
+    chunks = align_chunks(text, ["첫 문장. 두 번째 문장.", "세 번째 문장.", "없는 문장"])
+    assert text[chunks[0].start:chunks[0].end] == "첫 문장.\n두 번째   문장."
+    assert text[chunks[1].start:chunks[1].end] == "세 번째 문장."
+    assert (chunks[2].start, chunks[2].end) == (-1, -1)
@@ -0,0 +1,112 @@
+import time
+import pytest
+from src.embedding.embedder import BedrockEmbedder
+from src.tests.fake_runtime import FakeBedrockRuntime
+from src.loader.crawler import CrawlState, WebCrawler, normalize_url, parse_sitemap, parse_sitemap_response
+from src.pipeline.bulk_writer import BulkWriteError
+from src.tests.http_fixture import LocalSite
+from src.tests.pipeline_fixture import offline_pipeline
+
+def make_pages(n):
+    return {f"/docs/{i}": f"<html><head><title>문서 {i}</title></head><body><p>본문 {i}</p></body></html>" for i in range(n)}
+
+def test_normalize_url():
+    assert normalize_url("HTTP://Example.com:80/a#frag") == "http://example.com/a"
+    assert normalize_url("https://example.com") == "https://example.com/"
+    assert normalize_url("http://example.com:8080/a?b=1") == "http://example.com:8080/a?b=1"
+
+def test_parse_sitemap_index():
+    xml = ('<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+           '<sitemap><loc>http://a/s1.xml</loc></sitemap></sitemapindex>')
+    assert parse_sitemap(xml) == ([], ["http://a/s1.xml"])
+
+def test_sitemap_detected_by_content_not_url():
+    urlset = '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"><url><loc>http://a/p</loc></url></urlset>'
+    assert parse_sitemap_response(urlset, "application/xml") == (["http://a/p"], [])
+    assert parse_sitemap_response("<html><body>sitemap 안내</body></html>", "text/html") is None
+    assert parse_sitemap_response('<rss version="2.0"><channel/></rss>', "application/xml") is None
+
+def test_crawl_sitemap_robots_and_dedupe(tmp_path):
+    pages = make_pages(6)
+    pages["/private/secret"] = "<html>비공개</html>"
+    pages["/guide/sitemap-help"] = "<html><body>사이트맵 안내</body></html>" # 이름만 sitemap인 페이지
+    with LocalSite(pages, robots="User-agent: *\nDisallow: /private/\n") as site:
+        crawler = WebCrawler(max_workers=4, per_host=2, delay=0.0)
+        urls = crawler.expand_seeds([site.base_url + "/sitemap.xml", site.base_url + "/guide/sitemap-help"])
+        urls.append(site.base_url + "/docs/0#section") # fragment만 다른 중복
+        results = list(crawler.crawl(urls))
+
+    fetched = sorted(r.url for r in results if r.ok)
+    assert len(fetched) == 7
+    assert all("/private/" not in u for u in fetched)
+    assert crawler.last_stats.robots_blocked == 1
+    assert crawler.last_stats.duplicates == 2 # fragment 중복 + sitemap에도 있는 안내 페이지
+    assert "/private/secret" not in site.requests
+
+def test_sitemap_fetch_follows_robots_and_delay():
+    pages = make_pages(2)
+    with LocalSite(pages, robots="User-agent: *\nDisallow: /private/\n") as site:
+        crawler = WebCrawler(delay=0.2)
+        blocked = crawler.expand_seeds([site.base_url + "/private/sitemap.xml"])
+        urls = crawler.expand_seeds([site.base_url + "/sitemap.xml"])
+        started = time.perf_counter()
+        results = list(crawler.crawl(urls))
+        elapsed = time.perf_counter() - started
+
+    assert blocked == []
+    assert "/private/sitemap.xml" not in site.requests
+    assert site.requests[0] == "/robots.txt" # sitemap보다 robots.txt를 먼저 확인
+    assert sum(r.ok for r in results) == 2
+    assert elapsed >= 0.3 # sitemap 요청도 같은 host 요청 간격에 들어간다 (페이지 2개 -> 0.2s, 0.4s)
+
+def test_crawl_per_host_limit_and_politeness():
+    with LocalSite(make_pages(8), latency=0.05) as site:
+        crawler = WebCrawler(max_workers=8, per_host=2, delay=0.02, respect_robots=False)
+        results = list(crawler.crawl(site.base_url + f"/docs/{i}" for i in range(8)))
+
+    assert sum(r.ok for r in results) == 8
+    assert site.max_in_flight <= 2
+    assert crawler.last_stats.elapsed >= 7 * 0.02
+
+def test_conditional_get_skips_unchanged(tmp_path):
+    pages = make_pages(3)
+    state = CrawlState(str(tmp_path / "crawl_state.json"))
+    with LocalSite(pages) as site:
+        urls = [site.base_url + f"/docs/{i}" for i in range(3)]
+        crawler = WebCrawler(delay=0.0, state=state)
+        for r in crawler.crawl(urls):
+            state.record(r)
+        state.save()
+
+        pages["/docs/1"] = "<html><body>바뀐 본문</body></html>"
+        crawler = WebCrawler(delay=0.0, state=CrawlState(state.path))
+        results = {r.url: r for r in crawler.crawl(urls)}
+
+    assert results[urls[0]].not_modified and results[urls[2]].not_modified
+    assert results[urls[1]].ok and "바뀐 본문" in results[urls[1]].html
+    assert crawler.last_stats.not_modified == 2
+
+def indexed_texts(pipeline):
+    return sorted(d["text"] for d in pipeline.vector_store.client.docs("idx"))
+
+def test_crawl_keeps_old_chunks_until_new_ones_are_written(tmp_path):
+    pages = {"/docs/0": "<html><body><p>예전 본문입니다.</p></body></html>"}
+    with LocalSite(pages) as site:
+        def crawl(pipeline):
+            pipeline.crawler = WebCrawler(delay=0.0, respect_robots=False, state=CrawlState(str(tmp_path / "state.json")))
+            return [d for docs in pipeline.run_crawl([site.base_url + "/docs/0"], "recursive", 500, 0) for d in docs]
+
+        pipeline = offline_pipeline(tmp_path)
+        crawl(pipeline)
+        assert indexed_texts(pipeline) == ["예전 본문입니다."]
+
+        # 새 청크 임베딩이 실패하면 예전 청크를 지우지 않고, 다음 크롤링에서 다시 받는다
+        pages["/docs/0"] = "<html><body><p>바뀐 본문입니다.</p></body></html>"
+        pipeline.bedrock_embedder = BedrockEmbedder(client=FakeBedrockRuntime(dimension=8, throttle_rate=1.0), max_retries=0)
+        with pytest.raises(BulkWriteError):
+            crawl(pipeline)
+        assert indexed_texts(pipeline) == ["예전 본문입니다."]
+
+        pipeline.bedrock_embedder = BedrockEmbedder(client=FakeBedrockRuntime(dimension=8))
+        crawl(pipeline)
+        assert indexed_texts(pipeline) == ["바뀐 본문입니다."]
@@ -0,0 +1,77 @@
+import random
+from src.pipeline.dedup import NearDuplicateIndex, jaccard, minhash
+
+rng = random.Random(0)
+VOCAB = [f"w{i}" for i in range(3000)]
+SENTENCES = [" ".join(rng.choice(VOCAB) for _ in range(12)) + "." for _ in range(200)]
+
+def paragraph(seed):
+    return " ".join(random.Random(seed).sample(SENTENCES, 6))
+
+def edited(text, seed):
+    # 날짜/숫자 몇 개만 바뀐 사본
+    r = random.Random(seed)
+    tokens = text.split()
+    for _ in range(2):
+        tokens[r.randrange(len(tokens))] = str(r.randint(2000, 2030))
+    return " ".join(tokens)
+
+def items(texts, prefix):
+    return [(f"{prefix}-{i}", t, i) for i, t in enumerate(texts)]
+
+def test_minhash_is_deterministic_and_tracks_similarity():
+    p = paragraph(1)
+    assert (minhash(p) == minhash(p)).all()
+    assert jaccard(minhash(p), minhash(edited(p, 1))) >= 0.7
+    assert jaccard(minhash(p), minhash(paragraph(2))) < 0.3
+
+def test_drops_near_duplicates_within_source(tmp_path):
+    index = NearDuplicateIndex(str(tmp_path / "dedup.json"))
+    p = paragraph(1)
+    texts = [p, paragraph(2), edited(p, 3), paragraph(4), p]
+    assert list(index.filter("a.pdf", items(texts, "a"))) == [0, 1, 3]
+    assert index.dropped == 2
+
+def test_chunks_without_words_are_not_duplicates(tmp_path):
+    # 단어가 없는 청크는 signature가 모두 0이라 서로 유사도 1.0으로 나오지만 중복으로 보지 않는다
+    assert jaccard(minhash("---- | ----"), minhash("※ ★ ※")) == 1.0
+    index = NearDuplicateIndex(str(tmp_path / "dedup.json"))
+    accepted = []
+    assert list(index.filter("a", items(["---- | ----", "※ ★ ※", paragraph(1)], "a"), accepted)) == [0, 1, 2]
+    assert accepted == ["a-2"] and len(index.table) == 1
+    assert list(index.filter("b", items(["===="], "b"))) == [0]
+    assert index.dropped == 0
+
+def test_cross_source_and_reingest(tmp_path):
+    path = str(tmp_path / "dedup.json")
+    index = NearDuplicateIndex(path)
+    boilerplate = paragraph(10)
+    assert list(index.filter("a", items([boilerplate, paragraph(11)], "a"))) == [0, 1]
+    index.commit(["a-0", "a-1"]) # 적재 완료
+    index.save()
+
+    # 파일에서 다시 읽어도 다른 source의 같은 문단은 제외
+    reloaded = NearDuplicateIndex(path)
+    assert list(reloaded.filter("b", items([edited(boilerplate, 1), paragraph(12)], "b"))) == [1]
+    # 같은 source를 다시 넣을 때는 자기 이전 적재분과 비교하지 않는다
+    assert list(reloaded.filter("a", items([boilerplate, paragraph(11)], "a"))) == [0, 1]
+
+    # 원본이 지워지면 더 이상 중복이 아니다
+    reloaded.remove(["a-0"])
+    assert list(reloaded.filter("b", items([edited(boilerplate, 1)], "b2"))) == [0]
+
+def test_only_committed_signatures_are_saved(tmp_path):
+    path = str(tmp_path / "dedup.json")
+    index = NearDuplicateIndex(path)
+    boilerplate, other = paragraph(20), paragraph(21)
+    accepted = []
+    assert list(index.filter("a", items([boilerplate, other], "a"), accepted)) == [0, 1]
+    assert accepted == ["a-0", "a-1"]
+
+    # a-1만 적재에 성공: a-0은 저장되지 않고, rollback 뒤에는 다른 source의 같은 문단이 다시 통과
+    index.commit(["a-1"])
+    index.rollback(accepted)
+    index.save()
+    reloaded = NearDuplicateIndex(path)
+    assert sorted(reloaded.sources) == ["a-1"]
+    assert list(index.filter("b", items([boilerplate, edited(other, 2)], "b"))) == [0]
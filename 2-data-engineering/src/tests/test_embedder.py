@@ -0,0 +1,32 @@
+from src.embedding.embedder import BedrockEmbedder
+from src.tests.fake_runtime import FakeBedrockRuntime
+
+def test_embed_texts_keeps_order():
+    fake = FakeBedrockRuntime(dimension=64, latency=0.001)
+    embedder = BedrockEmbedder(client=fake, max_workers=4)
+    texts = [f"문장 {i} sentence {i}" for i in range(20)]
+
+    res = embedder.embed_texts(texts)
+    assert len(res) == len(texts)
+    for text, vec in zip(texts, res):
+        assert vec == fake.embed(text)
+    assert fake.calls == len(texts)
+
+def test_embed_texts_empty_text_is_none():
+    embedder = BedrockEmbedder(client=FakeBedrockRuntime(dimension=8))
+    res = embedder.embed_texts(["hello", "  ", "world"])
+    assert res[0] is not None and res[2] is not None
+    assert res[1] is None
+    assert embedder.last_stats.failed == 1
+
+def test_embed_texts_retries_throttling():
+    fake = FakeBedrockRuntime(dimension=8, throttle_rate=0.3, seed=1)
+    embedder = BedrockEmbedder(client=fake, max_workers=4, max_retries=20, base_delay=0.001, max_delay=0.005)
+    texts = [f"text {i}" for i in range(30)]
+
+    res = embedder.embed_texts(texts)
+    assert all(v is not None for v in res)
+    assert fake.throttled > 0
+    assert embedder.last_stats.retries == fake.throttled
+    assert embedder.last_stats.texts_per_sec > 0
+    assert embedder.last_stats.p99 >= embedder.last_stats.p50
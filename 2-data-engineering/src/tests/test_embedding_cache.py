@@ -0,0 +1,69 @@
+from langchain_core.embeddings import Embeddings
+from src.embedding.cache import EmbeddingCache, CachedEmbeddings
+from src.embedding.embedder import BedrockEmbedder
+from src.tests.fake_runtime import FakeBedrockRuntime
+
+class CountingEmbeddings(Embeddings):
+    def __init__(self):
+        self.fake = FakeBedrockRuntime(dimension=16)
+        self.calls = 0
+
+    def embed_documents(self, texts):
+        self.calls += len(texts)
+        return [self.fake.embed(t) for t in texts]
+
+    def embed_query(self, text):
+        self.calls += 1
+        return self.fake.embed(text)
+
+def test_cache_hit_miss_and_persistence(tmp_path):
+    path = str(tmp_path / "emb.sqlite")
+    cache = EmbeddingCache(path)
+    assert cache.get("m", "hello") is None
+    cache.put("m", "hello", [0.5, 0.25])
+    assert cache.get("m", "hello") == [0.5, 0.25]
+    assert cache.get("other-model", "hello") is None
+    assert cache.hits == 1 and cache.misses == 2
+    cache.close()
+
+    reopened = EmbeddingCache(path)
+    assert len(reopened) == 1
+    assert reopened.get("m", "hello") == [0.5, 0.25]
+
+def test_cache_lru_eviction(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "emb.sqlite"), max_entries=2)
+    cache.put("m", "a", [1.0])
+    cache.put("m", "b", [2.0])
+    cache.get("m", "a") # a를 최근 사용으로
+    cache.put("m", "c", [3.0])
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    assert cache.get("m", "b") is None
+    assert cache.get("m", "a") == [1.0]
+
+def test_reingest_makes_zero_embedding_calls(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "emb.sqlite"))
+    underlying = CountingEmbeddings()
+    embeddings = CachedEmbeddings(underlying, cache, "m")
+    chunks = ["첫 번째 청크", "second chunk", "첫 번째 청크"]
+
+    embeddings.embed_documents(chunks)
+    assert underlying.calls == 2
+
+    embeddings.embed_documents(chunks)
+    embeddings.embed_query("second chunk")
+    assert underlying.calls == 2
+
+def test_bedrock_embedder_uses_cache(tmp_path):
+    fake = FakeBedrockRuntime(dimension=16)
+    embedder = BedrockEmbedder(client=fake, cache=EmbeddingCache(str(tmp_path / "emb.sqlite")))
+    texts = ["one", "two", "three"]
+
+    first = embedder.embed_texts(texts)
+    assert fake.calls == 3
+    second = embedder.embed_texts(texts)
+    assert fake.calls == 3
+    assert embedder.last_stats.cached == 3
+    assert embedder.embed_text("two") is not None
+    assert fake.calls == 3
+    assert [len(v) for v in second] == [len(v) for v in first]
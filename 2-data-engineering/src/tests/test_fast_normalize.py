@@ -0,0 +1,23 @@
+# 빠른 정규화 함수가 기존 함수와 같은 결과를 내는지 무작위 입력으로 비교
+import random
+from src.cleaning.fast_normalize import normalize_web_text_fast, normalize_whitespace_fast
+from src.cleaning.text_normalize import normalize_web_text, normalize_whitespace
+
+# 경계가 되는 공백 문자들을 일부러 많이 섞는다
+ALPHABET = [" ", " ", "\t", "\r", "\n", "\r\n", "\u00A0", "\u3000", "\x0c", "\x0b", "\x85", "\u2028",
+            "a", "b", "가", "나", "1", "2", ".", "|", "Page 1"]
+
+def random_text(rng, max_len=60):
+    return "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, max_len)))
+
+def test_normalize_whitespace_equivalent():
+    rng = random.Random(0)
+    for _ in range(5000):
+        text = random_text(rng)
+        assert normalize_whitespace_fast(text) == normalize_whitespace(text), repr(text)
+
+def test_normalize_web_text_equivalent():
+    rng = random.Random(1)
+    for _ in range(5000):
+        text = random_text(rng)
+        assert normalize_web_text_fast(text) == normalize_web_text(text), repr(text)
@@ -0,0 +1,40 @@
+from langchain_core.documents import Document
+from src.pipeline.fusion import weighted_sum_fusion, rrf_fusion, doc_key, is_server_hybrid_unsupported
+
+def doc(i):
+    return Document(page_content=f"content {i}", metadata={"id": f"doc-{i}"})
+
+VEC = [(doc(1), 0.9), (doc(2), 0.6), (doc(3), 0.3)]
+TXT = [(doc(3), 12.0), (doc(4), 6.0), (doc(1), 3.0)]
+
+def test_weighted_sum_fusion_matches_previous_scoring():
+    res = weighted_sum_fusion(VEC, TXT, k=10)
+    scores = {r["metadata"]["id"]: r["score"] for r in res}
+    assert scores["doc-1"] == 0.5 * 1.0 + 0.5 * 0.25
+    assert scores["doc-3"] == 0.5 * (0.3 / 0.9) + 0.5 * 1.0
+    assert scores["doc-4"] == 0.5 * 0.5
+    assert [r["metadata"]["id"] for r in res][:2] == ["doc-3", "doc-1"]
+
+def test_rrf_fusion_uses_ranks():
+    res = rrf_fusion(VEC, TXT, k=2)
+    assert len(res) == 2
+    # doc-1: 1/61 + 1/63, doc-3: 1/63 + 1/61 -> 동점, doc-2/doc-4는 한쪽에만
+    assert {r["metadata"]["id"] for r in res} == {"doc-1", "doc-3"}
+    assert abs(res[0]["score"] - (1 / 61 + 1 / 63)) < 1e-12
+
+def test_doc_key_is_stable_without_id():
+    a = Document(page_content="same text", metadata={})
+    b = Document(page_content="same text", metadata={})
+    assert doc_key(a) == doc_key(b) == doc_key(Document(page_content="same text"))
+
+class FakeTransportError(Exception):
+    def __init__(self, status_code, message):
+        super().__init__(status_code, message)
+        self.status_code = status_code
+
+def test_server_hybrid_unsupported_only_for_definitive_errors():
+    assert is_server_hybrid_unsupported(FakeTransportError(400, "parsing_exception: unknown query [hybrid]"))
+    assert is_server_hybrid_unsupported(FakeTransportError(404, "search_pipeline hybrid_50_50 not found"))
+    assert not is_server_hybrid_unsupported(FakeTransportError(429, "search pipeline rejected: too many requests"))
+    assert not is_server_hybrid_unsupported(FakeTransportError(503, "search_pipeline unavailable"))
+    assert not is_server_hybrid_unsupported(TimeoutError("read timed out"))
@@ -0,0 +1,84 @@
+from src.cleaning.header_footer import HeaderFooterDetector, line_fingerprint, strip_headers_footers_stream
+from src.pipeline.stages import iter_cleaned
+from src.tests.pdf_fixture import make_text_pdf
+
+def make_pages(n):
+    pages = []
+    for i in range(n):
+        body = [f"{i}번째 페이지 {j}번 문단: S3 버킷 정책과 IAM 역할을 연결해서 접근 권한을 제어하고, 버전 관리와 수명 주기 규칙을 함께 설정하는 방법을 설명합니다." for j in range(5)]
+        body.insert(2, "요약 표 참고") # 모든 페이지 중간에 반복되는 본문 줄
+        pages.append("\n".join(["ACME 보고서 2024", ""] + body + [f"- {i + 1} -"]))
+    return pages
+
+def test_line_fingerprint_masks_digits():
+    assert line_fingerprint("Page 12") == line_fingerprint("page  13 ")
+    assert line_fingerprint("Page 12") != line_fingerprint("Chapter 12")
+    long_line = "1. " + "본문 " * 40
+    assert line_fingerprint(long_line) != line_fingerprint(long_line.replace("1.", "2."))
+
+def test_detector_removes_only_head_and_tail_boilerplate():
+    pages = make_pages(6)
+    detector = HeaderFooterDetector()
+    for p in pages:
+        detector.observe(p)
+    detector.finalize()
+
+    stripped = [detector.strip(p) for p in pages]
+    for i, text in enumerate(stripped):
+        assert "ACME 보고서" not in text
+        assert f"- {i + 1} -" not in text
+        assert "요약 표 참고" in text
+        assert f"{i}번째 페이지 0번 문단" in text and f"{i}번째 페이지 4번 문단" in text
+    assert detector.removed_lines == 12
+
+def test_single_page_keeps_everything():
+    detector = HeaderFooterDetector()
+    page = "제목\n본문 한 줄\n- 1 -"
+    detector.observe(page)
+    detector.finalize()
+    assert detector.strip(page) == page
+
+def test_stream_reads_source_once_and_keeps_order():
+    pages = make_pages(5)
+    consumed = []
+
+    def source():
+        for i, p in enumerate(pages):
+            consumed.append(i)
+            yield (i, p)
+
+    out = list(strip_headers_footers_stream(source(), lambda item: item[1], spool_bytes=0))
+    assert consumed == list(range(5))
+    assert [item[0] for item, _ in out] == list(range(5))
+    assert all("ACME" not in text for _, text in out)
+
+def test_stream_window_yields_before_reading_everything():
+    pages = make_pages(30)
+    consumed = []
+
+    def source():
+        for i, p in enumerate(pages):
+            consumed.append(i)
+            yield (i, p)
+
+    out = strip_headers_footers_stream(source(), lambda item: item[1], window=4)
+    first, text = next(out)
+    assert first[0] == 0 and consumed == [0, 1, 2, 3] # 앞쪽 window 페이지만 읽고 첫 페이지를 내보낸다
+    rest = list(out)
+    assert [item[0] for item, _ in rest] == list(range(1, 30))
+    for (i, _), stripped in [(first, text)] + rest:
+        assert "ACME 보고서" not in stripped and f"- {i + 1} -" not in stripped
+        assert "요약 표 참고" in stripped
+
+def test_iter_cleaned_strips_pdf_header_and_page_numbers(tmp_path):
+    path = make_text_pdf(str(tmp_path / "report.pdf"), pages=6, lines_per_page=10, header="ACME Confidential Report")
+    detector = HeaderFooterDetector()
+    pages = list(iter_cleaned(path, detector=detector))
+
+    assert len(pages) == 6
+    for i, p in enumerate(pages):
+        lines = p["page_content"].splitlines()
+        assert "ACME Confidential Report" not in lines
+        assert f"Page {i + 1}" not in lines
+        assert sum(f"Page {i + 1} line" in ln for ln in lines) == 10
+    assert detector.removed_lines >= 12
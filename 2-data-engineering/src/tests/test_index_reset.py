@@ -0,0 +1,73 @@
+import pytest
+from langchain_core.documents import Document
+from src.pipeline.bulk_writer import BulkIndexWriter
+from src.tests.fake_opensearch import FakeOpenSearch
+from src.pipeline.index_reset import IndexRecreateError, IndexResetter
+
+MAPPING = {
+    "settings": {"index": {"knn": True}},
+    "mappings": {"properties": {"vector_field": {"type": "knn_vector", "dimension": 2}}},
+}
+
+def make_client(n_docs):
+    client = FakeOpenSearch()
+    client.indices.create(index="idx", body=MAPPING)
+    docs = [Document(page_content=f"chunk {i}", metadata={"id": f"doc-{i:05d}"}) for i in range(n_docs)]
+    BulkIndexWriter(client, "idx", is_aoss=False).write(docs, lambda texts: [[1.0, 0.0]] * len(texts))
+    return client
+
+def test_reset_recreate_keeps_mapping():
+    client = make_client(2500)
+    report = IndexResetter(client, "idx").reset()
+    assert report.strategy == "recreate"
+    assert report.deleted == 2500
+    assert report.calls <= 5
+    assert client.count(index="idx")["count"] == 0
+    assert client.mappings["idx"]["mappings"] == MAPPING["mappings"]
+    assert "uuid" not in client.mappings["idx"]["settings"]["index"]
+
+def test_reset_delete_by_query_outside_aoss():
+    client = make_client(10)
+    report = IndexResetter(client, "idx", is_aoss=False).reset(strategy="delete_by_query")
+    assert report.strategy == "delete_by_query" and report.deleted == 10
+
+def test_reset_scroll_streams_pages_with_progress():
+    client = make_client(2500)
+    progress = []
+    resetter = IndexResetter(client, "idx", page_size=1000, on_progress=lambda d, t: progress.append((d, t)))
+    report = resetter.reset(strategy="scroll")
+    assert report.strategy == "scroll" and report.deleted == 2500
+    assert progress == [(1000, 2500), (2000, 2500), (2500, 2500)]
+    assert client.count(index="idx")["count"] == 0
+
+def test_reset_missing_index_returns_none():
+    assert IndexResetter(FakeOpenSearch(), "nope").reset() is None
+
+def test_reset_falls_back_when_recreate_fails():
+    client = make_client(5)
+    def broken_get(index):
+        raise RuntimeError("no permission")
+    client.indices.get = broken_get
+    report = IndexResetter(client, "idx").reset()
+    assert report.strategy == "scroll"
+    assert client.count(index="idx")["count"] == 0
+
+def test_reset_recreate_failure_keeps_mapping_in_error():
+    client = make_client(3)
+    def fail_create(index, body=None):
+        raise RuntimeError("create 거부")
+    client.indices.create = fail_create
+    with pytest.raises(IndexRecreateError) as e:
+        IndexResetter(client, "idx").reset()
+    assert e.value.body == {"settings": {"index": {"knn": True}}, "mappings": MAPPING["mappings"]}
+
+def test_reset_scroll_raises_on_bulk_errors():
+    client = make_client(5)
+    client.bulk = lambda body, **kwargs: {
+        "errors": True,
+        "items": [{"delete": {"_id": a["delete"]["_id"], "status": 429, "error": {"type": "es_rejected_execution_exception"}}}
+                  for a in body],
+    }
+    with pytest.raises(RuntimeError):
+        IndexResetter(client, "idx", is_aoss=False).reset(strategy="scroll")
+    assert client.count(index="idx")["count"] == 5
@@ -0,0 +1,87 @@
+import os
+import threading
+import time
+import pytest
+from src.chunker.spans import Chunk
+from src.pipeline.jobs import DONE, FAILED, IngestJobQueue
+from src.tests.pdf_fixture import make_text_pdf
+
+class RecordingPipeline:
+    def __init__(self):
+        self.indexed = {}
+        self.pages = {}
+        self.lock = threading.Lock()
+
+    def index_chunks(self, source, chunks, pages=None):
+        with self.lock:
+            self.indexed[source] = list(chunks)
+            self.pages[source] = list(pages or [])
+        return []
+
+    def chunk_spans(self, text, chunker, chunk_size, chunk_overlap, chunk_unit="chars"):
+        return [Chunk(text=text, start=0, end=len(text))]
+
+def wait_job(queue, job_id, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.get(job_id)
+        if job.finished:
+            return job
+        time.sleep(0.05)
+    raise TimeoutError(job_id)
+
+def test_batch_ingest_reports_status_timings_and_failures(tmp_path):
+    pdfs = [make_text_pdf(str(tmp_path / f"doc{i}.pdf"), pages=3) for i in range(3)]
+    missing = str(tmp_path / "missing.pdf")
+    pipeline = RecordingPipeline()
+    queue = IngestJobQueue(pipeline, load_workers=2, index_workers=2)
+    try:
+        job_id = queue.submit(pdfs + [missing], chunker="recursive", chunk_size=500, chunk_overlap=0)
+        job = wait_job(queue, job_id)
+    finally:
+        queue.shutdown()
+
+    assert job.state == "partial"
+    assert job.progress == 1.0
+    assert set(pipeline.indexed) == set(pdfs)
+    for pdf in pdfs:
+        status = job.sources[pdf]
+        assert status.state == DONE
+        assert status.chunks == len(pipeline.indexed[pdf]) > 0
+        assert set(status.timings) == {"load", "chunk", "index"}
+        assert [n for _, n in pipeline.pages[pdf]] == [1, 2, 3]
+    assert job.sources[missing].state == FAILED
+    assert list(job.failures()) == [missing]
+
+def test_remove_after_deletes_sources(tmp_path):
+    pdf = make_text_pdf(str(tmp_path / "upload.pdf"), pages=1)
+    queue = IngestJobQueue(RecordingPipeline(), load_workers=1, index_workers=1)
+    try:
+        job = wait_job(queue, queue.submit([pdf], chunker="semantic", chunk_size=500, chunk_overlap=0, remove_after=True))
+    finally:
+        queue.shutdown()
+
+    assert job.state == DONE
+    assert not os.path.exists(pdf)
+
+def test_duplicate_sources_are_rejected(tmp_path):
+    pdf = make_text_pdf(str(tmp_path / "doc.pdf"), pages=1)
+    queue = IngestJobQueue(RecordingPipeline(), load_workers=1, index_workers=1)
+    try:
+        with pytest.raises(ValueError, match="doc.pdf"):
+            queue.submit([pdf, pdf], chunker="recursive", chunk_size=500, chunk_overlap=0)
+        assert queue.jobs() == []
+    finally:
+        queue.shutdown()
+
+def test_load_finishing_after_shutdown_marks_source_failed(tmp_path):
+    pdf = make_text_pdf(str(tmp_path / "doc.pdf"), pages=1)
+    queue = IngestJobQueue(RecordingPipeline(), load_workers=1, index_workers=1)
+    queue._index_pool.shutdown()
+    try:
+        job = wait_job(queue, queue.submit([pdf], chunker="recursive", chunk_size=500, chunk_overlap=0))
+    finally:
+        queue.shutdown()
+
+    assert job.state == FAILED
+    assert "shutdown" in job.sources[pdf].error
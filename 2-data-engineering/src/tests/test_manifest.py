@@ -0,0 +1,32 @@
+from src.pipeline.manifest import IngestManifest, fingerprint_chunks, plan_incremental
+from src.structuring.structurer import DocumentStructurer
+
+make_id = DocumentStructurer()._generate_content_doc_id
+
+def test_fingerprint_ids_follow_content_not_position():
+    a = fingerprint_chunks("doc.pdf", ["alpha", "beta"], make_id)
+    b = fingerprint_chunks("doc.pdf", ["new intro", "alpha", "beta"], make_id)
+    assert [c.doc_id for c in a] == [c.doc_id for c in b[1:]]
+    assert b[1].chunk_index == 1
+
+def test_duplicate_chunks_get_distinct_ids():
+    fps = fingerprint_chunks("doc.pdf", ["same", "same"], make_id)
+    assert fps[0].doc_id != fps[1].doc_id
+
+def test_plan_incremental_added_kept_removed(tmp_path):
+    manifest = IngestManifest(str(tmp_path / "manifest.json"))
+    first = fingerprint_chunks("doc.pdf", ["alpha", "beta", "gamma"], make_id)
+    added, removed, kept = plan_incremental(manifest.get("doc.pdf"), first)
+    assert (len(added), len(removed), kept) == (3, 0, 0)
+    manifest.set("doc.pdf", {c.doc_id: c.content_hash for c in first})
+    manifest.save()
+
+    reloaded = IngestManifest(str(tmp_path / "manifest.json"))
+    second = fingerprint_chunks("doc.pdf", ["alpha", "beta v2", "gamma"], make_id)
+    added, removed, kept = plan_incremental(reloaded.get("doc.pdf"), second)
+    assert [c.content for c in added] == ["beta v2"]
+    assert removed == [first[1].doc_id]
+    assert kept == 2
+
+    added, removed, kept = plan_incremental(reloaded.get("doc.pdf"), first)
+    assert (len(added), len(removed), kept) == (0, 0, 3)
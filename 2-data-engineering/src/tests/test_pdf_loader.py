@@ -1,6 +1,7 @@
 import os
 import pytest
-from src.loader.pdf_loader import load_pdf, PDFLoadResult
+from src.loader.pdf_loader import load_pdf, iter_pdf_pages, PDFLoadResult
+from src.tests.pdf_fixture import make_text_pdf
 
 path = os.path.dirname(os.path.abspath(__file__))
 SAMPLE_PDF = os.path.join(path, "../../data/ai과제.pdf")
@@ -18,4 +19,19 @@ def test_pdf_loader_basic():
 
 def test_pdf_loader_not_found():
     with pytest.raises(FileNotFoundError):
-        load_pdf("그런/파일/없음.pdf")
\ No newline at end of file
+        load_pdf("그런/파일/없음.pdf")
+
+def test_pdf_loader_parallel_matches_serial(tmp_path):
+    pdf_path = make_text_pdf(str(tmp_path / "big.pdf"), pages=23, lines_per_page=5)
+    serial = load_pdf(pdf_path)
+    parallel = load_pdf(pdf_path, workers=3)
+    assert parallel.total_pages == serial.total_pages == 23
+    assert [p.page for p in parallel.pages] == list(range(1, 24))
+    assert [p.content for p in parallel.pages] == [p.content for p in serial.pages]
+    assert parallel.pages[4].meta == serial.pages[4].meta
+
+def test_iter_pdf_pages_parallel_max_pages(tmp_path):
+    pdf_path = make_text_pdf(str(tmp_path / "small.pdf"), pages=6, lines_per_page=2)
+    pages = list(iter_pdf_pages(pdf_path, max_pages=4, workers=2))
+    assert [p.page for p in pages] == [1, 2, 3, 4]
+    assert "Page 3 line 1" in pages[2].content
@@ -0,0 +1,41 @@
+from src.pipeline.query_cache import SearchCache, TTLCache, normalize_query
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_ttl_cache_expires_and_evicts_lru():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=2, ttl=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1 # a를 최근 사용으로
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.evictions == 1
+
+    clock.now = 11
+    assert cache.get("a") is None
+    assert cache.expired == 1
+    assert cache.hits == 1 and cache.misses == 2
+
+def test_normalize_query():
+    assert normalize_query("  AWS   S3\t버킷 ") == normalize_query("aws s3 버킷")
+    assert normalize_query("ＡＷＳ") == "aws"
+
+def test_search_cache_invalidation_by_generation():
+    cache = SearchCache()
+    key = cache.result_key("AWS S3", 10, "weighted", 0.5, 0.5)
+    cache.set_results(key, [{"score": 1.0}])
+    assert cache.get_results(cache.result_key("aws  s3", 10, "weighted", 0.5, 0.5)) == [{"score": 1.0}]
+    assert cache.get_results(cache.result_key("aws s3", 5, "weighted", 0.5, 0.5)) is None
+
+    cache.set_vector("AWS S3", [0.1, 0.2])
+    cache.invalidate()
+    assert cache.get_results(cache.result_key("aws s3", 10, "weighted", 0.5, 0.5)) is None
+    assert cache.get_vector("AWS S3") == [0.1, 0.2]
+    assert cache.stats()["generation"] == 1
+    assert cache.stats()["results"]["hits"] == 1
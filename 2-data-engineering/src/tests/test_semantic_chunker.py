@@ -0,0 +1,36 @@
+from src.chunker.semantic_chunker import semantic_chunk, split_text_to_sentences
+from src.embedding.embedder import BedrockEmbedder
+from src.tests.fake_runtime import FakeBedrockRuntime
+
+TEXT = (
+    "Amazon S3 bucket stores objects. Amazon S3 bucket stores objects durably. "
+    "Amazon S3 bucket stores objects in regions. "
+    "Lambda runs code without servers. Lambda runs code on events. "
+    "Lambda runs code and scales."
+)
+
+def test_centroid_mode_embeds_each_sentence_once():
+    fake = FakeBedrockRuntime(dimension=256)
+    embedder = BedrockEmbedder(client=fake)
+    sentences = split_text_to_sentences(TEXT)
+
+    chunks = semantic_chunk(TEXT, target_chars=1000, embedder=embedder)
+    assert fake.calls == len(sentences)
+    assert " ".join(chunks) == " ".join(sentences)
+    assert chunks[0].startswith("Amazon S3") and chunks[-1].endswith("scales.")
+    assert any(c.startswith("Lambda") for c in chunks)
+
+def test_centroid_mode_respects_target_chars():
+    embedder = BedrockEmbedder(client=FakeBedrockRuntime(dimension=64))
+    text = " ".join(["same words here."] * 50)
+
+    chunks = semantic_chunk(text, target_chars=100, embedder=embedder)
+    assert len(chunks) > 1
+    assert all(len(c.replace(" ", "")) <= 100 for c in chunks)
+
+def test_legacy_mode_uses_more_calls():
+    fake = FakeBedrockRuntime(dimension=256)
+    sentences = split_text_to_sentences(TEXT)
+
+    semantic_chunk(TEXT, target_chars=1000, embedder=BedrockEmbedder(client=fake), mode="legacy")
+    assert fake.calls == 2 * (len(sentences) - 1)
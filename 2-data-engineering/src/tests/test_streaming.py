@@ -0,0 +1,83 @@
+from src.pipeline.stages import chunk_spans, span_metadata
+from src.pipeline.streaming import stream_chunk_spans, batched
+from src.structuring.structurer import DocumentStructurer
+from src.tests.pdf_fixture import make_text_pdf
+from src.tests.pipeline_fixture import offline_pipeline
+
+PAGES = [
+    "첫 페이지 문단입니다. " * 20,
+    "짧은 페이지",
+    "Third page paragraph.\n\nAnother paragraph on the third page. " * 10,
+    "",
+    "마지막 페이지 " * 30,
+]
+
+def numbered(pages):
+    return ((text, i + 1) for i, text in enumerate(pages))
+
+def merged_pages(pages):
+    # load_text_pages와 같은 방식으로 합친 텍스트 + 페이지 offset
+    offsets, offset = [], 0
+    for i, text in enumerate(pages):
+        if i:
+            offset += 2
+        offsets.append((offset, i + 1))
+        offset += len(text)
+    return "\n\n".join(pages), offsets
+
+def test_stream_fixed_matches_merged():
+    merged, _ = merged_pages(PAGES)
+    for overlap in (0, 7):
+        chunk_fn = lambda t: chunk_spans(t, "fixed", 50, overlap)
+        streamed = [c for c, _ in stream_chunk_spans(numbered(PAGES), chunk_fn, max_carry=50)]
+        assert [(c.text, c.start, c.end) for c in streamed] == [(c.text, c.start, c.end) for c in chunk_fn(merged)]
+
+def test_stream_recursive_carries_across_pages():
+    merged, pages = merged_pages(PAGES)
+    streamed = list(stream_chunk_spans(numbered(PAGES), lambda t: chunk_spans(t, "recursive", 300, 0), max_carry=300))
+    chunks = [c.text for c, _ in streamed]
+    assert all(len(c) <= 450 for c in chunks)
+    # 짧은 페이지는 단독 청크가 되지 않고 앞뒤 페이지와 합쳐진다
+    assert "짧은 페이지" not in chunks
+    assert any("짧은 페이지" in c for c in chunks)
+    # offset / 페이지 메타데이터는 합친 텍스트 기준 (배치 ingest와 같은 값)
+    for chunk, offsets in streamed:
+        assert merged[chunk.start:chunk.end].split() == chunk.text.split()
+        assert span_metadata(chunk, offsets) == span_metadata(chunk, pages)
+
+def test_stream_whole_buffer_chunker_is_bounded():
+    # 버퍼를 통째로 청크로 돌려주는 청커("none")도 carry가 max_carry를 넘으면 내보낸다
+    pages = [f"{i}번 페이지 본문 " * 10 for i in range(200)]
+    calls = []
+
+    def whole(text):
+        calls.append(len(text))
+        return chunk_spans(text, "none", 0, 0)
+
+    streamed = list(stream_chunk_spans(numbered(pages), whole, max_carry=500))
+    assert max(calls) <= 500 + 2 + max(map(len, pages)) # carry(최대 max_carry) + 새 페이지
+    merged, _ = merged_pages(pages)
+    assert " ".join(c.text for c, _ in streamed).split() == merged.split()
+    assert all(merged[c.start:c.end] == c.text for c, _ in streamed)
+
+def test_batched():
+    assert list(batched(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(batched([], 3)) == []
+
+def test_run_stream_writes_same_metadata_as_batch(tmp_path):
+    pdf = make_text_pdf(str(tmp_path / "doc.pdf"), pages=5, lines_per_page=20)
+    batch = offline_pipeline(tmp_path, structurer=DocumentStructurer(keyword_mode="tfidf"))
+    stream = offline_pipeline(tmp_path, structurer=DocumentStructurer(keyword_mode="tfidf"), max_docs=4)
+
+    batch_docs = batch.run(pdf, "recursive", 800, 0)
+    stream_docs = [d for docs in stream.run_stream(pdf, "recursive", 800, 0) for d in docs]
+    assert len(stream_docs) > 4 # 마이크로 배치 여러 개
+    for doc in stream_docs:
+        meta = doc["metadata"]
+        assert {"char_start", "char_end", "page_start", "page_end", "keywords"} <= set(meta)
+        assert 1 <= meta["page_start"] <= meta["page_end"] <= 5
+        assert doc["keywords"]
+    # 청크 위치 / 페이지는 배치 ingest와 같다
+    batch_spans = {(d["metadata"]["char_start"], d["metadata"]["page_start"], d["metadata"]["page_end"]) for d in batch_docs}
+    stream_spans = {(d["metadata"]["char_start"], d["metadata"]["page_start"], d["metadata"]["page_end"]) for d in stream_docs}
+    assert stream_spans == batch_spans
@@ -0,0 +1,62 @@
+import random
+from src.structuring.structurer import DocumentStructurer, extract_keywords, term_counts, tfidf_keywords
+
+WORDS = ["S3", "버킷", "정책", "IAM", "역할", "the", "and", "a", "Lambda", "함수", "의", "x", "2024", "로그"]
+
+def legacy_keywords(text, max_keywords=10):
+    # 예전 _extract_keywords (정렬 후 상위 N개)
+    import re
+    words = re.findall(r'[가-힣a-zA-Z0-9]+', text.lower())
+    stopwords = {'의', '가', '이', '을', '를', '에', '와', '과', '으로', '로', 'and', 'or', 'the', 'a', 'an', 'in', 'on', 'at', 'to', 'for'}
+    freq = {}
+    for w in words:
+        if w not in stopwords and len(w) > 1:
+            freq[w] = freq.get(w, 0) + 1
+    return [w for w, _ in sorted(freq.items(), key=lambda x: x[1], reverse=True)[:max_keywords]]
+
+def test_keywords_match_legacy_order():
+    rng = random.Random(0)
+    for _ in range(300):
+        text = " ".join(rng.choice(WORDS) + rng.choice(["", "s", "들"]) for _ in range(rng.randint(0, 80)))
+        assert extract_keywords(text) == legacy_keywords(text)
+
+def test_structure_documents_matches_single():
+    structurer = DocumentStructurer()
+    texts = [f"S3 버킷 {i}번 정책과 IAM 역할 설명. 버킷 정책 로그" for i in range(5)]
+    batch = structurer.structure_documents(texts, "doc.pdf", "pdf", metadatas=[{"char_start": i} for i in range(5)])
+    for i, doc in enumerate(batch):
+        single = structurer.structure_document(texts[i], "doc.pdf", "pdf", i, metadata={"char_start": i})
+        assert doc.page_content == single.page_content
+        assert doc.metadata == single.metadata
+
+def test_tfidf_prefers_chunk_specific_terms():
+    # 모든 청크에 두 번씩 나오는 "버킷"보다 한 청크에만 나오는 단어가 위
+    specific = ["lifecycle", "versioning", "encryption", "replication", "logging"]
+    texts = [f"버킷 버킷 정책 {w}" for w in specific]
+    keywords = tfidf_keywords([term_counts(t) for t in texts], max_keywords=1)
+    assert keywords == [[w] for w in specific]
+    assert [extract_keywords(t, 1) for t in texts] == [["버킷"]] * 5
+    assert tfidf_keywords([term_counts(""), term_counts("a the")]) == [[], []]
+
+def test_tfidf_uses_whole_source_as_corpus():
+    # 증분 ingest에서 청크 하나만 바뀌어도 idf는 source의 현재 청크 전체 기준
+    specific = ["lifecycle", "versioning", "encryption", "replication", "logging"]
+    texts = [f"버킷 버킷 정책 {w}" for w in specific]
+    structurer = DocumentStructurer(keyword_mode="tfidf", max_keywords=1)
+    alone = structurer.structure_documents(texts[:1], "u", "web")
+    in_source = structurer.structure_documents(texts[:1], "u", "web", corpus=texts)
+    assert alone[0].metadata["keywords"] == ["버킷"]
+    assert in_source[0].metadata["keywords"] == ["lifecycle"]
+
+def test_process_pool_gives_same_keywords():
+    rng = random.Random(1)
+    texts = [" ".join(rng.choice(WORDS) for _ in range(30)) for _ in range(1200)]
+    single = DocumentStructurer(keyword_mode="tfidf").structure_documents(texts, "u", "web")
+    structurer = DocumentStructurer(keyword_mode="tfidf", workers=2)
+    pooled = structurer.structure_documents(texts, "u", "web")
+    pool = structurer._pool
+    again = structurer.structure_documents(texts, "u", "web")
+    structurer.close()
+    assert pool is not None and structurer._pool is None # 호출마다 새 풀을 띄우지 않음
+    assert [d.metadata["keywords"] for d in single] == [d.metadata["keywords"] for d in pooled]
+    assert [d.metadata["keywords"] for d in again] == [d.metadata["keywords"] for d in pooled]
@@ -0,0 +1,29 @@
+from src.cleaning.table_to_markdown import detect_tables, inline_pdf_tables, pdf_text_to_markdown
+from src.tests.table_fixture import CASES, CSV_TABLE, PIPE_TABLE, PROSE_KO, build_case
+
+def detected_lines(text):
+    return {i for b in detect_tables(text.splitlines()) for i in range(b.start, b.end)}
+
+def test_detects_exactly_the_fixture_tables():
+    for name, segments in CASES:
+        text, expected = build_case(segments)
+        assert detected_lines(text) == expected, name
+
+def test_prose_with_commas_is_not_a_table():
+    assert pdf_text_to_markdown(PROSE_KO) == []
+
+def test_inline_replaces_source_lines():
+    text = PROSE_KO + "\n" + CSV_TABLE + "\n" + PROSE_KO
+    inlined, count = inline_pdf_tables(text)
+    assert count == 1
+    assert "S3,120000,0.1%" not in inlined
+    assert "| S3 | 120000 | 0.1% |" in inlined
+    assert inlined.startswith(PROSE_KO) and inlined.endswith(PROSE_KO)
+    assert inline_pdf_tables(PROSE_KO) == (PROSE_KO, 0)
+
+def test_existing_markdown_rule_row_is_not_duplicated():
+    [table] = pdf_text_to_markdown(PIPE_TABLE)
+    lines = table.splitlines()
+    assert lines[0] == "| 설정 | 기본값 | 설명 |"
+    assert sum(1 for ln in lines if set(ln) <= set("|- ")) == 1
+    assert len(lines) == 5
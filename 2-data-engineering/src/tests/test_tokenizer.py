@@ -0,0 +1,87 @@
+import random
+from src.chunker.recursive_chunker import iter_recursive_chunks, recursive_chunk
+from src.chunker.tokenizer import calibrate_scale, estimate_tokens, raw_tokens, token_spans
+from src.embedding.embedder import BedrockEmbedder
+from src.tests.fake_runtime import FakeBedrockRuntime
+from src.pipeline.stages import load_text, load_text_pages, page_range, span_metadata, chunk_spans
+from src.tests.pdf_fixture import make_text_pdf
+
+KO = ["S3 버킷 정책은 접근 권한을 정의합니다.", "IAM 역할을 Lambda 함수에 연결합니다.", "요청이 실패하면 3번까지 다시 시도합니다."]
+EN = ["The bucket policy grants read access to the role.", "Retries use exponential backoff with jitter.",
+      "Set MaxConcurrency to 1000 for the account."]
+CODE = ["def handler(event, context):\n    return {\"statusCode\": 200}", "aws s3 cp ./build s3://my-bucket/app --recursive",
+        "{\n  \"Effect\": \"Allow\",\n  \"Action\": [\"s3:GetObject\"]\n}", "for (int i = 0; i < 10; i++) { total += i; }"]
+
+def mixed_corpus(seed: int, n: int):
+    rng = random.Random(seed)
+    return ["\n".join(rng.choice(rng.choice([KO, EN, CODE])) for _ in range(rng.randint(1, 12))) for _ in range(n)]
+
+def test_estimate_tokens_rules():
+    assert estimate_tokens("", scale=1.0) == 0
+    assert estimate_tokens("안녕하세요", scale=1.0) == 5
+    assert estimate_tokens("Lambda", scale=1.0) == 2 # 6자 -> 2
+    assert estimate_tokens("2024", scale=1.0) == 2
+    assert estimate_tokens("S3 버킷.", scale=1.0) == 1 + 1 + 2 + 1
+    long_text = "버킷 정책 " * 2000
+    assert estimate_tokens(long_text, scale=1.0) == 4 * 2000
+    assert estimate_tokens("안녕하세요", scale=1.5) == 8 # 올림
+
+def test_calibrated_estimate_never_undercounts():
+    # 실제 토큰 수(inputTextTokenCount)로 배율을 맞추면, 보정에 쓰지 않은 한국어/영어/코드 혼합 텍스트도 적게 세지 않는다
+    embedder = BedrockEmbedder(client=FakeBedrockRuntime(dimension=8))
+    samples = [(t, embedder.token_count(t)) for t in mixed_corpus(seed=0, n=200)]
+    assert any(raw_tokens(t) < actual for t, actual in samples) # 보정 전 규칙만으로는 적게 세는 텍스트가 있다
+    scale = calibrate_scale(samples)
+    for text in mixed_corpus(seed=1, n=300):
+        assert estimate_tokens(text, scale=scale) >= embedder.token_count(text)
+        for s, e in token_spans(text, 40, scale=scale):
+            assert estimate_tokens(text[s:e], scale=scale) <= 40
+
+def test_token_mode_respects_budget():
+    rng = random.Random(1)
+    words = ["S3", "버킷", "정책은", "IAM", "역할을", "authentication", "12345", "합니다.", "\n\n"]
+    text = " ".join(rng.choice(words) for _ in range(5000))
+    budget = 120
+    chunks = list(iter_recursive_chunks(text, chunk_size=budget, unit="tokens"))
+    assert [c.text for c in chunks] == recursive_chunk(text, chunk_size=budget, unit="tokens")
+    for c in chunks:
+        # 문장 하나가 예산보다 긴 경우만 넘칠 수 있는데, 이 텍스트의 문장은 모두 예산보다 짧다
+        assert estimate_tokens(c.text) <= budget
+        assert text[c.start:c.end].split() == c.text.split()
+    assert " ".join(" ".join(c.text for c in chunks).split()) == " ".join(text.split())
+
+def test_token_mode_splits_sentence_over_budget():
+    # 문장 부호도 문단 구분도 없는 긴 텍스트 (표를 풀어 쓴 줄, 로그 등)
+    text = "S3 버킷 정책 authentication 12345 " * 200 + "x" * 500
+    chunks = list(iter_recursive_chunks(text, chunk_size=50, unit="tokens"))
+    assert len(chunks) > 1
+    assert all(0 < estimate_tokens(c.text) <= 50 for c in chunks)
+    assert all(text[c.start:c.end] == c.text for c in chunks)
+    assert "".join(c.text for c in chunks).replace(" ", "") == text.replace(" ", "")
+
+def test_chars_mode_unchanged_by_unit_argument():
+    text = "\n\n".join(f"{i}번 문단입니다. " * 5 for i in range(100))
+    assert recursive_chunk(text, 300) == recursive_chunk(text, 300, unit="chars")
+
+def test_page_range():
+    pages = [(0, 1), (100, 2), (250, 3)]
+    assert page_range(pages, 0, 50) == (1, 1)
+    assert page_range(pages, 90, 100) == (1, 1)
+    assert page_range(pages, 90, 101) == (1, 2)
+    assert page_range(pages, 260, 300) == (3, 3)
+    assert page_range([], 0, 10) is None
+    assert page_range(pages, -1, -1) is None
+
+def test_pdf_chunks_carry_page_numbers(tmp_path):
+    pdf = make_text_pdf(str(tmp_path / "doc.pdf"), pages=4)
+    text, pages = load_text_pages(pdf)
+    assert text == load_text(pdf)
+    assert [n for _, n in pages] == [1, 2, 3, 4]
+
+    for chunk in chunk_spans(text, "recursive", 800, 0):
+        meta = span_metadata(chunk, pages)
+        covered = range(meta["page_start"], meta["page_end"] + 1)
+        # 픽스처의 줄은 "Page N line ..." 형식이므로 청크에 나오는 페이지 번호는 모두 범위 안
+        for line in chunk.text.splitlines():
+            if line.startswith("Page "):
+                assert int(line.split()[1]) in covered
@@ -1,5 +1,9 @@
 import pytest
-from src.loader.webbase_loader import load_web, WebLoadResult
+from src.cleaning.text_normalize import normalize_web_text, web_to_plain
+from src.loader import webbase_loader
+from src.loader.webbase_loader import extract_img_src, extract_text, extract_title, load_web, parse_html, WebLoadResult
+from src.pipeline.stages import clean_web
+from src.tests.html_fixture import make_html_page
 
 def test_web_loader_basic():
     url = "https://python.org/"
@@ -13,4 +17,31 @@ def test_web_loader_basic():
 
 def test_web_loader_timeout():
     with pytest.raises(Exception):
-        load_web("https://이세상에없는.site")
\ No newline at end of file
+        load_web("https://이세상에없는.site")
+
+def test_parse_html_single_pass():
+    html = make_html_page(sections=8)
+    parsed = parse_html(html, parser="html.parser")
+    assert parsed.title == extract_title(html)
+    assert parsed.text_raw == extract_text(html)
+    assert parsed.image_urls == extract_img_src(html)
+    assert len(parsed.tables) == 2 and parsed.tables[0].startswith("| 설정 | 기본값 | 설명 |")
+    # 예전 web_to_plain(html) 결과와 같아야 함
+    assert normalize_web_text(parsed.text_plain) == web_to_plain(html)
+    assert "dataLayer" not in parsed.text_plain
+
+
+def test_load_web_uses_parsed_result(monkeypatch):
+    html = make_html_page(sections=4)
+    monkeypatch.setattr(webbase_loader, "fetch_html", lambda url: html)
+    res = load_web("http://localhost/docs")
+    assert res.title == "AWS 문서 예제"
+    assert len(res.image_urls) == 4
+    assert res.tables and res.text_plain
+    assert res.meta["length_img_srcs"] == 4
+
+def test_clean_web_keeps_table_text_once(monkeypatch):
+    html = make_html_page(sections=4)
+    monkeypatch.setattr(webbase_loader, "fetch_html", lambda url: html)
+    cleaned = clean_web(load_web("http://localhost/docs"))
+    assert cleaned["page_content"].count("기본값") == 1